@@ -0,0 +1,58 @@
+from django.utils.functional import cached_property
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.models import TokenUser
+
+from apps.accounts.caching import ban_version
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """``JWTAuthentication`` qui refuse aussi les comptes bannis."""
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if user.is_banned:
+            raise AuthenticationFailed("Votre compte a été banni.", code="user_banned")
+        return user
+
+
+class ClaimsUser(TokenUser):
+    """Utilisateur reconstruit à partir des claims du jeton, sans requête."""
+
+    is_banned = False
+
+    @cached_property
+    def is_recruiter(self):
+        return self.token.get("is_recruiter", False)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authentification sans lecture de la table des utilisateurs : identifiant,
+    rôles et ``ban_version`` sont dans le jeton d'accès. Seul le
+    ``ban_version`` est vérifié (voir ``apps.accounts.caching.ban_version``) ;
+    un jeton émis avant un (dé)bannissement est refusé immédiatement.
+
+    Les rôles (``is_recruiter``, ``is_staff``) restent ceux de l'émission du
+    jeton pendant sa durée de vie (``ACCESS_TOKEN_LIFETIME``). Les vues
+    servies par cette classe n'utilisent que ``request.user.pk`` pour les
+    clés étrangères. Un jeton sans ces claims passe par le chemin complet.
+    """
+
+    def get_user(self, validated_token):
+        if "ban_version" not in validated_token:
+            return super().get_user(validated_token)
+        user = ClaimsUser(validated_token)
+        if validated_token["ban_version"] != ban_version(user.pk):
+            raise AuthenticationFailed("Jeton révoqué.", code="token_revoked")
+        return user
+
+
+# Chaîne des vues compatibles avec ClaimsUser : le cas courant (jeton Bearer)
+# est traité en premier, sans charger la session
+CLAIMS_AUTHENTICATION_CLASSES = [
+    ClaimsJWTAuthentication,
+    SessionAuthentication,
+    BasicAuthentication,
+]
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from apps.accounts.models import CustomUser
 
 
@@ -27,3 +28,15 @@ class RegisterSerializer(serializers.ModelSerializer):
         password = validated_data.pop("password")
         user = CustomUser.objects.create_user(password=password, **validated_data)
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Ajoute aux jetons les claims lus par ClaimsJWTAuthentication."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["is_recruiter"] = user.is_recruiter
+        token["is_staff"] = user.is_staff
+        token["ban_version"] = user.ban_version
+        return token
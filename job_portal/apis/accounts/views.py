@@ -12,6 +12,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = CustomUser.objects.all().order_by("id")
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scopes = {"signup": "signup"}
 
     def get_permissions(self):
         if self.action in ["retrieve", "update", "partial_update", "destroy"]:
@@ -0,0 +1,88 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from apps.jobs.caching import offers_validators
+
+
+def make_etag(*values):
+    source = "|".join(str(value) for value in values)
+    return quote_etag(hashlib.md5(source.encode(), usedforsecurity=False).hexdigest())
+
+
+class ConditionalMixin:
+    """
+    Requêtes conditionnelles (ETag / Last-Modified) pour les lectures.
+
+    Une offre est validée par son ``updated_at`` et le nom de son recruteur
+    (``publisher_name``), lus par clé primaire. Les
+    listes le sont par les numéros de version des offres tenus dans le cache
+    partagé (voir apps/jobs/caching.py), sans requête SQL : une réponse
+    inchangée renvoie 304 sans lire les offres ni sérialiser le corps.
+    """
+
+    conditional_validators = None
+
+    def get_validators(self):
+        if self.detail:
+            return self.get_object_validators()
+        version, counts_version, last_modified = offers_validators()
+        # is_expired et les offres disponibles changent avec le temps sans
+        # écriture : validateurs renouvelés à la cadence des pages en cache
+        period = settings.JOB_LISTING_CACHE_TIMEOUT
+        period_start = int(time.time() // period * period)
+        etag = make_etag(
+            self.request.get_full_path(),
+            self.request.user.pk,
+            version,
+            counts_version,
+            period_start,
+        )
+        return etag, max(int(last_modified), period_start)
+
+    def get_object_validators(self):
+        """
+        Validateurs de l'offre demandée, ou ``(None, None)`` si elle est
+        introuvable (la vue renvoie alors son 404 habituel).
+        """
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        row = (
+            self.get_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup]})
+            .values_list("pk", "updated_at", "expires_at", "publisher__username")
+            .first()
+        )
+        if row is None:
+            return None, None
+        pk, updated_at, expires_at, publisher_name = row
+        # is_expired bascule à expires_at, sans écriture
+        expired = expires_at <= timezone.now()
+        last_modified = max(updated_at, expires_at) if expired else updated_at
+        etag = make_etag(pk, updated_at.isoformat(), expired, publisher_name)
+        return etag, int(last_modified.timestamp())
+
+    def conditional_response(self):
+        """
+        Renvoie la réponse 304/412 si le client possède déjà la version
+        courante, sinon ``None`` ; les validateurs sont ajoutés ensuite à la
+        réponse par ``finalize_response``.
+        """
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return None
+        self.conditional_validators = (etag, last_modified)
+        return get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.conditional_validators and response.status_code in (200, 304):
+            etag, last_modified = self.conditional_validators
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
@@ -0,0 +1,63 @@
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.jobs.pagination import InvalidCursor, KeysetPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur opaque (``?cursor=``), sans COUNT(*) ni OFFSET.
+
+    La vue peut imposer son tri via un attribut ``keyset_ordering``.
+    """
+
+    ordering = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Curseur invalide"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        ordering = getattr(view, "keyset_ordering", None) or self.ordering
+        paginator = KeysetPaginator(
+            queryset, ordering, per_page=settings.REST_FRAMEWORK["PAGE_SIZE"]
+        )
+        try:
+            self.page = paginator.get_page(
+                request.query_params.get(self.cursor_query_param), strict=True
+            )
+        except InvalidCursor:
+            raise NotFound(self.invalid_cursor_message)
+        return list(self.page)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class ApplicationKeysetPagination(KeysetPagination):
+    ordering = ("-applied_at", "-id")
@@ -1,11 +1,71 @@
 from rest_framework import serializers
-from apps.jobs.models import JobOffer, JobApplication
+from apps.jobs.applying import offers_for_applicant
+from apps.jobs.models import (
+    JobApplication,
+    JobOffer,
+    parse_salary_range,
+    salary_range_error,
+)
+from apps.jobs.registry import application_statuses, job_statuses
 from django.utils import timezone
 
 
+class StatusField(serializers.RelatedField):
+    """
+    Statut représenté par son nom et résolu via le registre en mémoire :
+    ni requête pour valider l'entrée, ni chargement de la clé étrangère
+    pour la sortie.
+    """
+
+    default_error_messages = {
+        "does_not_exist": "Statut inconnu : {name}.",
+        "incorrect_type": "Nom de statut attendu.",
+    }
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        if not kwargs.get("read_only"):
+            kwargs.setdefault("queryset", registry.model.objects.all())
+        super().__init__(**kwargs)
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_representation(self, value):
+        status = self.registry.by_id(value.pk)
+        return status.name if status is not None else None
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("incorrect_type")
+        status = self.registry.get(data, create=False)
+        if status is None:
+            self.fail("does_not_exist", name=data)
+        return status
+
+
+class JobOfferListSerializer(serializers.ListSerializer):
+    """
+    Validation groupée des offres. Pour une mise à jour, ``instance`` est la
+    liste des offres concernées : chaque ligne est validée contre l'offre
+    portant son ``id``.
+    """
+
+    def to_internal_value(self, data):
+        if self.instance is not None:
+            self.instances = {job.pk: job for job in self.instance}
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            self.child.instance = self.instances[int(data["id"])]
+        return super().run_child_validation(data)
+
+
 class JobOfferSerializer(serializers.ModelSerializer):
     publisher_name = serializers.CharField(source="publisher.username", read_only=True)
     is_expired = serializers.BooleanField(read_only=True)
+    status = StatusField(job_statuses, required=False, allow_null=True)
 
     class Meta:
         model = JobOffer
@@ -16,13 +76,26 @@ class JobOfferSerializer(serializers.ModelSerializer):
             "description",
             "location",
             "salary_range",
+            "salary_min",
+            "salary_max",
             "status",
+            "applications_count",
             "created_at",
+            "updated_at",
             "expires_at",
             "publisher_name",
             "is_expired",
         ]
-        read_only_fields = ["publisher_name", "created_at", "is_expired"]
+        read_only_fields = [
+            "publisher_name",
+            "created_at",
+            "updated_at",
+            "is_expired",
+            "salary_min",
+            "salary_max",
+            "applications_count",
+        ]
+        list_serializer_class = JobOfferListSerializer
 
     def validate_expires_at(self, value):
         if value and value < timezone.now():
@@ -31,10 +104,21 @@ class JobOfferSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate(self, attrs):
+        if "salary_range" in attrs:
+            error = salary_range_error(attrs["salary_range"])
+            if error:
+                raise serializers.ValidationError({"salary_range": error})
+            salary_min, salary_max = parse_salary_range(attrs["salary_range"])
+            attrs["salary_min"] = salary_min
+            attrs["salary_max"] = salary_max
+        return attrs
+
 
 class JobApplicationSerializer(serializers.ModelSerializer):
     job_title = serializers.CharField(source="job.title", read_only=True)
     applicant_name = serializers.CharField(source="applicant.username", read_only=True)
+    status = StatusField(application_statuses, read_only=True)
 
     class Meta:
         model = JobApplication
@@ -47,4 +131,35 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             "status",
             "cover_letter",
         ]
-        read_only_fields = ["applicant", "applied_at"]
+        read_only_fields = ["applicant", "applied_at", "status"]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is not None:
+            # already_applied lu avec l'offre, pour check_eligibility
+            fields["job"].queryset = offers_for_applicant(request.user)
+        return fields
+
+
+class BulkJobOfferRowSerializer(serializers.Serializer):
+    """Action et cible d'une ligne d'un envoi groupé d'offres."""
+
+    CREATE, UPDATE, CLOSE = "create", "update", "close"
+
+    action = serializers.ChoiceField([CREATE, UPDATE, CLOSE], required=False)
+    id = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("action", self.UPDATE if "id" in attrs else self.CREATE)
+        if attrs["action"] != self.CREATE and "id" not in attrs:
+            raise serializers.ValidationError({"id": "Ce champ est obligatoire."})
+        return attrs
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000
+    )
+    status = StatusField(application_statuses)
+    notes = serializers.CharField(required=False, allow_blank=True)
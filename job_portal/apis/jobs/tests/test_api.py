@@ -1,14 +1,26 @@
+import csv
+import json
+from unittest import mock
+
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
-from apps.jobs.models import JobOffer, JobApplication
+from apps.jobs.models import ApplicationStatus, JobOffer, JobApplication, JobStatus
+from apps.jobs.pagination import encode_cursor
 from apps.accounts.models import CustomUser
+from apps.accounts.tests import SHARED_CACHES
 
 
 class JobOfferAPITests(APITestCase):
     def setUp(self):
+        cache.clear()
         # Créer un utilisateur de test
         self.user = CustomUser.objects.create_user(
             username="testuser",
@@ -45,3 +57,523 @@ class JobOfferAPITests(APITestCase):
         self.assertEqual(job.title, "Développeur Python")
         self.assertEqual(job.company, "Test Company")
         self.assertEqual(job.publisher, self.user)
+
+    def test_create_job_rejects_salary_out_of_column_range(self):
+        data = {
+            "title": "Développeur Python",
+            "description": "Description du poste",
+            "company": "Test Company",
+            "location": "Paris",
+            "salary_range": "99999999999",
+            "expires_at": (timezone.now() + timedelta(days=30)).isoformat(),
+        }
+
+        response = self.client.post(reverse("api-job-list"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("salary_range", response.data)
+
+    def test_list_is_paginated_by_cursor(self):
+        status_active = JobStatus.objects.get_or_create(name="active")[0]
+        for i in range(15):
+            JobOffer.objects.create(
+                title=f"Offre {i}",
+                description="Description du poste",
+                company="Test Company",
+                location="Paris",
+                publisher=self.user,
+                status=status_active,
+                expires_at=timezone.now() + timedelta(days=30),
+            )
+        url = reverse("api-job-list")
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", first.data)
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(len(first.data["results"]), 10)
+
+        second = self.client.get(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 5)
+        self.assertIsNone(second.data["next"])
+        ids = [job["id"] for job in first.data["results"] + second.data["results"]]
+        self.assertEqual(len(set(ids)), 15)
+
+        for cursor in ("invalide", encode_cursor(["hier", "un"])):
+            self.assertEqual(
+                self.client.get(url, {"cursor": cursor}).status_code,
+                status.HTTP_404_NOT_FOUND,
+            )
+
+    def test_facets_action_returns_results_and_counts(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        for location in ["Gitega", "Gitega", "Ngozi"]:
+            JobOffer.objects.create(
+                title="Développeur Python",
+                description="Description",
+                company="Test Company",
+                location=location,
+                publisher=self.user,
+                status=status_active,
+                expires_at=timezone.now() + timedelta(days=30),
+            )
+
+        response = self.client.get(reverse("api-job-facets"), {"q": "python"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(
+            response.data["facets"]["location"],
+            [{"value": "Gitega", "count": 2}, {"value": "Ngozi", "count": 1}],
+        )
+
+    def test_facets_cache_is_not_poisoned_by_equivalent_filters(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        for location in ["Gitega", "Ngozi"]:
+            JobOffer.objects.create(
+                title="Développeur Python",
+                description="Description",
+                company="Test Company",
+                location=location,
+                publisher=self.user,
+                status=status_active,
+                expires_at=timezone.now() + timedelta(days=30),
+            )
+        url = reverse("api-job-facets")
+
+        # Mêmes filtres normalisés que la requête sans filtre, ou que
+        # location=gitega : les résultats doivent l'être aussi
+        response = self.client.get(url, {"location": "Tous les lieux"})
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(url, {"location": " Gitega ", "min_salary": " "})
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            response.data["facets"]["location"],
+            [{"value": "Gitega", "count": 1}, {"value": "Ngozi", "count": 1}],
+        )
+        response = self.client.get(url, {"location": "gitega"})
+        self.assertEqual(
+            response.data["facets"]["location"], [{"value": "Gitega", "count": 1}]
+        )
+
+    def test_unchanged_list_and_detail_return_304(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        job = JobOffer.objects.create(
+            title="Développeur Python",
+            description="Description",
+            company="Test Company",
+            location="Paris",
+            publisher=self.user,
+            status=status_active,
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+
+        for url in (reverse("api-job-list"), reverse("api-job-detail", args=[job.pk])):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            self.assertIn("Last-Modified", first)
+
+            unchanged = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(unchanged["ETag"], first["ETag"])
+
+            job.title = f"{job.title} (mise à jour)"
+            job.save()
+            changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(changed.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_validators_cost_no_query(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        job = JobOffer.objects.create(
+            title="Développeur Python",
+            description="Description",
+            company="Test Company",
+            location="Paris",
+            publisher=self.user,
+            status=status_active,
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+        url = reverse("api-job-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(url)
+        # Pas d'agrégat MAX(updated_at)/COUNT avant la lecture de la page
+        self.assertEqual(len(queries), 1)
+        with self.assertNumQueries(0):
+            unchanged = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Une candidature change applications_count, donc la représentation
+        JobApplication.objects.create(
+            job=job,
+            applicant=CustomUser.objects.create_user(
+                username="candidat", password="testpass123"
+            ),
+            status=ApplicationStatus.objects.get_or_create(name="Pending")[0],
+            cover_letter="Motivation",
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data["results"][0]["applications_count"], 1)
+
+    def test_publisher_rename_changes_validators(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        job = JobOffer.objects.create(
+            title="Développeur Python",
+            description="Description",
+            company="Test Company",
+            location="Paris",
+            publisher=self.user,
+            status=status_active,
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+        urls = [reverse("api-job-list"), reverse("api-job-detail", args=[job.pk])]
+        etags = [self.client.get(url)["ETag"] for url in urls]
+
+        # Une connexion (update_fields=["last_login"]) ne change rien
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.username = "recruteur"
+        user.save()
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["publisher_name"], "recruteur")
+
+    def test_detail_validators_come_from_the_row(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        job = JobOffer.objects.create(
+            title="Développeur Python",
+            description="Description",
+            company="Test Company",
+            location="Paris",
+            publisher=self.user,
+            status=status_active,
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+        url = reverse("api-job-detail", args=[job.pk])
+        first = self.client.get(url)
+
+        # Un autre worker, ou un cache vidé, donne le même ETag
+        cache.clear()
+        with self.assertNumQueries(1):
+            unchanged = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        JobOffer.objects.filter(pk=job.pk).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertTrue(changed.data["is_expired"])
+
+        missing = reverse("api-job-detail", args=[job.pk + 1])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_bulk_creates_updates_and_closes_in_one_request(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        expires_at = (timezone.now() + timedelta(days=30)).isoformat()
+        existing = [
+            JobOffer.objects.create(
+                title=f"Offre {i}",
+                description="Description",
+                company="Test Company",
+                location="Paris",
+                publisher=self.user,
+                status=status_active,
+                expires_at=timezone.now() + timedelta(days=30),
+            )
+            for i in range(2)
+        ]
+        rows = [
+            {
+                "title": "Développeur Python",
+                "description": "Description",
+                "company": "Test Company",
+                "location": "Gitega",
+                "salary_range": "45000-55000",
+                "expires_at": expires_at,
+            },
+            {"id": existing[0].pk, "title": "Offre modifiée"},
+            {"id": existing[1].pk, "action": "close"},
+        ]
+
+        response = self.client.post(reverse("api-job-bulk"), rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["action"] for row in response.data["results"]],
+            ["create", "update", "close"],
+        )
+        created = JobOffer.objects.get(pk=response.data["results"][0]["id"])
+        self.assertEqual((created.salary_min, created.status.name), (45000, "active"))
+        self.assertEqual(
+            JobOffer.objects.get(pk=existing[0].pk).title, "Offre modifiée"
+        )
+        self.assertEqual(
+            JobOffer.objects.get(pk=existing[1].pk).status.name, JobStatus.EXPIRED
+        )
+        self.assertEqual(
+            list(JobOffer.objects.search("développeur").values_list("pk", flat=True)),
+            [created.pk],
+        )
+
+    def test_bulk_rejects_an_offer_targeted_twice(self):
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        job = JobOffer.objects.create(
+            title="Offre",
+            description="Description",
+            company="Test Company",
+            location="Paris",
+            publisher=self.user,
+            status=status_active,
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+        rows = [
+            {"id": job.pk, "title": "Premier titre"},
+            {"id": job.pk, "title": "Second titre"},
+            {"id": job.pk, "action": "close"},
+        ]
+
+        response = self.client.post(reverse("api-job-bulk"), rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [set(error) for error in response.data["errors"]], [{"id"}] * 3
+        )
+        job.refresh_from_db()
+        self.assertEqual((job.title, job.status_id), ("Offre", status_active.pk))
+
+    def test_bulk_csv_reports_errors_per_row_and_writes_nothing(self):
+        expires_at = (timezone.now() + timedelta(days=30)).isoformat()
+        content = (
+            "title,description,company,location,expires_at\n"
+            f"Offre valide,Description,Test Company,Paris,{expires_at}\n"
+            "Offre incomplète,Description,Test Company,,\n"
+        )
+        upload = SimpleUploadedFile(
+            "offres.csv", content.encode(), content_type="text/csv"
+        )
+
+        response = self.client.post(reverse("api-job-bulk"), {"file": upload})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["errors"]
+        self.assertEqual(errors[0], {})
+        self.assertEqual(set(errors[1]), {"location", "expires_at"})
+        self.assertFalse(JobOffer.objects.exists())
+
+
+class JobApplicationAPITests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = CustomUser.objects.create_user(
+            username="recruteur", password="testpass123", is_recruiter=True
+        )
+        other = CustomUser.objects.create_user(
+            username="autre", password="testpass123", is_recruiter=True
+        )
+        status_active, _ = JobStatus.objects.get_or_create(name="active")
+        jobs = [
+            JobOffer.objects.create(
+                title="Développeur Python",
+                description="Description",
+                company="Test Company",
+                location="Paris",
+                publisher=publisher,
+                status=status_active,
+                expires_at=timezone.now() + timedelta(days=30),
+            )
+            for publisher in (self.recruiter, other)
+        ]
+        self.applications = [
+            JobApplication.objects.create(
+                job=job,
+                applicant=CustomUser.objects.create_user(
+                    username=f"candidat{i}", password="testpass123"
+                ),
+                cover_letter="Motivation",
+            )
+            for i, job in enumerate([jobs[0], jobs[0], jobs[1]])
+        ]
+        self.client.force_authenticate(user=self.recruiter)
+
+    def test_create_goes_through_the_apply_checks(self):
+        candidate = self.applications[0].applicant
+        self.client.force_authenticate(user=candidate)
+        url = reverse("api-application-list")
+        data = {"job": self.applications[2].job_id, "cover_letter": "Motivation"}
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], ApplicationStatus.PENDING)
+        # Doublon cherché avec l'offre, pas par une requête à part
+        self.assertFalse(
+            [
+                q
+                for q in queries
+                if q["sql"].startswith('SELECT 1 AS "a" FROM "jobs_jobapplication"')
+            ]
+        )
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("déjà postulé", response.data["detail"])
+
+        # Doublon inséré entre la vérification et l'insertion : pas de 500
+        with mock.patch("apis.jobs.views.check_eligibility"):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("déjà postulé", response.data["detail"])
+
+    def test_apply_refuses_duplicates(self):
+        candidate = self.applications[0].applicant
+        self.client.force_authenticate(user=candidate)
+        url = reverse("api-job-apply", args=[self.applications[2].job_id])
+
+        response = self.client.post(url, {"cover_letter": "Motivation"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, {"cover_letter": "Motivation"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("déjà postulé", response.data["detail"])
+        self.assertEqual(JobApplication.objects.filter(applicant=candidate).count(), 2)
+
+        self.client.force_authenticate(user=self.recruiter)
+        response = self.client.post(url, {"cover_letter": "Motivation"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_status_updates_only_owned_applications(self):
+        ids = [application.id for application in self.applications] + [9999]
+
+        response = self.client.post(
+            reverse("api-application-bulk-status"),
+            {"ids": ids, "status": "Rejected", "notes": "Profil incomplet"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(response.data["results"][ids[2]], "not_found")
+        self.assertEqual(response.data["results"][9999], "not_found")
+        rejected = JobApplication.objects.filter(
+            status__name="Rejected", notes="Profil incomplet"
+        )
+        self.assertEqual(set(rejected.values_list("id", flat=True)), set(ids[:2]))
+
+    def test_bulk_status_rejects_unknown_status(self):
+        response = self.client.post(
+            reverse("api-application-bulk-status"),
+            {"ids": [self.applications[0].id], "status": "Inconnu"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_streams_only_owned_applications(self):
+        url = reverse("api-application-export")
+
+        response = self.client.get(url, {"output": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0].split(",")[:4], ["id", "job_id", "job_title", "applicant"]
+        )
+        self.assertEqual(len(lines), 3)
+
+        response = self.client.get(url, {"output": "ndjson"})
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual({row["applicant"] for row in rows}, {"candidat0", "candidat1"})
+
+        self.assertEqual(
+            self.client.get(url, {"output": "xml"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_csv_export_neutralizes_formulas(self):
+        self.applications[0].cover_letter = '=HYPERLINK("http://example.com")'
+        self.applications[0].notes = "-2+3"
+        self.applications[0].save()
+
+        response = self.client.get(reverse("api-application-export"), {"output": "csv"})
+
+        rows = list(
+            csv.DictReader(b"".join(response.streaming_content).decode().splitlines())
+        )
+        row = next(row for row in rows if row["id"] == str(self.applications[0].pk))
+        self.assertEqual(row["cover_letter"], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row["notes"], "'-2+3")
+        self.assertEqual(rows[1]["cover_letter"], "Motivation")
+
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username="recruteur", password="testpass123", is_recruiter=True
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"username": "recruteur", "password": "testpass123"},
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("api-job-my-published-jobs"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query["sql"]
+            for query in queries
+            if 'FROM "accounts_customuser"' in query["sql"]
+        ]
+
+    def test_claims_are_used_without_loading_the_user(self):
+        # Cache propre au processus : seule la colonne ban_version est relue
+        self.assertEqual(
+            [sql.split(" FROM ")[0] for sql in self.user_queries()],
+            ['SELECT "accounts_customuser"."ban_version"'],
+        )
+
+        with self.settings(CACHES=SHARED_CACHES):
+            cache.clear()
+            self.user_queries()
+            self.assertEqual(self.user_queries(), [])
+
+    def test_ban_revokes_issued_tokens(self):
+        self.user.ban_user()
+
+        response = self.client.get(reverse("api-job-my-published-jobs"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ban_by_plain_save_revokes_issued_tokens(self):
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.is_banned = True
+        user.save()
+
+        response = self.client.get(reverse("api-job-my-published-jobs"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ban_made_by_another_worker_is_seen(self):
+        # Ban écrit ailleurs, sans passer par le cache de ce processus
+        CustomUser.objects.filter(pk=self.user.pk).update(
+            is_banned=True, ban_version=F("ban_version") + 1
+        )
+
+        response = self.client.get(reverse("api-job-my-published-jobs"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
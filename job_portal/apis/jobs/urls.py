@@ -21,3 +21,5 @@ urlpatterns = [
 # /jobs/api/applications/ - List and create applications
 # /jobs/api/applications/{id}/ - Detail of an application
 # /jobs/api/applications/{id}/cancel/ - Cancel an application
+# /jobs/api/jobs/bulk/ - Create, update and close offers in bulk (JSON or CSV)
+# /jobs/api/applications/export/?output=csv|ndjson&job={id} - Stream an export
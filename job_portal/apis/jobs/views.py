@@ -1,86 +1,106 @@
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
-from rest_framework.response import Response
-from apps.jobs.models import JobOffer, JobApplication
-from .serializers import JobOfferSerializer, JobApplicationSerializer
-from django.utils import timezone
+import csv
+from collections import Counter
 
-from rest_framework import viewsets, permissions, status
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
-from django.utils import timezone
-from django.db.models import Q
-
-from apps.jobs.models import JobOffer, JobApplication
-from .serializers import JobOfferSerializer, JobApplicationSerializer
-
 
-class JobOfferViewSet(viewsets.ModelViewSet):
+from apis.accounts.authentication import CLAIMS_AUTHENTICATION_CLASSES
+from apps.jobs.applying import (
+    ApplicationRefused,
+    check_eligibility,
+    offers_for_applicant,
+    submit_application,
+)
+from apps.jobs.bulk import bulk_write_job_offers
+from apps.jobs.exports import FORMATS, export_applications
+from apps.jobs.facets import cached_facet_counts, filter_offers, normalize_filters
+from apps.jobs.models import ApplicationStatus, JobApplication, JobOffer, JobStatus
+from apps.jobs.registry import application_statuses, job_statuses
+
+from .mixins import ConditionalMixin
+from .pagination import ApplicationKeysetPagination, KeysetPagination
+from .serializers import (
+    BulkJobOfferRowSerializer,
+    BulkStatusSerializer,
+    JobApplicationSerializer,
+    JobOfferSerializer,
+)
+
+
+class JobOfferViewSet(ConditionalMixin, viewsets.ModelViewSet):
     serializer_class = JobOfferSerializer
+    authentication_classes = CLAIMS_AUTHENTICATION_CLASSES
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scopes = {"apply": "apply"}
     filterset_fields = ["status", "company", "location"]
     search_fields = ["title", "description", "company"]
     ordering_fields = ["created_at", "expires_at"]
+    pagination_class = KeysetPagination
 
-    def get_queryset(self):
-        queryset = JobOffer.objects.all()
+    @property
+    def keyset_ordering(self):
+        # Les résultats d'une recherche sont paginés par pertinence
+        if "q" in self.filters:
+            return ("-search_rank", "-created_at", "-id")
+        return ("-created_at", "-id")
 
-        # Filtrage par mot-clé
-        query = self.request.query_params.get("q", "")
-        if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query)
-                | Q(company__icontains=query)
-                | Q(description__icontains=query)
-            )
+    @property
+    def filters(self):
+        # Même forme canonique pour la requête et la clé de cache des facettes
+        return normalize_filters(self.request.query_params)
 
-        # Filtrage par localisation
-        location = self.request.query_params.get("location", "")
-        if location:
-            queryset = queryset.filter(location__iexact=location)
-
-        # Filtrage par salaire
-        min_salary = self.request.query_params.get("min_salary")
-        max_salary = self.request.query_params.get("max_salary")
-        if min_salary and min_salary.isdigit():
-            queryset = queryset.filter(salary_range__gte=int(min_salary))
-        if max_salary and max_salary.isdigit():
-            queryset = queryset.filter(salary_range__lte=int(max_salary))
-
-        # Filtrage par date
-        date_filter = self.request.query_params.get("date_filter")
-        if date_filter:
-            today = timezone.now()
-            if date_filter == "today":
-                queryset = queryset.filter(created_at__date=today.date())
-            elif date_filter == "week":
-                queryset = queryset.filter(
-                    created_at__gte=today - timezone.timedelta(days=7)
-                )
-            elif date_filter == "month":
-                queryset = queryset.filter(
-                    created_at__gte=today - timezone.timedelta(days=30)
-                )
+    def get_queryset(self):
+        filters = self.filters
+        queryset = filter_offers(JobOffer.objects.select_related("publisher"), filters)
+        query = filters.get("q")
+        if query:
+            # Trié par pertinence
+            queryset = queryset.order_by("-search_rank", "-created_at")
 
         # Filtrage selon l'action
         if self.action == "my_published_jobs":
-            return queryset.filter(publisher=self.request.user)
+            return queryset.filter(publisher_id=self.request.user.pk)
         if self.action == "available_jobs":
             return queryset.filter(
-                status="active", expires_at__gt=timezone.now()
-            ).exclude(publisher=self.request.user)
+                status_id=job_statuses.id(JobStatus.ACTIVE),
+                expires_at__gt=timezone.now(),
+            ).exclude(publisher_id=self.request.user.pk)
 
+        if query:
+            return queryset
         return queryset.order_by("-created_at")
 
     def perform_create(self, serializer):
         if not self.request.user.is_recruiter:
             raise PermissionDenied("Seuls les recruteurs peuvent créer des offres")
-        serializer.save(publisher=self.request.user)
+        status = serializer.validated_data.get("status") or job_statuses.get(
+            JobStatus.ACTIVE
+        )
+        serializer.save(publisher_id=self.request.user.pk, status=status)
+
+    def list(self, request, *args, **kwargs):
+        not_modified = self.conditional_response()
+        if not_modified is not None:
+            return not_modified
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        not_modified = self.conditional_response()
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_update(self, serializer):
         instance = serializer.instance
-        if instance.publisher != self.request.user and not self.request.user.is_staff:
+        if (
+            instance.publisher_id != self.request.user.pk
+            and not self.request.user.is_staff
+        ):
             raise PermissionDenied("Vous n'êtes pas autorisé à modifier cette offre")
         serializer.save()
 
@@ -93,24 +113,141 @@ class JobOfferViewSet(viewsets.ModelViewSet):
 
     @action(detail=False)
     def available_jobs(self, request):
+        not_modified = self.conditional_response()
+        if not_modified is not None:
+            return not_modified
         queryset = self.get_queryset()
         page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    @action(detail=False)
+    def facets(self, request):
+        """Résultats filtrés accompagnés des comptes par facette."""
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data["facets"] = cached_facet_counts(queryset, "api", self.filters)
+        return response
+
+    def get_bulk_rows(self, request):
+        """Lignes d'un envoi groupé : tableau JSON ou fichier CSV ``file``."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            rows = request.data
+            if not isinstance(rows, list):
+                raise ValidationError(
+                    {"non_field_errors": ["Liste d'offres attendue."]}
+                )
+            return rows
+        try:
+            lines = upload.read().decode("utf-8-sig").splitlines()
+            # Cellules vides ignorées : une mise à jour ne vide pas les champs
+            return [
+                {name: value for name, value in row.items() if name and value}
+                for row in csv.DictReader(lines)
+            ]
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError({"file": ["Fichier CSV illisible."]})
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Crée, modifie (``id``) ou clôture (``"action": "close"``) des offres
+        en lot. Le lot est validé en entier puis écrit dans une transaction ;
+        si une ligne est invalide, rien n'est écrit et les erreurs sont
+        renvoyées ligne par ligne.
+        """
+        if not request.user.is_recruiter:
+            raise PermissionDenied("Seuls les recruteurs peuvent créer des offres")
+        rows = self.get_bulk_rows(request)
+        if not rows or len(rows) > settings.JOB_BULK_MAX_ROWS:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Entre 1 et {settings.JOB_BULK_MAX_ROWS} offres par envoi."
+                    ]
+                }
+            )
+
+        errors = [{} for _ in rows]
+        targets = []
+        for index, row in enumerate(rows):
+            target = BulkJobOfferRowSerializer(data=row)
+            if not target.is_valid():
+                errors[index] = target.errors
+            targets.append(target.validated_data if not errors[index] else None)
+
+        offers = JobOffer.objects.filter(
+            id__in={target["id"] for target in targets if target and "id" in target}
+        )
+        if not request.user.is_staff:
+            offers = offers.filter(publisher_id=request.user.pk)
+        offers = offers.in_bulk()
+
+        # Une offre visée par deux lignes : la dernière l'emporterait en silence
+        repeated = Counter(
+            target["id"]
+            for target in targets
+            if target is not None and target["action"] != "create"
+        )
+        actions = {action: [] for action in ("create", "update", "close")}
+        for index, target in enumerate(targets):
+            if target is None:
+                continue
+            if target["action"] != "create" and repeated[target["id"]] > 1:
+                errors[index] = {"id": ["Offre présente plusieurs fois dans l'envoi."]}
+                continue
+            if target["action"] != "create" and target["id"] not in offers:
+                errors[index] = {"id": ["Offre introuvable."]}
+                continue
+            actions[target["action"]].append(index)
+
+        creates = self.get_serializer(
+            data=[rows[index] for index in actions["create"]], many=True
+        )
+        updates = self.get_serializer(
+            [offers[targets[index]["id"]] for index in actions["update"]],
+            data=[rows[index] for index in actions["update"]],
+            many=True,
+            partial=True,
+        )
+        for serializer, indexes in (
+            (creates, actions["create"]),
+            (updates, actions["update"]),
+        ):
+            if not serializer.is_valid():
+                for index, error in zip(indexes, serializer.errors):
+                    errors[index] = error or errors[index]
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        created = bulk_write_job_offers(
+            request.user.pk,
+            creates=creates.validated_data,
+            updates=list(zip(updates.instance, updates.validated_data)),
+            closes=[offers[targets[index]["id"]] for index in actions["close"]],
+        )
+
+        results = [None] * len(rows)
+        for index, job in zip(actions["create"], created):
+            results[index] = {"action": "create", "id": job.pk}
+        for kind in ("update", "close"):
+            for index in actions[kind]:
+                results[index] = {"action": kind, "id": targets[index]["id"]}
+        return Response({"results": results})
+
     @action(detail=True, methods=["post"])
     def apply(self, request, pk=None):
-        job = self.get_object()
-        if request.user.is_recruiter:
-            raise PermissionDenied("Les recruteurs ne peuvent pas postuler")
-        if job.publisher == request.user:
-            raise PermissionDenied("Vous ne pouvez pas postuler à votre propre offre")
-        if job.is_expired:
-            raise PermissionDenied("Cette offre a expiré")
-        if JobApplication.objects.filter(job=job, applicant=request.user).exists():
-            raise PermissionDenied("Vous avez déjà postulé à cette offre")
-
-        application = JobApplication.objects.create(job=job, applicant=request.user)
+        # Ni get_object() (filtres de liste, jointure publisher) ni recherche
+        # de doublon : voir apps/jobs/applying.py
+        job = get_object_or_404(offers_for_applicant(request.user), pk=pk)
+        try:
+            check_eligibility(job, request.user)
+            submit_application(job, request.user, request.data.get("cover_letter", ""))
+        except ApplicationRefused as refusal:
+            raise PermissionDenied(refusal.message)
 
         return Response(
             {"status": "success", "message": "Candidature envoyée avec succès"},
@@ -120,68 +257,121 @@ class JobOfferViewSet(viewsets.ModelViewSet):
 
 class JobApplicationViewSet(viewsets.ModelViewSet):
     serializer_class = JobApplicationSerializer
+    authentication_classes = CLAIMS_AUTHENTICATION_CLASSES
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scopes = {"create": "apply"}
+    pagination_class = ApplicationKeysetPagination
 
     def get_queryset(self):
-        queryset = JobApplication.objects.all()
+        queryset = JobApplication.objects.select_related("job", "applicant")
 
-        # Filtrage par statut
+        # Filtrage par nom de statut
         status_filter = self.request.query_params.get("status")
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
+            status_id = application_statuses.id(status_filter, create=False)
+            if status_id is None:
+                return queryset.none()
+            queryset = queryset.filter(status_id=status_id)
 
         if self.request.user.is_recruiter:
-            return queryset.filter(job__publisher=self.request.user)
-        return queryset.filter(applicant=self.request.user)
+            return queryset.filter(job__publisher_id=self.request.user.pk)
+        return queryset.filter(applicant_id=self.request.user.pk)
 
     def perform_create(self, serializer):
+        # Comme l'action apply : l'offre validée par le serializer porte
+        # already_applied, puis une seule insertion (voir apps/jobs/applying.py)
         job = serializer.validated_data["job"]
-
-        # Vérifications
-        if self.request.user.is_recruiter:
-            raise PermissionDenied("Les recruteurs ne peuvent pas postuler")
-        if job.publisher == self.request.user:
-            raise PermissionDenied("Vous ne pouvez pas postuler à votre propre offre")
-        if job.is_expired:
-            raise PermissionDenied("Cette offre a expiré")
-        if JobApplication.objects.filter(job=job, applicant=self.request.user).exists():
-            raise PermissionDenied("Vous avez déjà postulé à cette offre")
-
-        serializer.save(applicant=self.request.user)
+        try:
+            check_eligibility(job, self.request.user)
+            serializer.instance = submit_application(
+                job, self.request.user, serializer.validated_data["cover_letter"]
+            )
+        except ApplicationRefused as refusal:
+            raise PermissionDenied(refusal.message)
 
     @action(detail=True, methods=["post"])
     def update_status(self, request, pk=None):
         application = self.get_object()
 
         # Vérifier que l'utilisateur est le recruteur de l'offre
-        if application.job.publisher != request.user:
+        if application.job.publisher_id != request.user.pk:
             raise PermissionDenied(
                 "Seul le recruteur peut modifier le statut de la candidature"
             )
 
-        new_status = request.data.get("status")
-        if new_status not in dict(JobApplication.STATUS_CHOICES):
+        new_status = application_statuses.get(
+            str(request.data.get("status", "")), create=False
+        )
+        if new_status is None:
             return Response(
                 {"error": "Statut invalide"}, status=status.HTTP_400_BAD_REQUEST
             )
 
         application.status = new_status
-        application.save()
+        application.save(changed_by=request.user)
 
         return Response(
             {"status": "success", "message": "Statut mis à jour avec succès"}
         )
 
+    @action(detail=False, methods=["post"])
+    def bulk_status(self, request):
+        """Applique un statut à plusieurs candidatures des offres du recruteur."""
+        if not request.user.is_recruiter:
+            raise PermissionDenied(
+                "Seul le recruteur peut modifier le statut des candidatures"
+            )
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = JobApplication.objects.filter(
+            job__publisher_id=request.user.pk
+        ).bulk_set_status(
+            serializer.validated_data["ids"],
+            serializer.validated_data["status"],
+            serializer.validated_data.get("notes"),
+            changed_by=request.user,
+        )
+
+        return Response(
+            {
+                "updated": sum(result == "updated" for result in results.values()),
+                "results": results,
+            }
+        )
+
+    @action(detail=False)
+    def export(self, request):
+        """
+        Export en flux des candidatures du recruteur (``?output=csv|ndjson``),
+        pour une offre avec ``?job=`` ou pour toutes ses offres.
+        """
+        if not request.user.is_recruiter:
+            raise PermissionDenied("Seul le recruteur peut exporter les candidatures")
+        output = request.query_params.get("output", "csv")
+        if output not in FORMATS:
+            return Response(
+                {"error": "Format d'export invalide"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.get_queryset()
+        job_id = request.query_params.get("job", "")
+        if job_id.isdigit():
+            queryset = queryset.filter(job_id=int(job_id))
+        return export_applications(queryset, output)
+
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
         application = self.get_object()
 
         # Vérifier que l'utilisateur est le candidat
-        if application.applicant != request.user:
+        if application.applicant_id != request.user.pk:
             raise PermissionDenied("Seul le candidat peut annuler sa candidature")
 
-        application.status = "cancelled"
-        application.save()
+        # Le candidat n'est pas prévenu de sa propre annulation
+        application.status = application_statuses.get(ApplicationStatus.CANCELLED)
+        application.save(changed_by=request.user)
 
         return Response(
             {"status": "success", "message": "Candidature annulée avec succès"}
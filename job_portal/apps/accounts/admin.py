@@ -1,5 +1,58 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
+
+from apps.jobs.pagination import EstimatedCountPaginator
+
 from .models import CustomUser
 
-admin.site.register(CustomUser, UserAdmin)
+
+@admin.register(CustomUser)
+class CustomUserAdmin(UserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    list_display = (
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "is_recruiter",
+        "is_banned",
+        "is_staff",
+        "date_joined",
+    )
+    list_filter = ("is_recruiter", "is_banned", "is_staff", "is_active")
+    # Index accounts_user_joined_idx
+    date_hierarchy = "date_joined"
+    search_help_text = "Nom d'utilisateur ou adresse e-mail exacts, ou identifiant"
+    fieldsets = UserAdmin.fieldsets + (
+        ("Portail", {"fields": ("is_recruiter", "is_banned", "phone_number")}),
+    )
+    actions = ["ban_users", "unban_users"]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Égalités sur des colonnes indexées (username unique, email) plutôt
+        # que les icontains de UserAdmin qui parcourent toute la table
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            return queryset.filter(pk=search_term), False
+        return (
+            queryset.filter(username=search_term) | queryset.filter(email=search_term),
+            False,
+        )
+
+    @admin.action(description="Bannir les utilisateurs sélectionnés")
+    def ban_users(self, request, queryset):
+        count = CustomUser.set_banned(queryset, True)
+        self.message_user(
+            request, f"{count} utilisateur(s) banni(s).", messages.SUCCESS
+        )
+
+    @admin.action(description="Lever le bannissement des utilisateurs sélectionnés")
+    def unban_users(self, request, queryset):
+        count = CustomUser.set_banned(queryset, False)
+        self.message_user(
+            request, f"{count} utilisateur(s) débanni(s).", messages.SUCCESS
+        )
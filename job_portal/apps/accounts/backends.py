@@ -1,6 +1,9 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
+from django.db import DEFAULT_DB_ALIAS
+
+from .caching import user_cache
 
 
 class CustomAuthBackend(ModelBackend):
@@ -15,9 +18,20 @@ class CustomAuthBackend(ModelBackend):
         except UserModel.DoesNotExist:
             return None
 
+    def user_can_authenticate(self, user):
+        # Un bannissement coupe aussi les sessions ouvertes, dès la requête
+        # suivante
+        return not user.is_banned and super().user_can_authenticate(user)
+
     def get_user(self, user_id):
+        user = user_cache.get(user_id, self.load_user)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    def load_user(self, user_id):
         UserModel = get_user_model()
         try:
-            return UserModel.objects.get(pk=user_id)
+            # Sur le primaire : un réplica en retard rendrait un utilisateur
+            # pas encore banni, gardé sous la nouvelle version du cache
+            return UserModel.objects.using(DEFAULT_DB_ALIAS).get(pk=user_id)
         except UserModel.DoesNotExist:
             return None
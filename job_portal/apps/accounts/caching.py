@@ -0,0 +1,158 @@
+"""
+Cache par processus des utilisateurs résolus par ``CustomAuthBackend.get_user``.
+
+Chaque entrée est marquée du numéro de version de l'utilisateur, conservé
+dans le cache partagé de Django. Toute écriture sur l'utilisateur (save,
+``ban_user``/``unban_user``, changement de mot de passe, suppression)
+incrémente ce numéro : l'entrée est alors ignorée par tous les workers dès
+la requête suivante. Une requête authentifiée coûte une lecture de cache au
+lieu d'une lecture SQL.
+
+Le ``ban_version`` de chaque utilisateur y est aussi recopié, pour une
+durée courte, afin de vérifier les jetons JWT sans lecture SQL (voir
+apis/accounts/authentication.py).
+
+Les ``QuerySet.update()`` sur les utilisateurs contournent les signaux et
+doivent appeler ``bump_user_version`` eux-mêmes.
+
+L'invalidation n'atteint les autres workers que si le cache par défaut est
+partagé (Redis, Memcached, fichiers), ce que prod exige (REDIS_URL, voir
+job_portal/settings/prod.py). Avec un cache propre au processus (LocMem,
+Dummy, en développement), ``user_cache`` est désactivé et chaque requête
+relit l'utilisateur en base.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+
+
+def is_shared_cache():
+    """Faux si les écritures du cache par défaut restent dans ce processus."""
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def version_key(user_id):
+    return f"accounts:user:{user_id}:version"
+
+
+def user_version(user_id):
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Horodatage : une clé évincée ne redonne pas une ancienne version
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user_id):
+    try:
+        cache.incr(version_key(user_id))
+    except ValueError:
+        cache.set(version_key(user_id), time.time_ns(), None)
+    user_cache.discard(user_id)
+
+
+def ban_version_key(user_id):
+    return f"accounts:user:{user_id}:ban"
+
+
+def ban_version(user_id):
+    """
+    ``ban_version`` courant de l'utilisateur, ou None s'il n'existe pas.
+
+    La colonne fait foi ; sa copie dans le cache partagé (exigé en prod)
+    expire après ``USER_BAN_CACHE_TIMEOUT`` secondes au plus. Sans cache
+    partagé, en développement, elle est relue à chaque appel : un worker ne
+    voit pas les écritures des autres.
+    """
+    shared = is_shared_cache()
+    if shared:
+        version = cache.get(ban_version_key(user_id))
+        if version is not None:
+            return version
+
+    from .models import CustomUser
+
+    # Sur le primaire, comme load_user : pas de copie d'un réplica en retard
+    version = (
+        CustomUser.objects.using(DEFAULT_DB_ALIAS)
+        .filter(pk=user_id)
+        .values_list("ban_version", flat=True)
+        .first()
+    )
+    if shared and version is not None:
+        cache.set(ban_version_key(user_id), version, settings.USER_BAN_CACHE_TIMEOUT)
+    return version
+
+
+def set_ban_versions(versions):
+    """Recopie ``{user_id: ban_version}`` dans le cache partagé."""
+    if is_shared_cache():
+        cache.set_many(
+            {ban_version_key(user_id): version for user_id, version in versions},
+            settings.USER_BAN_CACHE_TIMEOUT,
+        )
+
+
+class UserCache:
+    """
+    LRU de ``USER_CACHE_SIZE`` entrées, valables ``USER_CACHE_TIMEOUT``
+    secondes au plus. Désactivé sans cache partagé (voir ``is_shared_cache``),
+    donc seulement hors prod.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, load):
+        """
+        Renvoie une copie de l'utilisateur ``user_id``, chargé par
+        ``load(user_id)`` si l'entrée est absente, expirée ou d'une version
+        antérieure. ``load`` peut renvoyer None (utilisateur inexistant).
+        """
+        if not settings.USER_CACHE_TIMEOUT or not is_shared_cache():
+            return load(user_id)
+        version = user_version(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                if entry[0] == version and entry[1] > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    return copy.copy(entry[2])
+                del self._entries[user_id]
+
+        # Version lue avant le chargement : une écriture concurrente rend
+        # l'entrée périmée au lieu de la masquer
+        user = load(user_id)
+        if user is None:
+            return None
+        with self._lock:
+            self._entries[user_id] = (
+                version,
+                time.monotonic() + settings.USER_CACHE_TIMEOUT,
+                user,
+            )
+            while len(self._entries) > settings.USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+        return copy.copy(user)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
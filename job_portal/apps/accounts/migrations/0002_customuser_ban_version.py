@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="ban_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
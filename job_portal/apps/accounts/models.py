@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F
+
+from .caching import bump_user_version, set_ban_versions
 
 
 class CustomUser(AbstractUser):
@@ -22,6 +25,15 @@ class CustomUser(AbstractUser):
         verbose_name="Utilisateur banni",
         help_text="Indique si l'utilisateur est banni du système",
     )
+    # Incrémenté à chaque (dé)bannissement : révoque les jetons JWT émis avant
+    ban_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Recherche exacte et hiérarchie par dates de l'admin
+            models.Index(fields=["email"], name="accounts_user_email_idx"),
+            models.Index(fields=["date_joined"], name="accounts_user_joined_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -30,6 +42,32 @@ class CustomUser(AbstractUser):
             else f"{self.username}" + f"{self.phone_number}"
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        # État chargé, pour détecter un (dé)bannissement dans save() et un
+        # changement de nom (publisher_name des offres, voir apps/jobs/signals.py)
+        user._loaded_is_banned = user.__dict__.get("is_banned")
+        user._loaded_username = user.__dict__.get("username")
+        return user
+
+    def save(self, *args, **kwargs):
+        # Tout changement de is_banned, y compris par le formulaire de
+        # l'admin, révoque les jetons émis avant
+        update_fields = kwargs.get("update_fields")
+        if (
+            not self._state.adding
+            and (update_fields is None or "is_banned" in update_fields)
+            and self.__dict__.get("is_banned")
+            != getattr(self, "_loaded_is_banned", None)
+        ):
+            self.ban_version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "ban_version"}
+        super().save(*args, **kwargs)
+        self._loaded_is_banned = self.__dict__.get("is_banned")
+        self._loaded_username = self.__dict__.get("username")
+
     def ban_user(self):
         self.is_banned = True
         self.save()
@@ -37,3 +75,21 @@ class CustomUser(AbstractUser):
     def unban_user(self):
         self.is_banned = False
         self.save()
+
+    @classmethod
+    def set_banned(cls, queryset, banned=True):
+        """
+        ``ban_user``/``unban_user`` pour tout un queryset, en un UPDATE.
+        Renvoie le nombre d'utilisateurs modifiés.
+        """
+        ids = list(queryset.exclude(is_banned=banned).values_list("pk", flat=True))
+        cls.objects.filter(pk__in=ids).update(
+            is_banned=banned, ban_version=F("ban_version") + 1
+        )
+        # update() contourne les signaux (voir apps/accounts/caching.py)
+        set_ban_versions(
+            cls.objects.filter(pk__in=ids).values_list("pk", "ban_version")
+        )
+        for user_id in ids:
+            bump_user_version(user_id)
+        return len(ids)
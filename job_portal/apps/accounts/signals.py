@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from job_portal.throttling import record_failed_login
+
+from .caching import ban_version_key, bump_user_version, set_ban_versions
+
+
+# Couvre les (dé)bannissements et set_password, qui passent par save()
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def store_ban_version(sender, instance, **kwargs):
+    set_ban_versions([(instance.pk, instance.ban_version)])
+
+
+@receiver(post_delete, sender=get_user_model())
+def remove_ban_version(sender, instance, **kwargs):
+    cache.delete(ban_version_key(instance.pk))
+
+
+# Envoyé par authenticate() pour le formulaire comme pour l'API JWT
+@receiver(user_login_failed)
+def throttle_failed_login(sender, credentials, request=None, **kwargs):
+    if request is not None:
+        record_failed_login(request, credentials.get("username"))
@@ -1,3 +1,233 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from job_portal.routers import replica_reads
+from job_portal.throttling import client_ip
+
+from .backends import CustomAuthBackend
+from .caching import ban_version, is_shared_cache, user_cache, version_key
+from .models import CustomUser
+
+# Cache partagé entre processus, comme Redis en production
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "job_portal_test_cache"),
+    }
+}
+
+
+@override_settings(USER_CACHE_TIMEOUT=300, CACHES=SHARED_CACHES)
+class CachedGetUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.backend = CustomAuthBackend()
+        self.user = CustomUser.objects.create_user(
+            username="candidat", password="testpass123"
+        )
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            first = self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            second = self.backend.get_user(self.user.pk)
+        self.assertEqual(second, self.user)
+        # Chaque requête reçoit sa propre instance
+        self.assertIsNot(first, second)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_process_local_cache_disables_user_cache(self):
+        # Une écriture dans un autre worker ne serait pas vue
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.backend.get_user(self.user.pk)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://cache:6379/0",
+            }
+        }
+    )
+    def test_prod_redis_cache_enables_user_cache(self):
+        # Le cache exigé par prod.py (REDIS_URL)
+        self.assertTrue(is_shared_cache())
+
+    def test_ban_takes_effect_immediately(self):
+        self.backend.get_user(self.user.pk)
+
+        self.user.ban_user()
+
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_write_from_another_worker_invalidates_entry(self):
+        self.backend.get_user(self.user.pk)
+        # Écriture faite ailleurs : seule la version partagée change
+        CustomUser.objects.filter(pk=self.user.pk).update(first_name="Alice")
+        cache.incr(version_key(self.user.pk))
+
+        self.assertEqual(self.backend.get_user(self.user.pk).first_name, "Alice")
+
+    def test_deleted_user_is_not_returned(self):
+        self.backend.get_user(self.user.pk)
+
+        self.user.delete()
+
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+
+# Hors transaction : le routeur garde sur le primaire les lectures faites
+# dans un bloc atomic, comme celui de TestCase
+@override_settings(DATABASE_REPLICAS=["replica"], CACHES=SHARED_CACHES)
+class UserReplicaReadTests(TransactionTestCase):
+    def test_users_and_ban_versions_are_read_from_the_primary(self):
+        cache.clear()
+        user_cache.clear()
+        user = CustomUser.objects.create_user(username="candidat", password="x")
+
+        # L'alias "replica" n'existe pas : toute lecture routée dessus échoue
+        with replica_reads():
+            self.assertEqual(CustomAuthBackend().get_user(user.pk), user)
+            self.assertEqual(ban_version(user.pk), user.ban_version)
+
+
+class UserAdminTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.admin = CustomUser.objects.create_superuser(
+            username="admin", email="admin@example.com", password="testpass123"
+        )
+        self.client.force_login(self.admin)
+        self.users = [
+            CustomUser.objects.create_user(
+                username=f"candidat{i}",
+                email=f"candidat{i}@example.com",
+                password="testpass123",
+            )
+            for i in range(3)
+        ]
+
+    def test_search_matches_exact_username_or_email(self):
+        url = reverse("admin:accounts_customuser_changelist")
+        response = self.client.get(url, {"q": "candidat1@example.com"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.users[1]])
+        response = self.client.get(url, {"q": "candidat"})
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_ban_from_change_form_revokes_tokens(self):
+        user = self.users[0]
+        old_version = ban_version(user.pk)
+        url = reverse("admin:accounts_customuser_change", args=[user.pk])
+        data = {
+            "username": user.username,
+            "email": user.email,
+            "is_active": "on",
+            "is_banned": "on",
+            "date_joined_0": user.date_joined.strftime("%Y-%m-%d"),
+            "date_joined_1": user.date_joined.strftime("%H:%M:%S"),
+        }
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 302)
+        user.refresh_from_db()
+        self.assertTrue(user.is_banned)
+        self.assertEqual(ban_version(user.pk), old_version + 1)
+
+    def test_ban_action_revokes_sessions_and_tokens(self):
+        backend = CustomAuthBackend()
+        backend.get_user(self.users[0].pk)
+        old_version = ban_version(self.users[0].pk)
+
+        response = self.client.post(
+            reverse("admin:accounts_customuser_changelist"),
+            {
+                "action": "ban_users",
+                "_selected_action": [user.pk for user in self.users[:2]],
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            list(CustomUser.objects.filter(is_banned=True).order_by("pk")),
+            self.users[:2],
+        )
+        self.assertIsNone(backend.get_user(self.users[0].pk))
+        self.assertEqual(ban_version(self.users[0].pk), old_version + 1)
+
+
+@override_settings(THROTTLE_BURST=20, THROTTLE_RATE=0.01)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_logins_are_throttled(self):
+        url = reverse("accounts:login")
+        credentials = {"username": "candidat", "password": "mauvais"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, credentials).status_code, 200)
+
+        response = self.client.post(url, credentials)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1000")
+        # L'affichage du formulaire n'est pas débité
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_forwarded_for_header_is_not_trusted(self):
+        url = reverse("accounts:login")
+        for i in range(2):
+            self.client.post(
+                url,
+                {"username": f"candidat{i}", "password": "mauvais"},
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{i}",
+            )
+
+        response = self.client.post(
+            url,
+            {"username": "candidat9", "password": "mauvais"},
+            HTTP_X_FORWARDED_FOR="10.0.0.9",
+        )
+
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(THROTTLE_NUM_PROXIES=1)
+    def test_client_is_the_address_added_by_the_proxy(self):
+        request = RequestFactory().get(
+            "/", HTTP_X_FORWARDED_FOR="1.2.3.4, 10.0.0.1", REMOTE_ADDR="10.0.0.254"
+        )
+        self.assertEqual(client_ip(request), "10.0.0.1")
+
+    def test_failed_logins_do_not_lock_the_account_for_others(self):
+        CustomUser.objects.create_user(username="candidat", password="testpass123")
+        url = reverse("accounts:login")
+        for _ in range(2):
+            self.client.post(url, {"username": "candidat", "password": "mauvais"})
+
+        response = self.client.post(
+            url,
+            {"username": "candidat", "password": "testpass123"},
+            REMOTE_ADDR="10.0.0.2",
+        )
+
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+
+    def test_token_endpoint_is_throttled(self):
+        url = reverse("token_obtain_pair")
+        credentials = {"username": "candidat", "password": "mauvais"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, credentials).status_code, 401)
+
+        response = self.client.post(url, credentials)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
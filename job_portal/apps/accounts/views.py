@@ -12,6 +12,7 @@ from .models import CustomUser
 from django.contrib.auth import logout, update_session_auth_hash
 from django.shortcuts import get_object_or_404
 from apps.jobs.models import JobApplication, JobOffer
+from job_portal.throttling import throttle
 
 
 @login_required
@@ -20,6 +21,7 @@ def user_list(request):
     return render(request, "accounts/user_list.html", {"users": users})
 
 
+@throttle("signup", methods=("POST",))
 def register(request):
     if request.method == "POST":
         form = CustomUserCreationForm(request.POST)
@@ -39,6 +41,7 @@ def register(request):
     return render(request, "accounts/register.html", {"form": form})
 
 
+@throttle("login", methods=("POST",))
 def login_view(request):
     if request.method == "POST":
         form = LoginForm(request.POST)
@@ -115,8 +118,10 @@ def profile(request):
         context["published_jobs"] = published_jobs
     else:
         # Pour les candidats, afficher leurs candidatures
-        applications = JobApplication.objects.filter(applicant=request.user).order_by(
-            "-applied_at"
+        applications = (
+            JobApplication.objects.filter(applicant=request.user)
+            .select_related("job", "status")
+            .order_by("-applied_at")
         )
 
         context["applications"] = applications
@@ -1,6 +1,94 @@
-from django.contrib import admin
-from .models import JobOffer, JobApplication, JobStatus
+from django.conf import settings
+from django.contrib import admin, messages
 
-admin.site.register(JobOffer)
-admin.site.register(JobApplication)
-admin.site.register(JobStatus)
+from .expiry import expire_job_offers
+from .forms import JobOfferAdminForm
+from .models import ApplicationStatus, JobApplication, JobOffer, JobStatus
+from .pagination import EstimatedCountPaginator
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """
+    Listes de l'admin sur de grandes tables : pas de second COUNT(*) pour le
+    total non filtré, compte estimé sans filtre (voir
+    ``EstimatedCountPaginator``), et clés étrangères vers les grandes tables
+    saisies par identifiant plutôt que par un <select> de toutes les lignes.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(JobOffer)
+class JobOfferAdmin(ScalableAdmin):
+    # Mêmes contrôles de la fourchette de salaire que le site
+    form = JobOfferAdminForm
+    list_display = (
+        "title",
+        "company",
+        "location",
+        "publisher",
+        "status",
+        "applications_count",
+        "created_at",
+        "expires_at",
+    )
+    list_select_related = ("publisher", "status")
+    list_filter = ("status",)
+    # Index (-created_at, -id) : tri et bornes de la hiérarchie par dates
+    date_hierarchy = "created_at"
+    ordering = ("-created_at", "-id")
+    raw_id_fields = ("publisher",)
+    # Remplacés par get_search_results ; nécessaires à la barre de recherche
+    search_fields = ("title",)
+    search_help_text = (
+        "Mots du titre, de l'entreprise ou de la description, ou identifiant"
+    )
+    readonly_fields = ("applications_count", "created_at", "updated_at")
+    actions = ["expire_offers"]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Index plein texte (voir apps/jobs/search.py) plutôt que des
+        # icontains qui parcourent toute la table
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            return queryset.filter(pk=search_term), False
+        return queryset.search(search_term), False
+
+    @admin.action(description="Expirer les offres sélectionnées")
+    def expire_offers(self, request, queryset):
+        count = expire_job_offers(settings.JOB_EXPIRY_BATCH_SIZE, queryset=queryset)
+        self.message_user(request, f"{count} offre(s) expirée(s).", messages.SUCCESS)
+
+
+@admin.register(JobApplication)
+class JobApplicationAdmin(ScalableAdmin):
+    # Pas de __str__ : il lit job.title, et applicant, pour chaque ligne
+    list_display = ("id", "job", "applicant", "status", "applied_at")
+    list_display_links = ("id",)
+    list_select_related = ("job", "applicant", "status")
+    list_filter = ("status",)
+    # Index (-applied_at, -id)
+    date_hierarchy = "applied_at"
+    ordering = ("-applied_at", "-id")
+    autocomplete_fields = ("job",)
+    raw_id_fields = ("applicant",)
+    search_fields = ("applicant__username",)
+    search_help_text = "Nom d'utilisateur exact du candidat, ou identifiant"
+
+    def get_search_results(self, request, queryset, search_term):
+        # Égalités sur des colonnes indexées uniquement
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            return queryset.filter(pk=search_term), False
+        return queryset.filter(applicant__username=search_term), False
+
+
+@admin.register(JobStatus, ApplicationStatus)
+class StatusAdmin(admin.ModelAdmin):
+    list_display = ("name", "description")
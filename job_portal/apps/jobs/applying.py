@@ -0,0 +1,81 @@
+"""
+Candidature en deux requêtes : une lecture de l'offre, qui suffit à vérifier
+l'éligibilité du candidat, puis l'insertion.
+
+Le doublon est refusé par la contrainte unique (job, applicant) : un
+candidat qui poste deux fois en parallèle passe la vérification deux fois,
+mais la seconde insertion lève ``IntegrityError``, traitée comme "déjà
+postulé".
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ApplicationStatus, JobApplication, JobOffer, JobStatus
+from .registry import application_statuses, job_statuses
+
+RECRUITER = "recruiter"
+OWN_OFFER = "own_offer"
+UNAVAILABLE = "unavailable"
+ALREADY_APPLIED = "already_applied"
+
+MESSAGES = {
+    RECRUITER: "Les recruteurs ne peuvent pas postuler aux offres d'emploi.",
+    OWN_OFFER: "Vous ne pouvez pas postuler à votre propre offre.",
+    UNAVAILABLE: "Cette offre n'est plus disponible.",
+    ALREADY_APPLIED: "Vous avez déjà postulé à cette offre.",
+}
+
+
+class ApplicationRefused(Exception):
+    def __init__(self, reason):
+        super().__init__(MESSAGES[reason])
+        self.reason = reason
+        self.message = MESSAGES[reason]
+
+
+def offers_for_applicant(user):
+    """
+    Offres annotées de ``already_applied`` pour ``user`` : une seule requête
+    charge l'offre et tout ce que ``check_eligibility`` vérifie.
+    """
+    return JobOffer.objects.annotate(
+        already_applied=Exists(
+            JobApplication.objects.filter(job=OuterRef("pk"), applicant_id=user.pk)
+        )
+    )
+
+
+def check_eligibility(job, user):
+    """Lève ``ApplicationRefused`` si ``user`` ne peut pas postuler à ``job``."""
+    if user.is_recruiter:
+        raise ApplicationRefused(RECRUITER)
+    if job.publisher_id == user.pk:
+        raise ApplicationRefused(OWN_OFFER)
+    if job.expires_at < timezone.now() or job.status_id != job_statuses.id(
+        JobStatus.ACTIVE
+    ):
+        raise ApplicationRefused(UNAVAILABLE)
+    if getattr(job, "already_applied", False):
+        raise ApplicationRefused(ALREADY_APPLIED)
+
+
+def submit_application(job, user, cover_letter):
+    """
+    Insère la candidature de ``user`` à ``job`` (déjà vérifiée par
+    ``check_eligibility``), sans relire l'offre ni chercher de doublon.
+    """
+    application = JobApplication(
+        job=job,
+        applicant_id=user.pk,
+        status_id=application_statuses.id(ApplicationStatus.PENDING),
+        cover_letter=cover_letter,
+    )
+    try:
+        # Point de sauvegarde : l'échec n'annule pas une transaction englobante
+        with transaction.atomic():
+            application.save(force_insert=True)
+    except IntegrityError:
+        raise ApplicationRefused(ALREADY_APPLIED)
+    return application
@@ -0,0 +1,78 @@
+"""
+Écriture groupée d'offres d'emploi (création, modification, clôture).
+
+``bulk_create``/``bulk_update`` ne passent ni par ``JobOffer.save`` ni par
+les signaux post_save : l'index de recherche, les facettes de lieu et la
+version du cache sont mis à jour une fois pour tout le lot via
+``job_offers_bulk_written``.
+"""
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import JobOffer, JobStatus, parse_salary_range
+from .registry import job_statuses
+
+# Envoyé dans la transaction avec les identifiants des offres écrites et les
+# lieux (anciens et nouveaux) dont le nombre d'offres actives a pu changer
+job_offers_bulk_written = Signal()
+
+
+def apply_changes(job, changes):
+    """Reproduit ``JobOffer.save`` : bornes de salaire et expiration."""
+    for name, value in changes.items():
+        setattr(job, name, value)
+    job.salary_min, job.salary_max = parse_salary_range(job.salary_range)
+    if job.expires_at < timezone.now():
+        job.status = job_statuses.get(JobStatus.EXPIRED)
+
+
+def bulk_write_job_offers(publisher_id, creates=(), updates=(), closes=()):
+    """
+    Écrit le lot dans une seule transaction : ``creates`` est une liste de
+    données validées, ``updates`` une liste de couples (offre, données
+    validées) et ``closes`` une liste d'offres à passer au statut "Expired".
+
+    Renvoie les offres créées, dans l'ordre de ``creates``.
+    """
+    active = job_statuses.get(JobStatus.ACTIVE)
+    locations = set()
+
+    created = []
+    for changes in creates:
+        job = JobOffer(publisher_id=publisher_id, status=active)
+        apply_changes(job, changes)
+        # Comme perform_create : statut absent ou nul -> offre active
+        job.status = job.status or active
+        created.append(job)
+        locations.add(job.location)
+
+    updated, fields = [], {"status", "updated_at"}
+    now = timezone.now()
+    for job, changes in updates:
+        # Le lieu d'origine perd peut-être une offre active
+        locations.add(job.location)
+        apply_changes(job, changes)
+        fields.update(changes)
+        if "salary_range" in changes:
+            fields.update(("salary_min", "salary_max"))
+        updated.append(job)
+        locations.add(job.location)
+    for job in closes:
+        job.status = job_statuses.get(JobStatus.EXPIRED)
+        updated.append(job)
+        locations.add(job.location)
+    for job in updated:
+        job.updated_at = now
+
+    with transaction.atomic():
+        created = JobOffer.objects.bulk_create(created)
+        if updated:
+            JobOffer.objects.bulk_update(updated, sorted(fields))
+        job_offers_bulk_written.send(
+            sender=JobOffer,
+            job_ids=[job.pk for job in created + updated],
+            locations=locations,
+        )
+    return created
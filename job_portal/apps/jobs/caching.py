@@ -0,0 +1,172 @@
+"""
+Cache des pages de listes d'offres, invalidé par un numéro de version.
+
+Toute modification d'offre (save/delete, expiration) incrémente la version ;
+une entrée d'une version antérieure est recalculée dans la requête. Une entrée
+de la version courante plus vieille que ``JOB_LISTING_CACHE_TIMEOUT`` est
+périmée : pendant ``JOB_LISTING_CACHE_STALE_TIMEOUT`` elle reste servie
+pendant qu'un thread la recalcule (stale-while-revalidate), un seul à la fois
+par clé.
+
+La version n'est partagée entre les workers que par un cache partagé : prod
+exige Redis (voir job_portal/settings/prod.py).
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from job_portal.routers import replica_reads
+
+VERSION_KEY = "jobs:offers:version"
+# applications_count seul : change les validateurs HTTP de l'API (voir
+# apis/jobs/mixins.py) sans invalider les pages en cache
+COUNTS_VERSION_KEY = "jobs:offers:counts"
+MODIFIED_KEY = "jobs:offers:modified"
+
+
+def offers_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Horodatage : une clé évincée ne ressuscite pas d'anciennes entrées
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aoffers_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    cache.set(MODIFIED_KEY, time.time(), None)
+
+
+def bump_offers_version():
+    _bump(VERSION_KEY)
+
+
+def bump_counts_version():
+    _bump(COUNTS_VERSION_KEY)
+
+
+def offers_validators():
+    """
+    ``(version, version des compteurs, dernière modification)`` des offres,
+    lus dans le cache sans requête SQL. Une clé absente (cache vidé) est
+    recréée : la dernière modification devient l'instant présent.
+    """
+    values = cache.get_many([VERSION_KEY, COUNTS_VERSION_KEY, MODIFIED_KEY])
+    for key, default in (
+        (VERSION_KEY, time.time_ns),
+        (COUNTS_VERSION_KEY, time.time_ns),
+        (MODIFIED_KEY, time.time),
+    ):
+        if key not in values:
+            cache.add(key, default(), None)
+            values[key] = cache.get(key)
+    return values[VERSION_KEY], values[COUNTS_VERSION_KEY], values[MODIFIED_KEY]
+
+
+def listing_cache_key(scope, filters, **page):
+    """Clé d'une page de ``scope`` pour des filtres déjà normalisés."""
+    params = dict(filters, **{name: value for name, value in page.items() if value})
+    digest = hashlib.md5(
+        json.dumps(params, sort_keys=True).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"jobs:page:{scope}:{digest}"
+
+
+def _entry(data, version):
+    return {
+        "version": version,
+        "fresh_until": time.time() + settings.JOB_LISTING_CACHE_TIMEOUT,
+        "data": data,
+    }
+
+
+def _entry_timeout():
+    return settings.JOB_LISTING_CACHE_TIMEOUT + settings.JOB_LISTING_CACHE_STALE_TIMEOUT
+
+
+def _refresh(key, compute, version):
+    # Sur le primaire : une page lue sur un réplica en retard serait gardée
+    # sous la nouvelle version
+    with replica_reads(False):
+        data = compute()
+    cache.set(key, _entry(data, version), _entry_timeout())
+    return data
+
+
+async def _arefresh(key, acompute, version):
+    with replica_reads(False):
+        data = await acompute()
+    await cache.aset(key, _entry(data, version), _entry_timeout())
+    return data
+
+
+def _refresh_in_background(key, compute, version):
+    # Seul ce recalcul a pris le verrou (cache.add) : lui seul le libère
+    try:
+        _refresh(key, compute, version)
+    finally:
+        cache.delete(f"{key}:lock")
+        connections.close_all()
+
+
+def cached_listing(key, compute):
+    """
+    Renvoie ``compute()`` depuis le cache. ``compute`` ne doit renvoyer que
+    des données picklables (listes d'objets, pas de QuerySet).
+    """
+    version = offers_version()
+    entry = cache.get(key)
+    # Entrée d'une version antérieure : les offres ont changé depuis
+    if entry is None or entry["version"] != version:
+        return _refresh(key, compute, version)
+    if entry["fresh_until"] > time.time():
+        return entry["data"]
+
+    if not settings.JOB_LISTING_CACHE_BACKGROUND:
+        return _refresh(key, compute, version)
+    if cache.add(f"{key}:lock", True, settings.JOB_LISTING_CACHE_TIMEOUT):
+        threading.Thread(
+            target=_refresh_in_background, args=(key, compute, version), daemon=True
+        ).start()
+    return entry["data"]
+
+
+async def acached_listing(key, acompute, compute):
+    """
+    Version asynchrone de ``cached_listing`` : ``acompute()`` recalcule la
+    page dans la requête. Le recalcul en arrière-plan utilise ``compute()``
+    dans un thread, comme en synchrone, pour ne pas dépendre de la durée de
+    vie de la boucle d'événements (éphémère sous WSGI).
+    """
+    version = await aoffers_version()
+    entry = await cache.aget(key)
+    if entry is None or entry["version"] != version:
+        return await _arefresh(key, acompute, version)
+    if entry["fresh_until"] > time.time():
+        return entry["data"]
+
+    if not settings.JOB_LISTING_CACHE_BACKGROUND:
+        return await _arefresh(key, acompute, version)
+    if await cache.aadd(f"{key}:lock", True, settings.JOB_LISTING_CACHE_TIMEOUT):
+        threading.Thread(
+            target=_refresh_in_background, args=(key, compute, version), daemon=True
+        ).start()
+    return entry["data"]
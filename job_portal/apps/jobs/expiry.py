@@ -0,0 +1,49 @@
+import time
+
+from django.db.models.functions import Now
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import JobOffer, JobStatus
+from .registry import job_statuses
+
+# Envoyé après chaque lot avec les identifiants des offres expirées :
+# les UPDATE groupés ne déclenchent pas post_save.
+job_offers_expired = Signal()
+
+
+def expire_job_offers(batch_size=1000, now=None, on_batch=None, queryset=None):
+    """
+    Passe au statut "Expired" les offres de ``queryset`` (par défaut, les
+    offres actives dont la date d'expiration est dépassée), par lots de
+    ``batch_size`` (un SELECT d'identifiants puis un UPDATE par lot, pour ne
+    pas verrouiller la table entière).
+
+    ``on_batch(count, seconds)`` est appelé après chaque lot. Renvoie le
+    nombre total d'offres expirées.
+    """
+    expired_id = job_statuses.id(JobStatus.EXPIRED)
+    if queryset is None:
+        # Égalité sur status puis borne sur expires_at : parcours d'un
+        # intervalle de l'index jobs_status_expires_idx
+        queryset = JobOffer.objects.filter(
+            status_id=job_statuses.id(JobStatus.ACTIVE),
+            expires_at__lte=now or timezone.now(),
+        )
+    else:
+        queryset = queryset.exclude(status_id=expired_id)
+    pending = queryset.order_by().values_list("id", flat=True)
+    total = 0
+    while True:
+        start = time.perf_counter()
+        ids = list(pending[:batch_size])
+        if not ids:
+            break
+        count = JobOffer.objects.filter(id__in=ids).update(
+            status_id=expired_id, updated_at=Now()
+        )
+        total += count
+        job_offers_expired.send(sender=JobOffer, job_ids=ids)
+        if on_batch is not None:
+            on_batch(count, time.perf_counter() - start)
+    return total
@@ -0,0 +1,105 @@
+"""
+Export des candidatures en flux (CSV ou NDJSON).
+
+Les lignes sont lues par lots avec ``.iterator()`` et écrites une à une dans
+une ``StreamingHttpResponse`` : la mémoire du worker reste constante quelle
+que soit la taille de l'export.
+"""
+
+import csv
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .registry import application_statuses
+
+COLUMNS = [
+    "id",
+    "job_id",
+    "job_title",
+    "applicant",
+    "email",
+    "status",
+    "applied_at",
+    "notes",
+    "cover_letter",
+]
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """Pseudo-fichier dont ``write`` renvoie la ligne au lieu de la stocker."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset):
+    applications = (
+        queryset.select_related("job", "applicant")
+        .only(
+            "applied_at",
+            "notes",
+            "cover_letter",
+            "status_id",
+            "job__title",
+            "applicant__username",
+            "applicant__email",
+        )
+        .order_by("job_id", "applied_at", "id")
+        .iterator(chunk_size=settings.JOB_EXPORT_CHUNK_SIZE)
+    )
+    for application in applications:
+        status = application_statuses.by_id(application.status_id)
+        yield [
+            application.id,
+            application.job_id,
+            application.job.title,
+            application.applicant.username,
+            application.applicant.email,
+            status.name if status is not None else "",
+            application.applied_at.isoformat(),
+            application.notes,
+            application.cover_letter,
+        ]
+
+
+# Caractères qui font interpréter une cellule comme une formule par un
+# tableur (injection de formules CSV)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_cell(value):
+    """Neutralise une cellule texte que le tableur prendrait pour une formule."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        # Lettre de motivation, notes, titres et noms sont saisis par les
+        # utilisateurs
+        yield writer.writerow([escape_cell(value) for value in row])
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n"
+
+
+def export_applications(queryset, output="csv"):
+    """Réponse en flux contenant les candidatures de ``queryset``."""
+    rows = iter_rows(queryset)
+    content = iter_csv(rows) if output == "csv" else iter_ndjson(rows)
+    response = StreamingHttpResponse(content, content_type=FORMATS[output])
+    filename = f"candidatures-{timezone.localdate():%Y%m%d}.{output}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
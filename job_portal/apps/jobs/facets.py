@@ -0,0 +1,185 @@
+import hashlib
+import json
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Value, When
+from django.utils import timezone
+
+from job_portal.routers import replica_reads
+
+from .caching import aoffers_version, offers_version
+from .forms import JobSearchForm
+
+# (valeur, borne basse incluse, borne haute exclue) sur salary_min
+SALARY_BUCKETS = [
+    ("0-50000", 0, 50_000),
+    ("50000-100000", 50_000, 100_000),
+    ("100000-200000", 100_000, 200_000),
+    ("200000+", 200_000, None),
+]
+DATE_BUCKETS = [value for value, label in JobSearchForm.DATE_CHOICES if value]
+
+
+def normalize_filters(params):
+    """
+    Réduit les paramètres de filtrage à une forme canonique, pour que des
+    requêtes équivalentes ("Gitega" / " gitega ") partagent la même entrée
+    de cache.
+    """
+    filters = {}
+    query = " ".join(params.get("q", "").lower().split())
+    if query:
+        filters["q"] = query
+    location = params.get("location", "").strip().lower()
+    if location and location != "tous les lieux":
+        filters["location"] = location
+    for name in ("min_salary", "max_salary"):
+        value = params.get(name, "").strip()
+        if value.isdigit():
+            filters[name] = int(value)
+    if params.get("date_filter") in DATE_BUCKETS:
+        filters["date_filter"] = params["date_filter"]
+    return filters
+
+
+def filter_offers(queryset, filters, location_lookup="iexact"):
+    """
+    Applique à ``queryset`` les filtres de ``normalize_filters``. Les vues
+    filtrent à partir du dictionnaire qui sert aussi de clé de cache : deux
+    requêtes qui partagent une entrée renvoient forcément les mêmes offres.
+    """
+    if "q" in filters:
+        queryset = queryset.search(filters["q"])
+    if "location" in filters:
+        queryset = queryset.filter(
+            **{f"location__{location_lookup}": filters["location"]}
+        )
+    # Offres dont la fourchette recoupe celle demandée
+    if "min_salary" in filters:
+        queryset = queryset.filter(salary_max__gte=filters["min_salary"])
+    if "max_salary" in filters:
+        queryset = queryset.filter(salary_min__lte=filters["max_salary"])
+    date_filter = filters.get("date_filter")
+    if date_filter:
+        now = timezone.now()
+        if date_filter == "today":
+            queryset = queryset.filter(created_at__date=now.date())
+        else:
+            days = 7 if date_filter == "week" else 30
+            queryset = queryset.filter(created_at__gte=now - timedelta(days=days))
+    return queryset
+
+
+def date_bucket(now):
+    """Tranche de publication de chaque offre ; la plus récente l'emporte."""
+    today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    return Case(
+        When(created_at__gte=today, then=Value("today")),
+        When(created_at__gte=now - timedelta(days=7), then=Value("week")),
+        When(created_at__gte=now - timedelta(days=30), then=Value("month")),
+        default=Value(None),
+        output_field=CharField(),
+    )
+
+
+def salary_bucket():
+    whens = []
+    for value, low, high in SALARY_BUCKETS:
+        bounds = {"salary_min__gte": low}
+        if high is not None:
+            bounds["salary_min__lt"] = high
+        whens.append(When(**bounds, then=Value(value)))
+    return Case(*whens, default=Value(None), output_field=CharField())
+
+
+def facet_rows(queryset, now=None):
+    """
+    Comptes des offres de ``queryset`` par lieu, entreprise, date de
+    publication et tranche de salaire, en un seul GROUP BY sur les quatre
+    dimensions.
+    """
+    now = now or timezone.now()
+    return (
+        queryset.order_by()
+        .annotate(date_bucket=date_bucket(now), salary_bucket=salary_bucket())
+        .values("location", "company", "date_bucket", "salary_bucket")
+        .annotate(count=Count("id"))
+    )
+
+
+def sum_facets(rows):
+    """Cumule les lignes de ``facet_rows`` en totaux par dimension."""
+    locations, companies, dates, salaries = Counter(), Counter(), Counter(), Counter()
+    for row in rows:
+        count = row["count"]
+        locations[row["location"]] += count
+        companies[row["company"]] += count
+        salaries[row["salary_bucket"]] += count
+        # Les tranches de date sont cumulatives : "today" compte aussi
+        # dans "week" et "month"
+        if row["date_bucket"] is not None:
+            for bucket in DATE_BUCKETS[DATE_BUCKETS.index(row["date_bucket"]) :]:
+                dates[bucket] += count
+
+    date_labels = dict(JobSearchForm.DATE_CHOICES)
+    return {
+        "location": [
+            {"value": value, "count": count} for value, count in locations.most_common()
+        ],
+        "company": [
+            {"value": value, "count": count} for value, count in companies.most_common()
+        ],
+        "date": [
+            {"value": value, "label": date_labels[value], "count": dates[value]}
+            for value in DATE_BUCKETS
+        ],
+        "salary": [
+            {"value": value, "count": salaries[value]}
+            for value, low, high in SALARY_BUCKETS
+        ],
+    }
+
+
+def facet_counts(queryset, now=None):
+    return sum_facets(facet_rows(queryset, now))
+
+
+async def afacet_counts(queryset, now=None):
+    return sum_facets([row async for row in facet_rows(queryset, now)])
+
+
+def facets_cache_key(scope, filters, version):
+    digest = hashlib.md5(
+        json.dumps(filters, sort_keys=True).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"jobs:facets:{scope}:{version}:{digest}"
+
+
+def cached_facet_counts(queryset, scope, filters):
+    """
+    ``facet_counts`` mis en cache par filtre normalisé et version des offres.
+    ``queryset`` doit être filtré par ``filter_offers(..., filters)`` ;
+    ``scope`` distingue les vues dont le queryset de base diffère.
+    """
+    key = facets_cache_key(scope, filters, offers_version())
+    facets = cache.get(key)
+    if facets is None:
+        # Sur le primaire, comme les pages en cache (voir caching._refresh)
+        with replica_reads(False):
+            facets = facet_counts(queryset)
+        cache.set(key, facets, settings.JOB_FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+async def acached_facet_counts(queryset, scope, filters):
+    """Version asynchrone de ``cached_facet_counts``."""
+    key = facets_cache_key(scope, filters, await aoffers_version())
+    facets = await cache.aget(key)
+    if facets is None:
+        with replica_reads(False):
+            facets = await afacet_counts(queryset)
+        await cache.aset(key, facets, settings.JOB_FACETS_CACHE_TIMEOUT)
+    return facets
@@ -1,8 +1,23 @@
 from django import forms
-from .models import JobOffer, JobApplication
+from .models import JobApplication, JobOffer, parse_salary_range, salary_range_error
 
 
-class JobOfferForm(forms.ModelForm):
+class SalaryRangeFormMixin:
+    """Valide salary_range et en recopie les bornes sur l'instance."""
+
+    def clean_salary_range(self):
+        salary_range = self.cleaned_data.get("salary_range", "")
+        error = salary_range_error(salary_range)
+        if error:
+            raise forms.ValidationError(error)
+        salary_min, salary_max = parse_salary_range(salary_range)
+        # Les bornes sont aussi recalculées par JobOffer.save()
+        self.instance.salary_min = salary_min
+        self.instance.salary_max = salary_max
+        return salary_range
+
+
+class JobOfferForm(SalaryRangeFormMixin, forms.ModelForm):
     class Meta:
         model = JobOffer
         fields = [
@@ -36,6 +51,14 @@ class JobOfferForm(forms.ModelForm):
         }
 
 
+class JobOfferAdminForm(SalaryRangeFormMixin, forms.ModelForm):
+    """Formulaire de l'admin : ses widgets, les contrôles de JobOfferForm."""
+
+    class Meta:
+        model = JobOffer
+        fields = "__all__"
+
+
 class JobApplicationForm(forms.ModelForm):
     class Meta:
         model = JobApplication
@@ -0,0 +1,283 @@
+import json
+import statistics
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apis.jobs.serializers import JobOfferSerializer
+from apps.accounts.backends import CustomAuthBackend
+from apps.jobs.caching import bump_offers_version
+from apps.jobs.models import JobOffer, JobStatus
+from apps.jobs.registry import job_statuses
+
+# Tailles de jeu de données fixes : (candidats, recruteurs, offres, candidatures)
+SIZES = {
+    "small": (500, 20, 2_000, 10_000),
+    "medium": (5_000, 100, 20_000, 100_000),
+    "large": (50_000, 500, 200_000, 1_000_000),
+}
+PASSWORD = "testpass123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure les chemins critiques (vues, API, serializers, authentification) "
+        "sur une base de test jetable : temps, requêtes SQL et allocations, "
+        "avec comparaison optionnelle à une référence JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", choices=SIZES, default="small")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--output", type=Path, help="Fichier JSON où enregistrer les résultats"
+        )
+        parser.add_argument(
+            "--baseline", type=Path, help="Résultats JSON de référence à comparer"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Hausse relative du temps médian considérée comme régression",
+        )
+
+    def handle(self, *args, **options):
+        users, recruiters, jobs, applications = SIZES[options["size"]]
+        repeat = options["repeat"]
+        setup_test_environment()
+
+        # Base jetable : les données réelles ne sont jamais touchées
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            # Le même client répète chaque requête : pas de limitation de
+            # débit ; pages invalidées recalculées dans la requête mesurée
+            with override_settings(
+                THROTTLE_ENABLED=False, JOB_LISTING_CACHE_BACKGROUND=False
+            ):
+                call_command(
+                    "create_test_data",
+                    users=users,
+                    recruiters=recruiters,
+                    jobs=jobs,
+                    applications=applications,
+                    seed=options["seed"],
+                    batch_size=10_000,
+                    stdout=self.stdout if options["verbosity"] > 1 else StringIO(),
+                )
+                results = {
+                    name: self.measure(name, run, repeat, prepare)
+                    for name, run, prepare in self.cases(repeat)
+                }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "size": options["size"],
+            "seed": options["seed"],
+            "repeat": repeat,
+            "results": results,
+        }
+        if options["output"]:
+            options["output"].write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Résultats enregistrés dans {options['output']}")
+        if options["baseline"]:
+            self.compare(report, options["baseline"], options["threshold"])
+
+    def cases(self, repeat):
+        """(nom, fonction mesurée, préparation hors mesure) pour chaque cas."""
+        User = get_user_model()
+        recruiter = User.objects.get(
+            pk=JobOffer.objects.values("publisher")
+            .annotate(count=Count("id"))
+            .order_by("-count")
+            .values("publisher")[:1]
+        )
+        candidate = User.objects.filter(is_recruiter=False).exclude(
+            username="testuser"
+        )[0]
+        job = JobOffer.objects.filter(
+            status_id=job_statuses.id(JobStatus.ACTIVE), expires_at__gt=timezone.now()
+        ).exclude(publisher=recruiter)[0]
+        # Un nouveau candidat par passage : on ne postule qu'une fois par offre
+        applicants = [
+            User.objects.create_user(username=f"bench-{i}", password=PASSWORD)
+            for i in range(repeat + 2)
+        ]
+
+        client = Client()
+        client.force_login(candidate)
+        api = APIClient()
+        api.force_authenticate(candidate)
+        recruiter_client = Client()
+        recruiter_client.force_login(recruiter)
+        apply_client = Client()
+        backend = CustomAuthBackend()
+        offers = list(JobOffer.objects.select_related("publisher")[:100])
+        available = reverse("jobs:available_jobs")
+
+        def get(client, url, params=None):
+            def run(i):
+                response = client.get(url, params)
+                assert response.status_code == 200, response.status_code
+
+            return run
+
+        def login_applicant(i):
+            apply_client.force_login(applicants[i])
+
+        def apply(i):
+            apply_client.post(
+                reverse("jobs:job_apply", args=[job.pk]),
+                {"cover_letter": "Lettre de motivation"},
+            )
+
+        def invalidate_listings(i):
+            bump_offers_version()
+
+        # Pages et facettes d'available_jobs sont en cache (apps/jobs/caching.py) :
+        # chaque filtre est mesuré cache invalidé (travail de la vue et de la
+        # base) puis cache chaud
+        listings = []
+        for name, params in (
+            ("available_jobs", None),
+            ("available_jobs?q", {"q": "python"}),
+            ("available_jobs?location", {"location": "Gitega"}),
+            ("available_jobs?salary", {"min_salary": "60000"}),
+            ("available_jobs?date", {"date_filter": "week"}),
+        ):
+            run = get(client, available, params)
+            listings += [
+                (name, run, invalidate_listings),
+                (f"{name} [cache]", run, None),
+            ]
+
+        return [
+            *listings,
+            ("api.jobs.list", get(api, reverse("api-job-list")), None),
+            (
+                "api.jobs.available_jobs",
+                get(api, reverse("api-job-available-jobs")),
+                None,
+            ),
+            (
+                "JobOfferSerializer(many=True)",
+                lambda i: JobOfferSerializer(offers, many=True).data,
+                None,
+            ),
+            ("apply_to_job", apply, login_applicant),
+            (
+                "manage_applications",
+                get(recruiter_client, reverse("jobs:manage_applications")),
+                None,
+            ),
+            (
+                "CustomAuthBackend.authenticate",
+                lambda i: backend.authenticate(
+                    None, username=candidate.username, password=PASSWORD
+                ),
+                None,
+            ),
+        ]
+
+    def measure(self, name, run, repeat, prepare=None):
+        timings = []
+        counts = []
+        # Le premier passage réchauffe les caches et n'est pas compté
+        for i in range(repeat + 1):
+            if prepare:
+                prepare(i)
+            queries = []
+            # execute_wrapper survit à la fermeture de la connexion en fin de
+            # requête, contrairement à connection.queries
+            with connection.execute_wrapper(
+                lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+            ):
+                start = time.perf_counter()
+                run(i)
+                elapsed = (time.perf_counter() - start) * 1000
+            if i:
+                timings.append(elapsed)
+                counts.append(len(queries))
+
+        # Allocations mesurées à part : tracemalloc ralentit l'exécution
+        if prepare:
+            prepare(repeat + 1)
+        tracemalloc.start()
+        try:
+            run(repeat + 1)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(
+                (
+                    statistics.quantiles(timings, n=20)[-1]
+                    if len(timings) > 1
+                    else timings[0]
+                ),
+                3,
+            ),
+            # Nombre de requêtes du passage le plus coûteux : un cas dont le
+            # nombre varie d'un passage à l'autre est signalé par queries_min
+            "queries": max(counts),
+            "queries_min": min(counts),
+            "peak_kib": round(peak / 1024, 1),
+        }
+        queries = (
+            f"{result['queries']:3}"
+            if result["queries_min"] == result["queries"]
+            else f"{result['queries_min']}-{result['queries']}"
+        )
+        self.stdout.write(
+            f"{name:<32} médiane={result['median_ms']:9.2f}ms  "
+            f"p95={result['p95_ms']:9.2f}ms  requêtes={queries}  "
+            f"pic={result['peak_kib']:9.1f}KiB"
+        )
+        return result
+
+    def compare(self, report, path, threshold):
+        baseline = json.loads(path.read_text())
+        if (baseline["size"], baseline["seed"]) != (report["size"], report["seed"]):
+            self.stdout.write(
+                self.style.WARNING(
+                    "La référence a été mesurée sur un autre jeu de données"
+                )
+            )
+        regressions = []
+        for name, result in report["results"].items():
+            reference = baseline["results"].get(name)
+            if reference is None:
+                continue
+            change = result["median_ms"] / reference["median_ms"] - 1
+            line = (
+                f"{name:<32} {reference['median_ms']:9.2f}ms -> "
+                f"{result['median_ms']:9.2f}ms ({change:+.0%})  requêtes "
+                f"{reference['queries']} -> {result['queries']}"
+            )
+            if change > threshold or result["queries"] > reference["queries"]:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+        if regressions:
+            raise CommandError(f"Régressions : {', '.join(regressions)}")
@@ -0,0 +1,128 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.accounts.models import CustomUser
+from apps.jobs.management.synthetic import SyntheticData
+from apps.jobs.models import JobOffer, JobStatus
+from apps.jobs.search import get_search_backend
+
+QUERIES = [
+    "python",
+    "dév",
+    "développeur python",
+    "data",
+    "cloud",
+    "comptab",
+    "sécurité réseau",
+    "django",
+    "santé",
+    "gestion projet",
+    "kubernetes docker",
+    "stage",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la latence de recherche des offres (p50/p95) sur une base "
+        "de test jetable peuplée d'offres synthétiques"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[100_000, 1_000_000],
+            help="Nombres d'offres successifs à mesurer",
+        )
+        parser.add_argument(
+            "--queries", type=int, default=200, help="Requêtes par mesure"
+        )
+        parser.add_argument(
+            "--backends",
+            nargs="+",
+            default=None,
+            help="Chemins des backends à comparer (défaut : configuré + icontains)",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        backends = options["backends"] or [
+            settings.JOB_SEARCH_BACKEND,
+            "apps.jobs.search.DatabaseSearchBackend",
+        ]
+        self.data = SyntheticData(options["seed"])
+
+        # Base jetable : les données réelles ne sont jamais touchées
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            publisher = CustomUser.objects.create_user(
+                username="benchmark", password="benchmark", is_recruiter=True
+            )
+            status, _ = JobStatus.objects.get_or_create(name="active")
+            for size in sorted(options["sizes"]):
+                self.populate(size, publisher, status, options["batch_size"])
+                for path in backends:
+                    self.measure(size, path, status, options["queries"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def populate(self, size, publisher, status, batch_size):
+        existing = JobOffer.objects.count()
+        start = time.perf_counter()
+        now = timezone.now()
+        for offset in range(existing, size, batch_size):
+            dates = [
+                self.data.dates(now, expired_share=0)
+                for _ in range(min(batch_size, size - offset))
+            ]
+            jobs = JobOffer.objects.bulk_create(
+                [
+                    JobOffer(
+                        title=self.data.title(),
+                        company=self.data.company(),
+                        location="Bujumbura",
+                        description=self.data.description(),
+                        publisher=publisher,
+                        status=status,
+                        expires_at=expires_at,
+                    )
+                    for _, expires_at in dates
+                ]
+            )
+            # auto_now_add écrase created_at à l'insertion
+            for job, (created_at, _) in zip(jobs, dates):
+                job.created_at = created_at
+            JobOffer.objects.bulk_update(jobs, ["created_at"])
+        # bulk_create ne déclenche pas les signaux : indexation en une passe
+        get_search_backend().rebuild()
+        self.stdout.write(f"{size} offres prêtes en {time.perf_counter() - start:.1f}s")
+
+    def measure(self, size, path, status, count):
+        backend = get_search_backend(path)
+        base = JobOffer.objects.filter(status=status, expires_at__gt=timezone.now())
+        timings = []
+        for i in range(count):
+            query = QUERIES[i % len(QUERIES)]
+            start = time.perf_counter()
+            list(
+                backend.search(base, query).order_by("-search_rank", "-created_at")[:10]
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{size:>9} offres  {path.rsplit('.', 1)[-1]:<26} "
+                f"p50={statistics.median(timings):8.2f}ms  p95={p95:8.2f}ms"
+            )
+        )
@@ -0,0 +1,203 @@
+import secrets
+import time
+from collections import Counter
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.accounts.models import CustomUser
+from apps.jobs.management.synthetic import SyntheticData, zipf_weights
+from apps.jobs.models import (
+    ApplicationStatus,
+    JobApplication,
+    JobOffer,
+    JobStatus,
+    parse_salary_range,
+)
+from apps.jobs.registry import application_statuses, job_statuses
+
+# Répartition des statuts de candidature
+APPLICATION_STATUSES = {
+    ApplicationStatus.PENDING: 70,
+    ApplicationStatus.REVIEWING: 15,
+    ApplicationStatus.REJECTED: 7,
+    ApplicationStatus.ACCEPTED: 5,
+    ApplicationStatus.CANCELLED: 3,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Crée des données de test pour le système d'offres d'emploi : "
+        "utilisateurs, offres et candidatures en volume, par lots"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="Candidats")
+        parser.add_argument("--recruiters", type=int, default=5, help="Recruteurs")
+        parser.add_argument("--jobs", type=int, default=200, help="Offres d'emploi")
+        parser.add_argument(
+            "--applications", type=int, default=1000, help="Candidatures"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.data = SyntheticData(options["seed"], companies=options["jobs"] // 50)
+        self.random = self.data.random
+        self.batch_size = options["batch_size"]
+        # Suffixe propre à chaque exécution : la commande peut être relancée
+        self.run = secrets.token_hex(3)
+        # Un seul hachage pour tous les comptes générés (PBKDF2 est lent)
+        self.password = make_password("testpass123")
+        start = time.perf_counter()
+
+        self.create_test_user()
+        recruiters = self.create_users("recruteur", options["recruiters"], True)
+        candidates = self.create_users("candidat", options["users"], False)
+        jobs = self.create_jobs(recruiters, options["jobs"])
+        self.create_applications(jobs, candidates, options["applications"])
+
+        # bulk_create ne déclenche pas les signaux : données dérivées en une passe
+        for command in (
+            "rebuild_search_index",
+            "rebuild_location_facets",
+            "recount_applications",
+        ):
+            call_command(command, stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Toutes les données de test ont été créées avec succès "
+                f"({time.perf_counter() - start:.1f}s)"
+            )
+        )
+
+    def create_test_user(self):
+        user, created = CustomUser.objects.get_or_create(
+            username="testuser",
+            defaults={
+                "email": "test@example.com",
+                "is_staff": True,
+                "password": self.password,
+            },
+        )
+        if created:
+            self.stdout.write(
+                self.style.SUCCESS(f"Utilisateur test créé: {user.username}")
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(f"Utilisateur test existe déjà: {user.username}")
+            )
+
+    def bulk_create(self, label, model, count, build):
+        """Crée ``count`` objets par lots et renvoie leurs identifiants."""
+        ids = []
+        for offset in range(0, count, self.batch_size):
+            start = time.perf_counter()
+            objects = model.objects.bulk_create(
+                build(offset, min(self.batch_size, count - offset))
+            )
+            ids.extend(obj.pk for obj in objects)
+            self.stdout.write(
+                f"{label} : {len(ids)}/{count} "
+                f"({(time.perf_counter() - start) * 1000:.0f}ms)"
+            )
+        return ids
+
+    def create_users(self, prefix, count, is_recruiter):
+        return self.bulk_create(
+            prefix.capitalize() + "s",
+            CustomUser,
+            count,
+            lambda offset, size: (
+                CustomUser(
+                    username=f"{prefix}-{self.run}-{offset + i}",
+                    email=f"{prefix}-{self.run}-{offset + i}@example.com",
+                    password=self.password,
+                    is_recruiter=is_recruiter,
+                )
+                for i in range(size)
+            ),
+        )
+
+    def create_jobs(self, recruiters, count):
+        if not recruiters:
+            return []
+        now = timezone.now()
+        active = job_statuses.get(JobStatus.ACTIVE)
+        expired = job_statuses.get(JobStatus.EXPIRED)
+        # Quelques recruteurs publient la plupart des offres
+        weights = list(accumulate(zipf_weights(len(recruiters))))
+        created = []
+
+        def build(offset, size):
+            for _ in range(size):
+                created_at, expires_at = self.data.dates(now)
+                created.append(created_at)
+                job = JobOffer(
+                    title=self.data.title(),
+                    company=self.data.company(),
+                    location=self.data.location(),
+                    description=self.data.description(),
+                    salary_range=self.data.salary_range(),
+                    publisher_id=self.random.choices(recruiters, cum_weights=weights)[
+                        0
+                    ],
+                    status=expired if expires_at < now else active,
+                    expires_at=expires_at,
+                )
+                # save() n'est pas appelé par bulk_create
+                job.salary_min, job.salary_max = parse_salary_range(job.salary_range)
+                yield job
+
+        ids = self.bulk_create("Offres", JobOffer, count, build)
+        # auto_now_add écrase created_at à l'insertion : dates de publication
+        # réparties après coup
+        JobOffer.objects.bulk_update(
+            [JobOffer(pk=pk, created_at=date) for pk, date in zip(ids, created)],
+            ["created_at"],
+            batch_size=self.batch_size,
+        )
+        return ids
+
+    def create_applications(self, jobs, candidates, count):
+        if not jobs or not candidates:
+            return
+        statuses = [application_statuses.get(name) for name in APPLICATION_STATUSES]
+        status_weights = list(accumulate(APPLICATION_STATUSES.values()))
+        job_weights = list(accumulate(zipf_weights(len(jobs), 0.8)))
+        # Nombre de candidatures par candidat ; chacun postule au plus une
+        # fois par offre (unique_together job/applicant)
+        per_candidate = Counter(self.random.choices(candidates, k=count))
+
+        def iter_pairs():
+            for applicant_id, wanted in per_candidate.items():
+                chosen = set()
+                wanted = min(wanted, len(jobs))
+                while len(chosen) < wanted:
+                    chosen.update(
+                        self.random.choices(
+                            jobs, cum_weights=job_weights, k=wanted - len(chosen)
+                        )
+                    )
+                for job_id in chosen:
+                    yield job_id, applicant_id
+
+        pairs = iter_pairs()
+        total = sum(min(wanted, len(jobs)) for wanted in per_candidate.values())
+
+        def build(offset, size):
+            for _, (job_id, applicant_id) in zip(range(size), pairs):
+                yield JobApplication(
+                    job_id=job_id,
+                    applicant_id=applicant_id,
+                    status=self.random.choices(statuses, cum_weights=status_weights)[0],
+                    cover_letter=self.data.description(words=30),
+                )
+
+        self.bulk_create("Candidatures", JobApplication, total, build)
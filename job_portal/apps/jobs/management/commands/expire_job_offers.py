@@ -0,0 +1,59 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.jobs.expiry import expire_job_offers
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Passe au statut "Expired" les offres dont la date d\'expiration est '
+        "dépassée, par lots (une fois depuis cron, ou en continu avec --loop)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.JOB_EXPIRY_BATCH_SIZE,
+            help="Nombre d'offres mises à jour par UPDATE",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Balaie les offres toutes les JOB_EXPIRY_SWEEP_INTERVAL secondes",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.batches = 0
+            start = time.perf_counter()
+            try:
+                total = expire_job_offers(options["batch_size"], on_batch=self.report)
+            except Exception:
+                if not options["loop"]:
+                    raise
+                logger.exception("Échec du balayage des offres expirées")
+            else:
+                if total or not options["loop"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"{total} offres expirées en {self.batches} lots "
+                            f"({time.perf_counter() - start:.2f}s)"
+                        )
+                    )
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(settings.JOB_EXPIRY_SWEEP_INTERVAL)
+
+    def report(self, count, seconds):
+        self.batches += 1
+        self.stdout.write(
+            f"Lot {self.batches} : {count} offres en {seconds * 1000:.1f}ms"
+        )
@@ -0,0 +1,180 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.hashers import make_password
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from apis.accounts.serializers import ClaimsTokenObtainPairSerializer
+from apps.accounts.models import CustomUser
+from apps.jobs.models import JobOffer, JobStatus
+from apps.jobs.registry import job_statuses
+
+PATHS = ["/jobs/", "/jobs/?q=python", "/jobs/?location=Gitega", "/jobs/{job}/"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge un serveur déjà démarré (WSGI ou ASGI) avec des requêtes "
+        "concurrentes sur les pages de lecture et mesure débit et latences. "
+        "Pour comparer, lancer le même nombre de workers, par exemple "
+        "« gunicorn -w 4 job_portal.wsgi » puis "
+        "« gunicorn -w 4 -k uvicorn.workers.UvicornWorker job_portal.asgi », "
+        "avec THROTTLE_ENABLED = False et la même base que cette commande. "
+        "Avec --apply, mesure plutôt les candidatures concurrentes à une même "
+        "offre via l'API"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Adresse du serveur, ex. http://127.0.0.1:8000")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Chemin à charger (répétable) ; {job} désigne une offre",
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument(
+            "--username", default="testuser", help="Compte utilisé pour la session"
+        )
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="POST de candidatures sur l'offre active la plus récente, "
+            "un nouveau candidat par requête",
+        )
+        parser.add_argument("--label", default="", help="Nom de la configuration")
+        parser.add_argument(
+            "--output", type=Path, help="Fichier JSON où enregistrer les résultats"
+        )
+        parser.add_argument(
+            "--baseline", type=Path, help="Résultats JSON d'une autre configuration"
+        )
+
+    def handle(self, *args, **options):
+        base = options["url"].rstrip("/")
+        if options["apply"]:
+            paths, requests, expected = self.apply_requests(base, options["requests"])
+        else:
+            paths, requests, expected = self.read_requests(base, options)
+
+        def fetch(request):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    ok = response.status == expected
+            except (urllib.error.URLError, TimeoutError):
+                ok = False
+            return ok, (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as executor:
+            results = list(executor.map(fetch, requests))
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(ms for ok, ms in results if ok)
+        if not timings:
+            raise CommandError("Aucune requête n'a abouti")
+        percentiles = statistics.quantiles(timings, n=100)
+        report = {
+            "label": options["label"],
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "paths": paths,
+            "errors": len(results) - len(timings),
+            "rps": round(len(timings) / elapsed, 1),
+            "p50_ms": round(percentiles[49], 1),
+            "p95_ms": round(percentiles[94], 1),
+            "p99_ms": round(percentiles[98], 1),
+        }
+        self.stdout.write(
+            f"{report['label'] or base}: {report['rps']} req/s  "
+            f"p50={report['p50_ms']}ms  p95={report['p95_ms']}ms  "
+            f"p99={report['p99_ms']}ms  erreurs={report['errors']}"
+        )
+        if options["output"]:
+            options["output"].write_text(json.dumps(report, indent=2) + "\n")
+        if options["baseline"]:
+            baseline = json.loads(options["baseline"].read_text())
+            self.stdout.write(
+                f"par rapport à {baseline['label'] or 'la référence'} : "
+                f"débit {report['rps'] / baseline['rps'] - 1:+.0%}, "
+                f"p95 {report['p95_ms'] / baseline['p95_ms'] - 1:+.0%}"
+            )
+
+    def read_requests(self, base, options):
+        job = JobOffer.objects.order_by("-id").values_list("id", flat=True).first()
+        paths = [
+            path.format(job=job)
+            for path in options["paths"] or PATHS
+            if job is not None or "{job}" not in path
+        ]
+        headers = {"Cookie": self.session_cookie(options["username"])}
+        requests = [
+            urllib.request.Request(base + paths[i % len(paths)], headers=headers)
+            for i in range(options["requests"])
+        ]
+        return paths, requests, 200
+
+    def apply_requests(self, base, count):
+        """
+        Une candidature par requête à l'offre active la plus récente, chacune
+        d'un candidat créé pour l'occasion : toutes doivent aboutir (201).
+        """
+        job = (
+            JobOffer.objects.filter(
+                status_id=job_statuses.id(JobStatus.ACTIVE),
+                expires_at__gt=timezone.now(),
+            )
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job is None:
+            raise CommandError("Aucune offre active")
+        run = time.time_ns()
+        password = make_password(None)
+        applicants = CustomUser.objects.bulk_create(
+            CustomUser(username=f"loadtest-{run}-{i}", password=password)
+            for i in range(count)
+        )
+        path = reverse("api-job-apply", args=[job])
+        data = json.dumps({"cover_letter": "Lettre de motivation"}).encode()
+        requests = [
+            urllib.request.Request(
+                base + path,
+                data=data,
+                method="POST",
+                headers={
+                    "Authorization": "Bearer "
+                    + str(ClaimsTokenObtainPairSerializer.get_token(user).access_token),
+                    "Content-Type": "application/json",
+                },
+            )
+            for user in applicants
+        ]
+        return [path], requests, 201
+
+    def session_cookie(self, username):
+        """Ouvre une session en base pour ``username``, comme un login."""
+        try:
+            user = CustomUser.objects.get(username=username)
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"Utilisateur introuvable : {username}")
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
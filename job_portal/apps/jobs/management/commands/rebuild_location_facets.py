@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.models import LocationFacet
+
+
+class Command(BaseCommand):
+    help = "Recalcule le nombre d'offres actives par lieu (facettes de lieu)"
+
+    def handle(self, *args, **options):
+        LocationFacet.objects.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{LocationFacet.objects.count()} facettes de lieu recalculées."
+            )
+        )
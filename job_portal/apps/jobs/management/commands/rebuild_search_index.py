@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit l'index de recherche plein texte des offres d'emploi ; "
+        "nécessaire après un changement de JOB_SEARCH_CONFIG"
+    )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Index de recherche reconstruit ({type(backend).__name__})."
+            )
+        )
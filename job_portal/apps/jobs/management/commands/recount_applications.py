@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.models import JobOffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule le nombre de candidatures (applications_count) des offres "
+        "d'emploi, par lots"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Nombre d'offres recalculées par UPDATE",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        last_id, total = 0, 0
+        while True:
+            ids = list(
+                JobOffer.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            total += JobOffer.objects.filter(id__in=ids).recount_applications()
+            last_id = ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} offres recalculées ({time.perf_counter() - start:.2f}s)"
+            )
+        )
@@ -0,0 +1,42 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Recopie la base SQLite primaire dans les réplicas SQLite de "
+        "DATABASE_REPLICAS (simulation locale de la réplication)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="aliases",
+            help="Réplica à recopier (par défaut : tous)",
+        )
+
+    def handle(self, *args, **options):
+        aliases = options["aliases"] or settings.DATABASE_REPLICAS
+        if not aliases:
+            raise CommandError("Aucun réplica configuré (DATABASE_REPLICAS)")
+        for alias in (DEFAULT_DB_ALIAS, *aliases):
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"La base {alias!r} n'est pas une base SQLite")
+
+        source = sqlite3.connect(connections[DEFAULT_DB_ALIAS].settings_dict["NAME"])
+        try:
+            for alias in aliases:
+                # Pas de connexion Django ouverte pendant le remplacement
+                connections[alias].close()
+                target = sqlite3.connect(connections[alias].settings_dict["NAME"])
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(self.style.SUCCESS(f"Réplica {alias!r} à jour"))
+        finally:
+            source.close()
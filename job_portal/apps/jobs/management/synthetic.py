@@ -0,0 +1,116 @@
+"""
+Générateur de données synthétiques partagé par ``create_test_data`` et
+``benchmark_search`` : distributions proches de la production (quelques lieux
+et entreprises concentrent la plupart des offres, salaires log-normaux).
+"""
+
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+TITLES = [
+    "Développeur Python",
+    "Développeur Full Stack",
+    "Data Scientist",
+    "Ingénieur DevOps",
+    "Chef de projet",
+    "Comptable",
+    "Infirmier",
+    "Commercial terrain",
+    "Assistant administratif",
+    "Technicien réseau",
+    "Juriste",
+    "Graphiste",
+]
+COMPANIES = [
+    "Tech Corp",
+    "Digital Solutions",
+    "AI Labs",
+    "Cloud Systems",
+    "Innovation Inc",
+    "Banque Centrale",
+    "Hôpital Prince Régent",
+    "Brarudi",
+    "Lumitel",
+    "Econet",
+]
+LOCATIONS = [
+    "Bujumbura",
+    "Gitega",
+    "Ngozi",
+    "Rumonge",
+    "Kayanza",
+    "Muyinga",
+    "Kirundo",
+    "Makamba",
+    "Bururi",
+    "Cibitoke",
+    "Bubanza",
+    "Muramvya",
+]
+WORDS = (
+    "équipe expérience projet client développement gestion analyse données "
+    "système réseau sécurité qualité produit service vente marketing finance "
+    "comptabilité santé formation communication stratégie innovation logiciel "
+    "application web mobile cloud infrastructure support maintenance conception "
+    "architecture base python django javascript react sql linux docker "
+    "kubernetes agile scrum rigueur autonomie anglais français swahili kirundi "
+    "bujumbura gitega ngozi rumonge partenaire budget rapport audit contrat "
+    "recrutement stage senior junior responsable direction coordination terrain"
+).split()
+
+
+def zipf_weights(count, exponent=1.0):
+    """Poids de Zipf : le rang 1 est ``2**exponent`` fois plus fréquent que le 2."""
+    return [1 / rank**exponent for rank in range(1, count + 1)]
+
+
+# Distribution de Zipf : quelques mots très fréquents, beaucoup de mots rares
+ZIPF = zipf_weights(len(WORDS))
+
+
+class SyntheticData:
+    def __init__(self, seed=42, companies=None):
+        self.random = random.Random(seed)
+        companies = max(companies or len(COMPANIES), len(COMPANIES))
+        self.companies = COMPANIES + [
+            f"Entreprise {i}" for i in range(1, companies - len(COMPANIES) + 1)
+        ]
+        self._company_weights = list(accumulate(zipf_weights(len(self.companies))))
+        self._location_weights = list(accumulate(zipf_weights(len(LOCATIONS), 1.3)))
+        self._word_weights = list(accumulate(ZIPF))
+
+    def title(self):
+        return self.random.choice(TITLES)
+
+    def company(self):
+        return self.random.choices(self.companies, cum_weights=self._company_weights)[0]
+
+    def location(self):
+        return self.random.choices(LOCATIONS, cum_weights=self._location_weights)[0]
+
+    def description(self, words=60):
+        return " ".join(
+            self.random.choices(WORDS, cum_weights=self._word_weights, k=words)
+        )
+
+    def salary_range(self):
+        """Fourchette log-normale (médiane ~ 80 000), absente dans 15 % des cas."""
+        if self.random.random() < 0.15:
+            return ""
+        low = round(self.random.lognormvariate(11.3, 0.6), -3)
+        high = round(low * self.random.uniform(1.1, 1.5), -3)
+        return f"{low:.0f}-{high:.0f}"
+
+    def dates(self, now, expired_share=0.2):
+        """
+        (publication, expiration) : offres publiées pour 30 à 90 jours, à un
+        rythme régulier ; 20 % ont expiré depuis 1 à 60 jours.
+        """
+        duration = timedelta(days=self.random.uniform(30, 90))
+        if self.random.random() < expired_share:
+            age = duration + timedelta(days=self.random.uniform(1, 60))
+        else:
+            age = duration * self.random.random()
+        created_at = now - age
+        return created_at, created_at + duration
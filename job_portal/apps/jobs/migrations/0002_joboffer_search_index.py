@@ -0,0 +1,89 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import apps.jobs.search
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_joboffer_fts USING fts5("
+            "title, company, description, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        # Classement par défaut : bm25 pondéré titre > entreprise > description
+        schema_editor.execute(
+            "INSERT INTO jobs_joboffer_fts (jobs_joboffer_fts, rank) "
+            "VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')"
+        )
+        schema_editor.execute(
+            "INSERT INTO jobs_joboffer_fts (rowid, title, company, description) "
+            "SELECT id, title, company, description FROM jobs_joboffer"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE jobs_joboffer ADD COLUMN IF NOT EXISTS search_vector tsvector"
+        )
+        # Même configuration que les requêtes (PostgresSearchBackend.config)
+        config = getattr(settings, "JOB_SEARCH_CONFIG", "french")
+        schema_editor.execute(
+            "UPDATE jobs_joboffer SET search_vector = "
+            "setweight(to_tsvector(%s::regconfig, coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, coalesce(company, '')), 'B') || "
+            "setweight(to_tsvector(%s::regconfig, coalesce(description, '')), 'C')",
+            (config, config, config),
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_joboffer_search_vector_gin "
+            "ON jobs_joboffer USING GIN (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS jobs_joboffer_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS jobs_joboffer_search_vector_gin")
+        schema_editor.execute(
+            "ALTER TABLE jobs_joboffer DROP COLUMN IF EXISTS search_vector"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.CreateModel(
+            name="JobOfferSearchIndex",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="jobs.joboffer",
+                    ),
+                ),
+                (
+                    "document",
+                    apps.jobs.search.SearchDocumentField(db_column="jobs_joboffer_fts"),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "jobs_joboffer_fts",
+                "managed": False,
+            },
+        ),
+    ]
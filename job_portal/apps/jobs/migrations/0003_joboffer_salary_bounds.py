@@ -0,0 +1,95 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:27
+
+import re
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# Copie de apps.jobs.models.parse_salary_range au moment de la migration :
+# une migration ne doit pas dépendre du code courant de l'application
+SALARY_NUMBER_RE = re.compile(
+    r"(?P<integer>\d{1,3}(?:[\s.,]\d{3})+(?!\d)|\d+)"
+    r"(?:[.,](?P<fraction>\d{1,2})(?!\d))?"
+    r"(?:\s?(?P<suffix>[kKmM])(?![^\W\d_]))?"
+)
+SALARY_MULTIPLIERS = {"k": 1000, "m": 1000000}
+SALARY_MAX = 2147483647
+
+
+def parse_salary_range(value):
+    amounts = []
+    for match in SALARY_NUMBER_RE.finditer(str(value or "")):
+        integer = re.sub(r"\D", "", match["integer"])
+        amount = Decimal(f"{integer}.{match['fraction'] or 0}")
+        amounts.append((amount, (match["suffix"] or "").lower()))
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return None, None
+    default_suffix = amounts[-1][1]
+    bounds = [
+        int(amount * SALARY_MULTIPLIERS.get(suffix or default_suffix, 1))
+        for amount, suffix in amounts
+    ]
+    # Montants hors de la colonne : laissés sans bornes
+    if max(bounds) > SALARY_MAX:
+        return None, None
+    return min(bounds), max(bounds)
+
+
+def backfill_salary_bounds(apps, schema_editor):
+    JobOffer = apps.get_model("jobs", "JobOffer")
+    last_id = 0
+    while True:
+        batch = list(
+            JobOffer.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "salary_range")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for job in batch:
+            job.salary_min, job.salary_max = parse_salary_range(job.salary_range)
+        JobOffer.objects.bulk_update(batch, ["salary_min", "salary_max"])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+    # Chaque lot est validé séparément sur les grosses tables
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0002_joboffer_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="joboffer",
+            name="salary_max",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Salaire maximum"
+            ),
+        ),
+        migrations.AddField(
+            model_name="joboffer",
+            name="salary_min",
+            field=models.PositiveIntegerField(
+                blank=True, editable=False, null=True, verbose_name="Salaire minimum"
+            ),
+        ),
+        migrations.RunPython(backfill_salary_bounds, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(
+                fields=["salary_min", "salary_max"], name="jobs_salary_bounds_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(fields=["salary_max"], name="jobs_salary_max_idx"),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_joboffer_salary_bounds"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobapplication",
+            index=models.Index(
+                fields=["job", "-applied_at", "-id"], name="jobs_app_job_applied_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobapplication",
+            index=models.Index(
+                fields=["applicant", "-applied_at", "-id"],
+                name="jobs_app_user_applied_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="jobs_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(
+                fields=["publisher", "-created_at", "-id"],
+                name="jobs_publisher_created_idx",
+            ),
+        ),
+    ]
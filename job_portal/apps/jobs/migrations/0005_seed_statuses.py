@@ -0,0 +1,37 @@
+from django.db import migrations
+
+JOB_STATUSES = {
+    "active": "Offre publiée et ouverte aux candidatures",
+    "Expired": "Statut automatique pour les offres expirées",
+}
+APPLICATION_STATUSES = {
+    "Pending": "Candidature en attente",
+    "Reviewing": "Candidature en cours d'examen",
+    "Accepted": "Candidature acceptée",
+    "Rejected": "Candidature refusée",
+    "Cancelled": "Candidature annulée par le candidat",
+}
+
+
+def seed_statuses(apps, schema_editor):
+    JobStatus = apps.get_model("jobs", "JobStatus")
+    ApplicationStatus = apps.get_model("jobs", "ApplicationStatus")
+    for name, description in JOB_STATUSES.items():
+        JobStatus.objects.get_or_create(
+            name=name, defaults={"description": description}
+        )
+    for name, description in APPLICATION_STATUSES.items():
+        ApplicationStatus.objects.get_or_create(
+            name=name, defaults={"description": description}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0004_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_statuses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_seed_statuses"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(
+                fields=["status", "expires_at"], name="jobs_status_expires_idx"
+            ),
+        ),
+    ]
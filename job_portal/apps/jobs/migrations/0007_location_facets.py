@@ -0,0 +1,66 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_location_facets(apps, schema_editor):
+    JobOffer = apps.get_model("jobs", "JobOffer")
+    LocationFacet = apps.get_model("jobs", "LocationFacet")
+    counts = (
+        JobOffer.objects.filter(status__name="active")
+        .order_by()
+        .values("location")
+        .annotate(count=Count("id"))
+        .values_list("location", "count")
+    )
+    LocationFacet.objects.bulk_create(
+        LocationFacet(location=location, active_count=count)
+        for location, count in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_joboffer_status_expires_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationFacet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "location",
+                    models.CharField(max_length=100, unique=True, verbose_name="Lieu"),
+                ),
+                (
+                    "active_count",
+                    models.IntegerField(default=0, verbose_name="Offres actives"),
+                ),
+            ],
+            options={
+                "verbose_name": "Facette de lieu",
+                "verbose_name_plural": "Facettes de lieu",
+                "ordering": ["location"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(
+                fields=["location", "status"], name="jobs_location_status_idx"
+            ),
+        ),
+        migrations.RunPython(fill_location_facets, migrations.RunPython.noop),
+    ]
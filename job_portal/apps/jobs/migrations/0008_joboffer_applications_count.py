@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def backfill_applications_count(apps, schema_editor):
+    JobOffer = apps.get_model("jobs", "JobOffer")
+    JobApplication = apps.get_model("jobs", "JobApplication")
+    counts = (
+        JobApplication.objects.filter(job=OuterRef("pk"))
+        .exclude(status__name="Cancelled")
+        .order_by()
+        .values("job")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    last_id = 0
+    while True:
+        ids = list(
+            JobOffer.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            break
+        JobOffer.objects.filter(id__in=ids).update(
+            applications_count=Coalesce(Subquery(counts), 0)
+        )
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    # Chaque lot est validé séparément sur les grosses tables
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0007_location_facets"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="joboffer",
+            name="applications_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Nombre de candidatures"
+            ),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
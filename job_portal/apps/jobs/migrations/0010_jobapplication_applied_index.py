@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_joboffer_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobapplication",
+            index=models.Index(
+                fields=["-applied_at", "-id"], name="jobs_app_applied_idx"
+            ),
+        ),
+    ]
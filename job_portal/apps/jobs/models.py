@@ -1,9 +1,72 @@
-from django.db import models
+import re
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Coalesce, Now
+from django.dispatch import Signal
 from job_portal.settings import base
 from django.utils import timezone
 
+from .caching import bump_counts_version
+from .search import SearchDocumentField
+
+# Montant : "45000", "45 000", "45.000" ou "45,000" (séparateurs de
+# milliers seulement après un premier groupe de 1 à 3 chiffres), avec
+# éventuellement des décimales et un multiplicateur : "45,50", "45k", "1.5M"
+SALARY_NUMBER_RE = re.compile(
+    r"(?P<integer>\d{1,3}(?:[\s.,]\d{3})+(?!\d)|\d+)"
+    r"(?:[.,](?P<fraction>\d{1,2})(?!\d))?"
+    r"(?:\s?(?P<suffix>[kKmM])(?![^\W\d_]))?"
+)
+SALARY_MULTIPLIERS = {"k": 1000, "m": 1000000}
+# Plus grande valeur d'un PositiveIntegerField sur tous les SGBD
+SALARY_MAX = 2147483647
+
+
+def parse_salary_range(value):
+    """
+    Extrait les bornes numériques d'une fourchette de salaire libre.
+
+    "45000-55000" -> (45000, 55000), "50 000" -> (50000, 50000),
+    "45-55k" -> (45000, 55000), texte sans montant ou montant au-delà de
+    ``SALARY_MAX`` -> (None, None).
+    """
+    amounts = []
+    for match in SALARY_NUMBER_RE.finditer(str(value or "")):
+        integer = re.sub(r"\D", "", match["integer"])
+        amount = Decimal(f"{integer}.{match['fraction'] or 0}")
+        amounts.append((amount, (match["suffix"] or "").lower()))
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return None, None
+    # "45-55k" : le multiplicateur de la borne haute vaut pour les deux
+    default_suffix = amounts[-1][1]
+    bounds = [
+        int(amount * SALARY_MULTIPLIERS.get(suffix or default_suffix, 1))
+        for amount, suffix in amounts
+    ]
+    # Hors de la colonne : pas de bornes plutôt qu'une erreur SQL
+    if max(bounds) > SALARY_MAX:
+        return None, None
+    return min(bounds), max(bounds)
+
+
+def salary_range_error(value):
+    """Message d'erreur pour une fourchette saisie, ou None si elle convient."""
+    if not value or parse_salary_range(value)[0] is not None:
+        return None
+    if SALARY_NUMBER_RE.search(str(value)):
+        return f"Le montant ne peut pas dépasser {SALARY_MAX}."
+    return "Indiquez un montant ou une fourchette, par exemple 45000-55000."
+
 
 class JobStatus(models.Model):
+    ACTIVE = "active"
+    EXPIRED = "Expired"
+
     name = models.CharField(max_length=50, unique=True, verbose_name="Nom du statut")
     description = models.TextField(blank=True, verbose_name="Description du statut")
 
@@ -16,6 +79,12 @@ class JobStatus(models.Model):
 
 
 class ApplicationStatus(models.Model):
+    PENDING = "Pending"
+    REVIEWING = "Reviewing"
+    ACCEPTED = "Accepted"
+    REJECTED = "Rejected"
+    CANCELLED = "Cancelled"
+
     name = models.CharField(max_length=50, unique=True, verbose_name="Nom du statut")
     description = models.TextField(blank=True, verbose_name="Description du statut")
 
@@ -27,6 +96,47 @@ class ApplicationStatus(models.Model):
         return self.name
 
 
+class JobOfferQuerySet(models.QuerySet):
+    def search(self, query):
+        from .search import get_search_backend
+
+        return get_search_backend().search(self, query)
+
+    def adjust_applications_count(self, deltas):
+        """
+        Ajoute ``deltas[job_id]`` à applications_count par des UPDATE F(), un
+        par valeur distincte ; les offres à delta nul ne sont pas touchées.
+        """
+        by_delta = defaultdict(list)
+        for job_id, delta in deltas.items():
+            if job_id is not None and delta:
+                by_delta[delta].append(job_id)
+        for delta, job_ids in by_delta.items():
+            self.filter(pk__in=job_ids).update(
+                applications_count=F("applications_count") + delta, updated_at=Now()
+            )
+        if by_delta:
+            bump_counts_version()
+
+    def recount_applications(self):
+        """Recalcule applications_count des offres du queryset en un UPDATE."""
+        from .registry import application_statuses
+
+        counts = (
+            JobApplication.objects.filter(job=models.OuterRef("pk"))
+            .exclude(status_id=application_statuses.id(ApplicationStatus.CANCELLED))
+            .order_by()
+            .values("job")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        updated = self.update(
+            applications_count=Coalesce(models.Subquery(counts), 0), updated_at=Now()
+        )
+        bump_counts_version()
+        return updated
+
+
 class JobOffer(models.Model):
     title = models.CharField(max_length=200, verbose_name="Titre du poste")
     description = models.TextField(verbose_name="Description")
@@ -44,6 +154,11 @@ class JobOffer(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name="Date de création"
     )
+    # Validateur HTTP (ETag/Last-Modified) : les update() en masse le
+    # renseignent explicitement
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name="Date de modification"
+    )
     expires_at = models.DateTimeField(verbose_name="Date d'expiration")
     salary_range = models.CharField(
         max_length=100,
@@ -51,20 +166,84 @@ class JobOffer(models.Model):
         verbose_name="Fourchette de salaire",
         help_text="Exemple : 45000-55000",
     )
+    # Bornes extraites de salary_range pour le filtrage et le tri indexés
+    salary_min = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name="Salaire minimum"
+    )
+    salary_max = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name="Salaire maximum"
+    )
+    # Candidatures non annulées, tenu à jour par les signaux de JobApplication
+    applications_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Nombre de candidatures"
+    )
+
+    objects = JobOfferQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Offre d'emploi"
         verbose_name_plural = "Offres d'emploi"
+        indexes = [
+            models.Index(
+                fields=["salary_min", "salary_max"], name="jobs_salary_bounds_idx"
+            ),
+            models.Index(fields=["salary_max"], name="jobs_salary_max_idx"),
+            # Pagination par curseur (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="jobs_created_id_idx"),
+            models.Index(
+                fields=["publisher", "-created_at", "-id"],
+                name="jobs_publisher_created_idx",
+            ),
+            # Listes d'offres actives et balayage des offres expirées
+            models.Index(
+                fields=["status", "expires_at"], name="jobs_status_expires_idx"
+            ),
+            # Recomptage des facettes par lieu
+            models.Index(
+                fields=["location", "status"], name="jobs_location_status_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lieu et statut au chargement, pour ajuster LocationFacet au
+        # save/delete
+        if not {"location", "status_id"} & instance.get_deferred_fields():
+            instance._loaded_facet = (instance.location, instance.status_id)
+        return instance
 
     def save(self, *args, **kwargs):
+        self.salary_min, self.salary_max = parse_salary_range(self.salary_range)
         if self.expires_at < timezone.now():
-            expired_status, _ = JobStatus.objects.get_or_create(
-                name="Expired",
-                defaults={"description": "Statut automatique pour les offres expirées"},
+            from .registry import job_statuses
+
+            self.status = job_statuses.get(JobStatus.EXPIRED)
+        update_fields = kwargs.get("update_fields")
+        if (
+            self._state.adding
+            or self.pk is None
+            or (update_fields is not None and "applications_count" not in update_fields)
+        ):
+            return super().save(*args, **kwargs)
+        # applications_count n'est modifié que par des UPDATE F() : relire le
+        # compteur sous verrou pour qu'une instance chargée plus tôt ne
+        # l'écrase pas, une candidature concurrente attendant l'UPDATE
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            count = (
+                type(self)
+                ._base_manager.using(using)
+                .select_for_update()
+                .filter(pk=self.pk)
+                .values_list("applications_count", flat=True)
+                .first()
             )
-            self.status = expired_status
-        super().save(*args, **kwargs)
+            # Ligne supprimée entre-temps : save() la réinsère, comme Django
+            if count is not None:
+                self.applications_count = count
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -73,6 +252,157 @@ class JobOffer(models.Model):
     def is_expired(self):
         return self.expires_at < timezone.now()
 
+    def facet_location(self):
+        """Lieu compté dans LocationFacet, ou None si l'offre n'est pas active."""
+        return self.facet_location_of(self.location, self.status_id)
+
+    @staticmethod
+    def facet_location_of(location, status_id):
+        from .registry import job_statuses
+
+        if status_id == job_statuses.id(JobStatus.ACTIVE):
+            return location
+        return None
+
+
+class JobOfferSearchIndex(models.Model):
+    """Index FTS5 des offres (SQLite uniquement), créé par la migration 0002."""
+
+    job = models.OneToOneField(
+        JobOffer,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search_index",
+    )
+    document = SearchDocumentField(db_column="jobs_joboffer_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "jobs_joboffer_fts"
+
+
+class LocationFacetManager(models.Manager):
+    def adjust(self, location, delta):
+        """Ajoute ``delta`` au nombre d'offres actives de ``location``."""
+        if not location or not delta:
+            return
+        updated = self.filter(location=location).update(
+            active_count=F("active_count") + delta
+        )
+        if not updated and delta > 0:
+            try:
+                with transaction.atomic():
+                    self.create(location=location, active_count=delta)
+            except IntegrityError:
+                # Créée entre-temps par une autre requête
+                self.adjust(location, delta)
+
+    def _active_counts(self, offers):
+        from .registry import job_statuses
+
+        return dict(
+            offers.filter(status_id=job_statuses.id(JobStatus.ACTIVE))
+            .order_by()
+            .values("location")
+            .annotate(count=Count("id"))
+            .values_list("location", "count")
+        )
+
+    def refresh(self, locations):
+        """Recompte les offres actives des lieux donnés."""
+        locations = set(locations)
+        counts = self._active_counts(JobOffer.objects.filter(location__in=locations))
+        for location in locations:
+            self.update_or_create(
+                location=location,
+                defaults={"active_count": counts.get(location, 0)},
+            )
+
+    @transaction.atomic
+    def rebuild(self):
+        """Recalcule toute la table en un GROUP BY."""
+        self.all().delete()
+        self.bulk_create(
+            LocationFacet(location=location, active_count=count)
+            for location, count in self._active_counts(JobOffer.objects).items()
+        )
+
+
+class LocationFacet(models.Model):
+    """
+    Nombre d'offres actives par lieu, tenu à jour par les signaux de JobOffer
+    et par le balayage des offres expirées. Remplace le DISTINCT sur toute la
+    table des offres pour remplir la liste des lieux.
+    """
+
+    location = models.CharField(max_length=100, unique=True, verbose_name="Lieu")
+    active_count = models.IntegerField(default=0, verbose_name="Offres actives")
+
+    objects = LocationFacetManager()
+
+    class Meta:
+        ordering = ["location"]
+        verbose_name = "Facette de lieu"
+        verbose_name_plural = "Facettes de lieu"
+
+    def __str__(self):
+        return f"{self.location} ({self.active_count})"
+
+    @classmethod
+    def locations(cls):
+        """Lieux ayant au moins une offre active, pour les filtres."""
+        return cls.objects.filter(active_count__gt=0).values_list("location", flat=True)
+
+
+# Envoyé avec les identifiants des candidatures dont le statut vient de
+# changer, par save() comme par bulk_set_status (UPDATE groupé), et
+# l'utilisateur à l'origine du changement (``changed_by``) s'il est connu
+application_status_changed = Signal()
+
+
+class JobApplicationQuerySet(models.QuerySet):
+    @transaction.atomic
+    def bulk_set_status(self, ids, status, notes=None, changed_by=None):
+        """
+        Applique ``status`` (et ``notes`` si donné) aux candidatures ``ids``
+        du queryset en un seul UPDATE, au nom de ``changed_by``. Renvoie
+        ``{id: "updated"}`` ou ``"not_found"`` pour les identifiants hors du
+        queryset.
+        """
+        rows = {
+            pk: (job_id, status_id)
+            for pk, job_id, status_id in self.filter(id__in=ids).values_list(
+                "id", "job_id", "status_id"
+            )
+        }
+        changes = {"status": status}
+        if notes is not None:
+            changes["notes"] = notes
+        if rows:
+            from .registry import application_statuses
+
+            self.model.objects.filter(id__in=rows).update(**changes)
+            # update() contourne les signaux : seules les entrées dans
+            # "Cancelled" et les sorties changent applications_count
+            cancelled_id = application_statuses.id(ApplicationStatus.CANCELLED)
+            deltas = Counter()
+            for job_id, status_id in rows.values():
+                deltas[job_id] += (status.pk != cancelled_id) - (
+                    status_id != cancelled_id
+                )
+            JobOffer.objects.adjust_applications_count(deltas)
+            changed = [
+                pk for pk, (job_id, status_id) in rows.items() if status_id != status.pk
+            ]
+            if changed:
+                application_status_changed.send(
+                    sender=self.model, application_ids=changed, changed_by=changed_by
+                )
+        return {pk: "updated" if pk in rows else "not_found" for pk in ids}
+
 
 class JobApplication(models.Model):
     job = models.ForeignKey(
@@ -100,10 +430,47 @@ class JobApplication(models.Model):
         help_text="Notes internes sur le candidat",
     )
 
+    objects = JobApplicationQuerySet.as_manager()
+
     class Meta:
         unique_together = ("job", "applicant")
+        indexes = [
+            # Pagination par curseur (applied_at, id)
+            models.Index(
+                fields=["job", "-applied_at", "-id"], name="jobs_app_job_applied_idx"
+            ),
+            models.Index(
+                fields=["applicant", "-applied_at", "-id"],
+                name="jobs_app_user_applied_idx",
+            ),
+            # Liste et hiérarchie par dates de l'admin
+            models.Index(fields=["-applied_at", "-id"], name="jobs_app_applied_idx"),
+        ]
         verbose_name = "Candidature"
         verbose_name_plural = "Candidatures"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Offre créditée au chargement, pour ajuster applications_count
+        if not {"job_id", "status_id"} & instance.get_deferred_fields():
+            instance._counted_job_id = instance.counted_job_id()
+        if "status_id" not in instance.get_deferred_fields():
+            instance._loaded_status_id = instance.status_id
+        return instance
+
+    def save(self, *args, changed_by=None, **kwargs):
+        # Transmis à application_status_changed si le statut change
+        self._changed_by = changed_by
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Candidature de {self.applicant} pour {self.job.title}"
+
+    def counted_job_id(self):
+        """Offre dont applications_count inclut cette candidature, ou None."""
+        from .registry import application_statuses
+
+        if self.status_id == application_statuses.id(ApplicationStatus.CANCELLED):
+            return None
+        return self.job_id
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+
+from .models import ApplicationStatus, JobStatus
+
+
+class StatusRegistry:
+    """
+    Cache en mémoire, par processus, des lignes d'une table de statuts.
+
+    Les statuts changent rarement : ils sont chargés en une requête puis
+    servis depuis la mémoire, ce qui évite un ``get_or_create`` ou une
+    jointure sur ``status__name`` à chaque requête. Le cache est vidé par
+    les signaux post_save/post_delete (voir ``signals.py``).
+    """
+
+    # Un nom ou identifiant inconnu (créé par un autre processus, ou
+    # ?status= invalide) relit la table au plus une fois par intervalle
+    reload_interval = 60
+
+    def __init__(self, model, descriptions=None):
+        self.model = model
+        self.descriptions = descriptions or {}
+        self._lock = threading.Lock()
+        self._by_name = None
+        self._by_id = None
+        self._loaded_at = None
+
+    def __deepcopy__(self, memo):
+        # Partagé par tout le processus : les champs DRF copient leurs
+        # arguments à chaque instanciation du serializer
+        return self
+
+    def _load(self, missing=False):
+        """
+        Charge la table si besoin ; ``missing`` signale une recherche
+        infructueuse, qui ne la relit que si le dernier chargement date de
+        plus de ``reload_interval`` secondes.
+        """
+        with self._lock:
+            if self._by_name is None or (
+                missing and time.monotonic() - self._loaded_at >= self.reload_interval
+            ):
+                statuses = list(self.model.objects.all())
+                self._by_name = {status.name: status for status in statuses}
+                self._by_id = {status.pk: status for status in statuses}
+                self._loaded_at = time.monotonic()
+            return self._by_name, self._by_id
+
+    def clear(self):
+        with self._lock:
+            self._by_name = self._by_id = None
+
+    def get(self, name, create=True):
+        """
+        Renvoie le statut ``name``. S'il n'existe pas encore, il est créé
+        (comme l'ancien ``get_or_create``), sauf si ``create`` est faux.
+        """
+        by_name, _ = self._load()
+        status = by_name.get(name)
+        if status is None and create:
+            status, _ = self.model.objects.get_or_create(
+                name=name, defaults={"description": self.descriptions.get(name, "")}
+            )
+            # Créé ici ou par un autre processus depuis le chargement
+            self.clear()
+        elif status is None:
+            by_name, _ = self._load(missing=True)
+            status = by_name.get(name)
+        return status
+
+    def id(self, name, create=True):
+        status = self.get(name, create=create)
+        return status.pk if status is not None else None
+
+    async def aid(self, name):
+        """
+        ``id`` pour les vues asynchrones (sans création) : la base n'est lue,
+        dans un thread, que si le statut n'est pas déjà en mémoire.
+        """
+        by_name = self._by_name
+        if by_name is None or name not in by_name:
+            by_name, _ = await sync_to_async(self._load)(missing=by_name is not None)
+        status = by_name.get(name)
+        return status.pk if status is not None else None
+
+    def all(self):
+        _, by_id = self._load()
+        return [by_id[pk] for pk in sorted(by_id)]
+
+    def by_id(self, pk):
+        _, by_id = self._load()
+        if pk is not None and pk not in by_id:
+            _, by_id = self._load(missing=True)
+        return by_id.get(pk)
+
+
+job_statuses = StatusRegistry(
+    JobStatus,
+    descriptions={JobStatus.EXPIRED: "Statut automatique pour les offres expirées"},
+)
+application_statuses = StatusRegistry(ApplicationStatus)
@@ -0,0 +1,207 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import BooleanField, F, FloatField, Lookup, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+# Nombre maximum de termes pris en compte dans une recherche
+MAX_TERMS = 8
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query):
+    return TERM_RE.findall((query or "").lower())[:MAX_TERMS]
+
+
+class SearchDocumentField(models.TextField):
+    """Colonne cachée d'une table FTS5, portant le même nom que la table."""
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", (*lhs_params, *rhs_params)
+
+
+class BaseSearchBackend:
+    """
+    Interface commune des backends de recherche sur les offres d'emploi.
+
+    ``search`` filtre le queryset et l'annote avec ``search_rank`` (plus la
+    valeur est grande, plus l'offre est pertinente).
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def no_results(self, queryset):
+        # Garde l'annotation pour que le tri par pertinence reste valide
+        return queryset.none().annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def index(self, job):
+        """Met à jour l'index pour une offre créée ou modifiée."""
+
+    def index_many(self, jobs):
+        for job in jobs:
+            self.index(job)
+
+    def remove(self, job_id):
+        """Retire une offre supprimée de l'index."""
+
+    def rebuild(self):
+        """Reconstruit entièrement l'index à partir de la table des offres."""
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Recherche par ``icontains``, sans index : utile pour les tests et le
+    dépannage.
+    """
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query)
+            | Q(company__icontains=query)
+            | Q(description__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Table virtuelle FTS5 ``jobs_joboffer_fts`` dont le rowid est l'id de l'offre.
+
+    La table est jointe via ``JobOfferSearchIndex`` : SQLite évalue le MATCH
+    une seule fois puis retrouve les offres par clé primaire. Le classement
+    ``rank`` (bm25 pondéré titre > entreprise > description) est configuré
+    par la migration 0002.
+    """
+
+    table = "jobs_joboffer_fts"
+
+    def match_expression(self, query):
+        # Chaque terme est cité (pas d'opérateurs FTS5 injectés) et utilisé
+        # comme préfixe pour la recherche au fil de la frappe.
+        return " ".join(f'"{term}"*' for term in tokenize(query))
+
+    def search(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return self.no_results(queryset)
+        # bm25 est négatif : plus il est petit, plus l'offre est pertinente
+        return queryset.filter(search_index__document__match=expression).annotate(
+            search_rank=-F("search_index__rank")
+        )
+
+    def index(self, job):
+        self.index_many([job])
+
+    def index_many(self, jobs):
+        rows = [(job.pk, job.title, job.company, job.description) for job in jobs]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(row[0],) for row in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, company, description) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", (job_id,))
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, company, description) "
+                "SELECT id, title, company, description FROM jobs_joboffer"
+            )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Colonne ``search_vector`` (tsvector) indexée en GIN sur ``jobs_joboffer``.
+
+    Vecteurs et requêtes utilisent ``JOB_SEARCH_CONFIG`` ; les vecteurs ne
+    sont écrits que par ce backend et par la migration 0002, avec le réglage
+    en vigueur. Après un changement du réglage, ``rebuild_search_index``
+    recalcule les vecteurs existants.
+    """
+
+    @property
+    def config(self):
+        return getattr(settings, "JOB_SEARCH_CONFIG", "french")
+
+    vector_sql = (
+        "setweight(to_tsvector(%s::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector(%s::regconfig, coalesce(company, '')), 'B') || "
+        "setweight(to_tsvector(%s::regconfig, coalesce(description, '')), 'C')"
+    )
+
+    def tsquery(self, query):
+        return " & ".join(f"{term}:*" for term in tokenize(query))
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return self.no_results(queryset)
+        db_table = queryset.model._meta.db_table
+        params = (self.config, tsquery)
+        return queryset.filter(
+            RawSQL(
+                f"{db_table}.search_vector @@ to_tsquery(%s::regconfig, %s)",
+                params,
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank_cd({db_table}.search_vector, "
+                "to_tsquery(%s::regconfig, %s))",
+                params,
+                output_field=FloatField(),
+            )
+        )
+
+    def index(self, job):
+        self.index_many([job])
+
+    def index_many(self, jobs):
+        ids = [job.pk for job in jobs]
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE jobs_joboffer SET search_vector = {self.vector_sql} "
+                "WHERE id = ANY(%s)",
+                (self.config, self.config, self.config, ids),
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE jobs_joboffer SET search_vector = {self.vector_sql}",
+                (self.config, self.config, self.config),
+            )
+
+
+@lru_cache(maxsize=None)
+def get_search_backend(path=None):
+    path = path or getattr(
+        settings, "JOB_SEARCH_BACKEND", "apps.jobs.search.DatabaseSearchBackend"
+    )
+    return import_string(path)()
@@ -0,0 +1,158 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .bulk import job_offers_bulk_written
+from .caching import bump_offers_version
+from .expiry import job_offers_expired
+from .models import (
+    ApplicationStatus,
+    JobApplication,
+    JobOffer,
+    JobStatus,
+    LocationFacet,
+    application_status_changed,
+)
+from .registry import application_statuses, job_statuses
+from .search import get_search_backend
+
+
+@receiver([post_save, post_delete], sender=JobOffer)
+@receiver([job_offers_expired, job_offers_bulk_written])
+def invalidate_job_listings(sender, **kwargs):
+    bump_offers_version()
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_publisher_listings(sender, instance, created, update_fields, **kwargs):
+    # Le nom du recruteur est rendu dans les listes (publisher_name) : pages
+    # en cache et validateurs HTTP changent avec lui
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    if instance.__dict__.get("username") != getattr(instance, "_loaded_username", None):
+        bump_offers_version()
+
+
+@receiver(post_save, sender=JobOffer)
+def index_job_offer(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(job_offers_bulk_written)
+def index_bulk_written_job_offers(sender, job_ids, **kwargs):
+    get_search_backend().index_many(JobOffer.objects.filter(id__in=job_ids))
+
+
+@receiver(post_delete, sender=JobOffer)
+def unindex_job_offer(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(pre_save, sender=JobOffer)
+def load_facet_location(sender, instance, raw, **kwargs):
+    # Instance non chargée depuis la base (ou champs différés) : relire l'état
+    if raw or not instance.pk or hasattr(instance, "_loaded_facet"):
+        return
+    previous = JobOffer.objects.filter(pk=instance.pk).values_list(
+        "location", "status_id"
+    )
+    instance._loaded_facet = previous[0] if previous else None
+
+
+def loaded_facet_location(instance):
+    loaded = getattr(instance, "_loaded_facet", None)
+    return JobOffer.facet_location_of(*loaded) if loaded else None
+
+
+@receiver(post_save, sender=JobOffer)
+def update_location_facets(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    # Ligne insérée (y compris une ligne supprimée puis réenregistrée) : elle
+    # n'était comptée nulle part
+    old = None if created else loaded_facet_location(instance)
+    new = instance.facet_location()
+    if old != new:
+        LocationFacet.objects.adjust(old, -1)
+        LocationFacet.objects.adjust(new, 1)
+    instance._loaded_facet = (instance.location, instance.status_id)
+
+
+@receiver(post_delete, sender=JobOffer)
+def remove_from_location_facets(sender, instance, **kwargs):
+    LocationFacet.objects.adjust(loaded_facet_location(instance), -1)
+
+
+@receiver(job_offers_expired)
+def refresh_expired_location_facets(sender, job_ids, **kwargs):
+    LocationFacet.objects.refresh(
+        JobOffer.objects.filter(id__in=job_ids)
+        .order_by()
+        .values_list("location", flat=True)
+        .distinct()
+    )
+
+
+@receiver(job_offers_bulk_written)
+def refresh_bulk_written_location_facets(sender, locations, **kwargs):
+    LocationFacet.objects.refresh(locations)
+
+
+def adjust_applications_count(job_id, delta):
+    JobOffer.objects.adjust_applications_count({job_id: delta})
+
+
+@receiver(pre_save, sender=JobApplication)
+def load_counted_job(sender, instance, raw, **kwargs):
+    if raw or not instance.pk or hasattr(instance, "_counted_job_id"):
+        return
+    previous = JobApplication.objects.filter(pk=instance.pk).only("job", "status")
+    instance._counted_job_id = previous[0].counted_job_id() if previous else None
+    instance._loaded_status_id = previous[0].status_id if previous else None
+
+
+@receiver(post_save, sender=JobApplication)
+def update_applications_count(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    old, new = getattr(instance, "_counted_job_id", None), instance.counted_job_id()
+    if old != new:
+        adjust_applications_count(old, -1)
+        adjust_applications_count(new, 1)
+    instance._counted_job_id = new
+
+
+@receiver(post_save, sender=JobApplication)
+def announce_status_change(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_status_id", instance.status_id)
+    if not created and loaded != instance.status_id:
+        application_status_changed.send(
+            sender=JobApplication,
+            application_ids=[instance.pk],
+            changed_by=getattr(instance, "_changed_by", None),
+        )
+    instance._loaded_status_id = instance.status_id
+
+
+@receiver(post_delete, sender=JobApplication)
+def remove_from_applications_count(sender, instance, **kwargs):
+    adjust_applications_count(getattr(instance, "_counted_job_id", None), -1)
+
+
+@receiver([post_save, post_delete], sender=JobStatus)
+def clear_job_statuses(sender, **kwargs):
+    job_statuses.clear()
+
+
+@receiver([post_save, post_delete], sender=ApplicationStatus)
+def clear_application_statuses(sender, **kwargs):
+    application_statuses.clear()
+
+
+@receiver(setting_changed)
+def reset_search_backend(setting, **kwargs):
+    if setting == "JOB_SEARCH_BACKEND":
+        get_search_backend.cache_clear()
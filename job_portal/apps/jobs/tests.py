@@ -1,3 +1,931 @@
-from django.test import TestCase
+import importlib
+import os
+import sys
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.db.transaction import TransactionManagementError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import CustomUser
+from apps.jobs.applying import (
+    ALREADY_APPLIED,
+    ApplicationRefused,
+    check_eligibility,
+    offers_for_applicant,
+    submit_application,
+)
+from apps.jobs.bulk import bulk_write_job_offers
+from apps.jobs.caching import bump_offers_version, cached_listing, listing_cache_key
+from apps.jobs.expiry import expire_job_offers, job_offers_expired
+from apps.jobs.facets import (
+    cached_facet_counts,
+    facet_counts,
+    filter_offers,
+    normalize_filters,
+)
+from apps.jobs.forms import JobOfferForm
+from apps.jobs.management.commands.benchmark import Command as BenchmarkCommand
+from apps.jobs.models import (
+    ApplicationStatus,
+    JobApplication,
+    JobOffer,
+    JobStatus,
+    LocationFacet,
+    parse_salary_range,
+)
+from apps.jobs.pagination import InvalidCursor, KeysetPaginator, encode_cursor
+from apps.jobs.registry import application_statuses, job_statuses
+from job_portal.profiling import ProfilingMiddleware
+from job_portal.routers import (
+    STICKY_COOKIE,
+    PrimaryReplicaRouter,
+    ReplicaMiddleware,
+    replica_reads,
+)
+
+
+class JobOfferTestCase(TestCase):
+    def setUp(self):
+        # Les pages et facettes en cache survivent au rollback entre tests
+        cache.clear()
+        self.recruiter = CustomUser.objects.create_user(
+            username="recruteur", password="testpass123", is_recruiter=True
+        )
+        self.active, _ = JobStatus.objects.get_or_create(name="active")
+
+    def create_job(self, **kwargs):
+        defaults = {
+            "title": "Comptable",
+            "description": "Gestion de la comptabilité générale",
+            "company": "Banque Centrale",
+            "location": "Bujumbura",
+            "publisher": self.recruiter,
+            "status": self.active,
+            "expires_at": timezone.now() + timedelta(days=30),
+        }
+        defaults.update(kwargs)
+        return JobOffer.objects.create(**defaults)
+
+
+class JobSearchTests(JobOfferTestCase):
+    def test_search_ranks_title_matches_first(self):
+        in_description = self.create_job(
+            title="Chef de projet", description="Projet de migration Python"
+        )
+        in_title = self.create_job(title="Développeur Python")
+        self.create_job()
+
+        results = list(
+            JobOffer.objects.search("python").order_by("-search_rank", "-id")
+        )
+
+        self.assertEqual(results, [in_title, in_description])
+
+    def test_search_matches_prefixes_and_ignores_accents(self):
+        job = self.create_job(title="Développeur Django")
+
+        self.assertEqual(list(JobOffer.objects.search("develop")), [job])
+
+    def test_index_follows_updates_and_deletes(self):
+        job = self.create_job()
+        job.title = "Infirmier"
+        job.save()
+
+        self.assertFalse(JobOffer.objects.search("comptable").exists())
+        self.assertTrue(JobOffer.objects.search("infirmier").exists())
+
+        job.delete()
+        self.assertFalse(JobOffer.objects.search("infirmier").exists())
+
+    def test_available_jobs_uses_search_backend(self):
+        job = self.create_job(title="Développeur Python")
+        self.create_job()
+        self.client.force_login(self.recruiter)
+
+        response = self.client.get(reverse("jobs:available_jobs"), {"q": "pyth"})
+
+        self.assertEqual(list(response.context["jobs"]), [job])
+
+
+class SalaryBoundsTests(JobOfferTestCase):
+    def test_parse_salary_range(self):
+        self.assertEqual(parse_salary_range("45000-55000"), (45000, 55000))
+        self.assertEqual(parse_salary_range("55 000 - 45 000 BIF"), (45000, 55000))
+        self.assertEqual(parse_salary_range("50000"), (50000, 50000))
+        self.assertEqual(parse_salary_range("À négocier"), (None, None))
+        # Deux montants séparés par une espace, pas un séparateur de milliers
+        self.assertEqual(parse_salary_range("45000 55000"), (45000, 55000))
+        self.assertEqual(parse_salary_range("45k-55k"), (45000, 55000))
+        self.assertEqual(parse_salary_range("45-55k"), (45000, 55000))
+        self.assertEqual(parse_salary_range("1.5M"), (1500000, 1500000))
+        self.assertEqual(parse_salary_range("45.000,50 €"), (45000, 45000))
+        self.assertEqual(parse_salary_range("5000 par mois"), (5000, 5000))
+        # Au-delà d'un PositiveIntegerField, comme la migration 0003
+        self.assertEqual(parse_salary_range("99999999999"), (None, None))
+
+    def test_save_stores_bounds(self):
+        job = self.create_job(salary_range="45000-55000")
+
+        self.assertEqual((job.salary_min, job.salary_max), (45000, 55000))
+
+    def test_form_rejects_unparseable_range(self):
+        form = JobOfferForm(data={"salary_range": "beaucoup"})
+
+        self.assertIn("salary_range", form.errors)
+
+    def test_form_rejects_bounds_out_of_column_range(self):
+        form = JobOfferForm(data={"salary_range": "99999999999"})
+
+        self.assertIn("salary_range", form.errors)
+
+    def test_salary_filters_compare_numbers(self):
+        # "9000" > "10000" en comparaison de chaînes
+        low = self.create_job(salary_range="9000-9500")
+        high = self.create_job(salary_range="100000-120000")
+        self.client.force_login(self.recruiter)
+        url = reverse("jobs:available_jobs")
+
+        response = self.client.get(url, {"min_salary": "10000"})
+        self.assertEqual(list(response.context["jobs"]), [high])
+
+        response = self.client.get(url, {"max_salary": "10000"})
+        self.assertEqual(list(response.context["jobs"]), [low])
+
+    def test_bulk_writes_store_bounds(self):
+        changes = {
+            "title": "Comptable",
+            "description": "Comptabilité",
+            "company": "Banque Centrale",
+            "location": "Bujumbura",
+            "salary_range": "45000-55000",
+            "expires_at": timezone.now() + timedelta(days=30),
+        }
+        low, high = bulk_write_job_offers(
+            self.recruiter.pk,
+            creates=[changes, {**changes, "salary_range": "100000-120000"}],
+        )
+        self.assertEqual(
+            list(filter_offers(JobOffer.objects.all(), {"min_salary": 60000})), [high]
+        )
+
+        bulk_write_job_offers(
+            self.recruiter.pk, updates=[(low, {"salary_range": "200000-250000"})]
+        )
+        self.assertEqual(
+            set(filter_offers(JobOffer.objects.all(), {"min_salary": 60000})),
+            {low, high},
+        )
+
+
+class KeysetPaginatorTests(JobOfferTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(25):
+            self.create_job(title=f"Offre {i}")
+        # Des dates identiques obligent le départage par id
+        JobOffer.objects.update(created_at=timezone.now())
+        self.expected = list(
+            JobOffer.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_pages_forward_and_backward_without_gaps(self):
+        paginator = KeysetPaginator(JobOffer.objects.all(), per_page=10)
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([job.id for page in pages for job in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+
+        previous = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual([job.id for job in previous], self.expected[10:20])
+        self.assertTrue(previous.has_previous())
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(JobOffer.objects.all(), per_page=10)
+
+        page = paginator.get_page("pas-un-curseur")
+
+        self.assertEqual([job.id for job in page], self.expected[:10])
+        with self.assertRaises(InvalidCursor):
+            paginator.get_page("pas-un-curseur", strict=True)
+
+    def test_cursor_values_of_the_wrong_type_are_invalid(self):
+        paginator = KeysetPaginator(JobOffer.objects.all(), per_page=10)
+        now = timezone.now()
+
+        for values in (["hier", 1], [now, "un"], [now, None], [[1], 1]):
+            with self.subTest(values=values):
+                cursor = encode_cursor(values)
+                with self.assertRaises(InvalidCursor):
+                    paginator.get_page(cursor, strict=True)
+                page = paginator.get_page(cursor)
+                self.assertEqual([job.id for job in page], self.expected[:10])
+
+
+class StatusRegistryTests(JobOfferTestCase):
+    def setUp(self):
+        super().setUp()
+        job_statuses.clear()
+        self.addCleanup(job_statuses.clear)
+
+    def test_lookups_are_served_from_memory(self):
+        job_statuses.get(JobStatus.ACTIVE)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(job_statuses.id(JobStatus.ACTIVE), self.active.pk)
+            self.assertEqual(job_statuses.by_id(self.active.pk).name, "active")
+
+    def test_cache_is_cleared_when_a_status_changes(self):
+        job_statuses.get(JobStatus.ACTIVE)
+        closed = JobStatus.objects.create(name="Closed")
+
+        self.assertEqual(job_statuses.get("Closed", create=False), closed)
+        closed.delete()
+        self.assertIsNone(job_statuses.get("Closed", create=False))
+
+    def test_unknown_names_reload_at_most_once_per_interval(self):
+        job_statuses.get(JobStatus.ACTIVE)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(job_statuses.get("inconnu", create=False))
+            self.assertIsNone(job_statuses.by_id(0))
+
+        job_statuses._loaded_at -= job_statuses.reload_interval
+        with self.assertNumQueries(1):
+            self.assertIsNone(job_statuses.get("inconnu", create=False))
+            self.assertIsNone(job_statuses.get("inconnu", create=False))
+
+    def test_expired_offer_save_does_not_query_statuses(self):
+        job_statuses.get(JobStatus.EXPIRED)
+        job = self.create_job()
+        job.expires_at = timezone.now() - timedelta(days=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            job.save()
+
+        self.assertEqual(job.status.name, JobStatus.EXPIRED)
+        self.assertFalse(
+            [q for q in queries.captured_queries if "jobs_jobstatus" in q["sql"]]
+        )
+
+
+class ExpirySweepTests(JobOfferTestCase):
+    def test_sweep_expires_offers_in_batches(self):
+        fresh = self.create_job()
+        for _ in range(5):
+            self.create_job()
+        # update() contourne save(), qui expirerait les offres lui-même
+        JobOffer.objects.exclude(pk=fresh.pk).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        batches, expired_ids = [], []
+        receiver = lambda job_ids, **kwargs: expired_ids.extend(job_ids)  # noqa: E731
+        job_offers_expired.connect(receiver)
+        self.addCleanup(job_offers_expired.disconnect, receiver)
+
+        total = expire_job_offers(
+            batch_size=2, on_batch=lambda count, seconds: batches.append(count)
+        )
+
+        self.assertEqual(total, 5)
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual(len(expired_ids), 5)
+        expired = JobOffer.objects.filter(status__name=JobStatus.EXPIRED)
+        self.assertEqual(expired.count(), 5)
+        self.assertNotIn(fresh, expired)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(expire_job_offers(), 0)
+        self.assertIn('"status_id" = ', queries[0]["sql"])
+        self.assertNotIn("NOT", queries[0]["sql"])
+
+
+class LocationFacetTests(JobOfferTestCase):
+    def counts(self):
+        return dict(LocationFacet.objects.values_list("location", "active_count"))
+
+    def test_counts_follow_offer_changes(self):
+        job = self.create_job(location="Gitega")
+        self.create_job(location="Gitega")
+        self.assertEqual(self.counts(), {"Gitega": 2})
+
+        job = JobOffer.objects.get(pk=job.pk)
+        job.location = "Ngozi"
+        job.save()
+        self.assertEqual(self.counts(), {"Gitega": 1, "Ngozi": 1})
+
+        job.delete()
+        self.assertEqual(self.counts(), {"Gitega": 1, "Ngozi": 0})
+        self.assertEqual(list(LocationFacet.locations()), ["Gitega"])
+
+    def test_saving_a_deleted_offer_inserts_it_again(self):
+        job = self.create_job(location="Gitega")
+        stale = JobOffer.objects.get(pk=job.pk)
+        job.delete()
+        self.assertEqual(self.counts(), {"Gitega": 0})
+
+        stale.title = "Comptable principal"
+        stale.save()
+
+        self.assertEqual(JobOffer.objects.get(pk=stale.pk).title, "Comptable principal")
+        self.assertEqual(self.counts(), {"Gitega": 1})
+
+    def test_expiry_sweep_refreshes_counts(self):
+        job = self.create_job(location="Rumonge")
+        JobOffer.objects.filter(pk=job.pk).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+
+        expire_job_offers()
+
+        self.assertEqual(self.counts(), {"Rumonge": 0})
+
+    def test_rebuild_matches_incremental_counts(self):
+        self.create_job(location="Gitega")
+        self.create_job(location="Bujumbura")
+        expected = self.counts()
+
+        LocationFacet.objects.rebuild()
+
+        self.assertEqual(self.counts(), expected)
+
+
+class FacetTests(JobOfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_job(location="Gitega", salary_range="40000-60000")
+        self.create_job(location="Gitega", company="Lumitel")
+        old = self.create_job(location="Ngozi", salary_range="150000")
+        JobOffer.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+
+    def test_counts_all_facets_in_one_query(self):
+        with self.assertNumQueries(1):
+            facets = facet_counts(JobOffer.objects.all())
+
+        self.assertEqual(
+            facets["location"],
+            [{"value": "Gitega", "count": 2}, {"value": "Ngozi", "count": 1}],
+        )
+        self.assertEqual(
+            {item["value"]: item["count"] for item in facets["date"]},
+            {"today": 2, "week": 2, "month": 3},
+        )
+        self.assertEqual(
+            {item["value"]: item["count"] for item in facets["salary"]},
+            {"0-50000": 1, "50000-100000": 0, "100000-200000": 1, "200000+": 0},
+        )
+
+    def test_equivalent_filters_share_cache_entry(self):
+        filters = normalize_filters({"location": " Gitega"})
+        queryset = filter_offers(JobOffer.objects.all(), filters)
+        cached_facet_counts(queryset, "test", filters)
+
+        with self.assertNumQueries(0):
+            facets = cached_facet_counts(
+                queryset, "test", normalize_filters({"location": "gitega "})
+            )
+        self.assertEqual(facets["location"], [{"value": "Gitega", "count": 2}])
+
+
+class ListQueryCountTests(JobOfferTestCase):
+    def apply(self, job, count):
+        for i in range(count):
+            applicant = CustomUser.objects.create_user(
+                username=f"candidat{job.pk}-{i}", password="testpass123"
+            )
+            JobApplication.objects.create(
+                job=job,
+                applicant=applicant,
+                status=application_statuses.get(ApplicationStatus.PENDING),
+                cover_letter="Motivation",
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.client.force_login(self.recruiter)
+        url = reverse("jobs:manage_applications")
+        profile_url = reverse("accounts:profile")
+        self.apply(self.create_job(), 2)
+        # Première requête : charge l'utilisateur de session dans le cache
+        self.client.get(url)
+        applications_queries = self.count_queries(url)
+        profile_queries = self.count_queries(profile_url)
+
+        self.apply(self.create_job(), 5)
+
+        self.assertEqual(self.count_queries(url), applications_queries)
+        self.assertEqual(self.count_queries(profile_url), profile_queries)
+
+
+class ApplyTests(JobOfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.candidate = CustomUser.objects.create_user(
+            username="candidat", password="testpass123"
+        )
+
+    def test_apply_reads_the_offer_once(self):
+        self.client.force_login(self.candidate)
+        url = reverse("jobs:job_apply", args=[self.job.pk])
+        # Première requête : charge l'utilisateur de session dans le cache
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {"cover_letter": "Motivation"})
+
+        # Hors registre des statuts (en mémoire une fois chargé)
+        selects = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('SELECT "jobs_')
+            and "jobs_applicationstatus" not in query["sql"]
+        ]
+        self.assertEqual(len(selects), 1)
+        self.assertTrue(selects[0].startswith('SELECT "jobs_joboffer"'))
+        self.assertRedirects(response, reverse("jobs:my_applications"))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+
+        response = self.client.post(url, {"cover_letter": "Motivation"})
+        self.assertRedirects(response, reverse("jobs:job_detail", args=[self.job.pk]))
+
+    def test_concurrent_duplicate_is_caught_by_unique_constraint(self):
+        # Deux requêtes ont vérifié l'éligibilité avant toute insertion
+        first = offers_for_applicant(self.candidate).get(pk=self.job.pk)
+        second = offers_for_applicant(self.candidate).get(pk=self.job.pk)
+        check_eligibility(first, self.candidate)
+        check_eligibility(second, self.candidate)
+
+        submit_application(first, self.candidate, "Motivation")
+        with self.assertRaises(ApplicationRefused) as refused:
+            submit_application(second, self.candidate, "Motivation")
+
+        self.assertEqual(refused.exception.reason, ALREADY_APPLIED)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+
+
+class ApplicationsCountTests(JobOfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.applicant = CustomUser.objects.create_user(
+            username="candidat", password="testpass123"
+        )
+
+    def count(self):
+        return JobOffer.objects.values_list("applications_count", flat=True).get(
+            pk=self.job.pk
+        )
+
+    def test_counter_follows_apply_cancel_and_delete(self):
+        application = JobApplication.objects.create(
+            job=self.job,
+            applicant=self.applicant,
+            status=application_statuses.get(ApplicationStatus.PENDING),
+            cover_letter="Motivation",
+        )
+        self.assertEqual(self.count(), 1)
+
+        application.status = application_statuses.get(ApplicationStatus.CANCELLED)
+        application.save()
+        self.assertEqual(self.count(), 0)
+
+        application = JobApplication.objects.get(pk=application.pk)
+        application.status = application_statuses.get(ApplicationStatus.ACCEPTED)
+        application.save()
+        self.assertEqual(self.count(), 1)
+
+        application.delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_bulk_status_adjusts_only_changed_counters(self):
+        other = self.create_job()
+        applications = [
+            JobApplication.objects.create(
+                job=job,
+                applicant=CustomUser.objects.create_user(
+                    username=f"candidat{i}", password="testpass123"
+                ),
+                status=application_statuses.get(ApplicationStatus.ACCEPTED),
+                cover_letter="Motivation",
+            )
+            for i, job in enumerate([self.job, self.job, other])
+        ]
+        ids = [application.pk for application in applications]
+
+        with CaptureQueriesContext(connection) as queries:
+            JobApplication.objects.bulk_set_status(
+                ids, application_statuses.get(ApplicationStatus.REJECTED)
+            )
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith('UPDATE "jobs_joboffer"')]
+        )
+
+        JobApplication.objects.bulk_set_status(
+            ids[1:], application_statuses.get(ApplicationStatus.CANCELLED)
+        )
+        self.assertEqual(self.count(), 1)
+        other.refresh_from_db()
+        self.assertEqual(other.applications_count, 0)
+
+        JobApplication.objects.bulk_set_status(
+            ids, application_statuses.get(ApplicationStatus.PENDING)
+        )
+        self.assertEqual(self.count(), 2)
+
+    def test_saving_a_stale_offer_keeps_the_counter(self):
+        stale = JobOffer.objects.get(pk=self.job.pk)
+        JobApplication.objects.create(
+            job=self.job, applicant=self.applicant, cover_letter="Motivation"
+        )
+
+        stale.title = "Comptable principal"
+        stale.save()
+
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(stale.applications_count, 1)
+
+    def test_cloning_an_offer_inserts_a_new_row(self):
+        clone = JobOffer.objects.get(pk=self.job.pk)
+        clone.pk = None
+        clone.save()
+
+        self.assertNotEqual(clone.pk, self.job.pk)
+        self.assertEqual(JobOffer.objects.count(), 2)
+
+    def test_save_inside_an_outer_atomic_block(self):
+        stale = JobOffer.objects.get(pk=self.job.pk)
+        JobApplication.objects.create(
+            job=self.job, applicant=self.applicant, cover_letter="Motivation"
+        )
+        with transaction.atomic():
+            stale.title = "Comptable principal"
+            stale.save()
+            self.assertEqual(self.count(), 1)
+            transaction.set_rollback(True)
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).title, "Comptable")
+
+        # Un bloc déjà condamné le reste : save() n'écrit rien
+        with self.assertRaises(TransactionManagementError):
+            with transaction.atomic():
+                transaction.set_rollback(True)
+                stale.save()
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).title, "Comptable")
+
+    def test_recount_command_repairs_counters(self):
+        JobApplication.objects.create(
+            job=self.job, applicant=self.applicant, cover_letter="Motivation"
+        )
+        JobOffer.objects.update(applications_count=42)
+
+        call_command("recount_applications", batch_size=1, stdout=StringIO())
+
+        self.assertEqual(self.count(), 1)
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0)
+class ProfilingMiddlewareTests(JobOfferTestCase):
+    def test_requests_are_profiled_and_listed_for_staff(self):
+        self.create_job()
+        self.client.force_login(self.recruiter)
+
+        with self.assertLogs("job_portal.profiling", "INFO") as logs:
+            self.client.get(reverse("jobs:available_jobs"))
+
+        profile = logs.records[0].profile
+        self.assertEqual(profile["view"], "jobs:available_jobs")
+        self.assertGreater(profile["query_count"], 0)
+        self.assertGreater(profile["render_ms"], 0)
+        self.assertLessEqual(len(profile["slowest_queries"]), 5)
+
+        url = reverse("slow_requests")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.recruiter.is_staff = True
+        self.recruiter.save()
+        with self.assertLogs("job_portal.profiling", "INFO"):
+            response = self.client.get(url)
+        self.assertIn(
+            "jobs:available_jobs",
+            [data["view"] for data in response.json()["requests"]],
+        )
+
+    async def test_async_views_are_profiled_without_adaptation(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(ProfilingMiddleware(get_response)))
+
+        await sync_to_async(self.create_job)()
+        await self.async_client.aforce_login(self.recruiter)
+        with self.assertLogs("job_portal.profiling", "INFO") as logs:
+            await self.async_client.get(reverse("jobs:available_jobs"))
+
+        profile = logs.records[0].profile
+        self.assertEqual(profile["view"], "jobs:available_jobs")
+        self.assertGreater(profile["query_count"], 0)
+        self.assertGreater(profile["render_ms"], 0)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_PRIMARY_STICKINESS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    def route(self, request):
+        """Alias de lecture choisi pendant la requête, et la réponse."""
+        databases = []
+
+        def view(request):
+            databases.append(PrimaryReplicaRouter().db_for_read(JobOffer))
+            return HttpResponse()
+
+        response = ReplicaMiddleware(view)(request)
+        return databases[0], response
+
+    def test_reads_outside_requests_go_to_primary(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(JobOffer), "default")
+        self.assertEqual(router.db_for_write(JobOffer), "default")
+        self.assertFalse(router.allow_migrate("replica", "jobs"))
+
+    def test_writer_sticks_to_primary(self):
+        factory = RequestFactory()
+        database, response = self.route(factory.get("/"))
+        self.assertEqual(database, "replica")
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+        database, response = self.route(factory.post("/"))
+        self.assertEqual(database, "default")
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], 10)
+
+        # Les lectures suivantes du même client restent sur le primaire...
+        request = factory.get("/")
+        request.COOKIES[STICKY_COOKIE] = cookie.value
+        self.assertEqual(self.route(request)[0], "default")
+        # ... jusqu'à l'échéance du cookie
+        request.COOKIES[STICKY_COOKIE] = str(time.time() - 1)
+        self.assertEqual(self.route(request)[0], "replica")
+
+    def test_version_keyed_caches_are_filled_from_the_primary(self):
+        cache.clear()
+        router = PrimaryReplicaRouter()
+        with replica_reads():
+            self.assertEqual(router.db_for_read(JobOffer), "replica")
+            # Un réplica en retard garderait sa page sous la nouvelle version
+            self.assertEqual(
+                cached_listing("jobs:page:test", lambda: router.db_for_read(JobOffer)),
+                "default",
+            )
+
+
+class AdminTests(JobOfferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = CustomUser.objects.create_superuser(
+            username="admin", email="admin@example.com", password="testpass123"
+        )
+        self.client.force_login(self.admin)
+
+    def add_applications(self, count):
+        job = self.create_job()
+        for i in range(count):
+            JobApplication.objects.create(
+                job=job,
+                applicant=CustomUser.objects.create_user(
+                    username=f"candidat{job.pk}-{i}", password="testpass123"
+                ),
+                status=application_statuses.get(ApplicationStatus.PENDING),
+                cover_letter="Motivation",
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelists_query_count_does_not_grow_with_rows(self):
+        for name in ("jobs_joboffer", "jobs_jobapplication"):
+            url = reverse(f"admin:{name}_changelist")
+            self.add_applications(2)
+            self.client.get(url)
+            queries = self.count_queries(url)
+            self.add_applications(5)
+            self.assertEqual(self.count_queries(url), queries, name)
+
+    def test_search_and_expire_action(self):
+        python = self.create_job(title="Développeur Python")
+        self.create_job(title="Comptable")
+        url = reverse("admin:jobs_joboffer_changelist")
+
+        response = self.client.get(url, {"q": "python"})
+        self.assertEqual(list(response.context["cl"].result_list), [python])
+
+        response = self.client.post(
+            url, {"action": "expire_offers", "_selected_action": [python.pk]}
+        )
+        self.assertEqual(response.status_code, 302)
+        python.refresh_from_db()
+        self.assertEqual(python.status.name, JobStatus.EXPIRED)
+        self.assertEqual(JobOffer.objects.filter(status=self.active).count(), 1)
+
+    def test_change_form_rejects_salary_out_of_column_range(self):
+        job = self.create_job()
+        url = reverse("admin:jobs_joboffer_change", args=[job.pk])
+        data = {
+            "title": job.title,
+            "description": job.description,
+            "company": job.company,
+            "location": job.location,
+            "publisher": self.recruiter.pk,
+            "status": self.active.pk,
+            "expires_at_0": "2099-01-01",
+            "expires_at_1": "12:00:00",
+            "salary_range": "99999999999",
+        }
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("salary_range", response.context["adminform"].form.errors)
+
+        response = self.client.post(url, {**data, "salary_range": "45k-55k"})
+        self.assertEqual(response.status_code, 302)
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min, job.salary_max), (45000, 55000))
+
+
+class BenchmarkMeasureTests(TestCase):
+    def test_reports_query_counts_of_every_measured_run(self):
+        stdout = StringIO()
+
+        def run(i):
+            for _ in range(i):
+                JobOffer.objects.exists()
+
+        result = BenchmarkCommand(stdout=stdout).measure("cas", run, repeat=3)
+
+        # Passage 0 (échauffement) exclu : 1, 2 puis 3 requêtes
+        self.assertEqual((result["queries_min"], result["queries"]), (1, 3))
+        self.assertIn("requêtes=1-3", stdout.getvalue())
+
+
+class CreateTestDataTests(TestCase):
+    def test_generates_requested_volumes_and_derived_data(self):
+        call_command(
+            "create_test_data",
+            users=30,
+            recruiters=3,
+            jobs=40,
+            applications=120,
+            batch_size=25,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(CustomUser.objects.filter(is_recruiter=True).count(), 3)
+        self.assertEqual(JobOffer.objects.count(), 40)
+        self.assertEqual(JobApplication.objects.count(), 120)
+        job = JobOffer.objects.exclude(salary_range="").first()
+        self.assertIsNotNone(job.salary_min)
+        counted = JobApplication.objects.exclude(status__name="Cancelled").count()
+        self.assertEqual(
+            JobOffer.objects.aggregate(total=Sum("applications_count"))["total"],
+            counted,
+        )
+        self.assertTrue(LocationFacet.locations().exists())
+        # Dates de publication étalées, chacune avant l'expiration
+        oldest = JobOffer.objects.order_by("created_at").first().created_at
+        self.assertLess(oldest, timezone.now() - timedelta(days=7))
+        self.assertFalse(
+            JobOffer.objects.filter(created_at__gte=F("expires_at")).exists()
+        )
+
+
+class ListingCacheTests(JobOfferTestCase):
+    @override_settings(JOB_LISTING_CACHE_BACKGROUND=False)
+    def test_offer_changes_invalidate_cached_pages(self):
+        first = self.create_job(title="Développeur Python")
+        self.client.force_login(self.recruiter)
+        url = reverse("jobs:available_jobs")
+        self.assertEqual(list(self.client.get(url).context["jobs"]), [first])
+
+        second = self.create_job(title="Comptable")
+
+        self.assertEqual(list(self.client.get(url).context["jobs"]), [second, first])
+        # Filtres équivalents : même entrée
+        self.assertEqual(
+            listing_cache_key("available_jobs", normalize_filters({"q": " Python"})),
+            listing_cache_key("available_jobs", normalize_filters({"q": "python "})),
+        )
+
+    def test_equivalent_filters_do_not_poison_the_cache(self):
+        gitega = self.create_job(location="Gitega")
+        bujumbura = self.create_job(location="Bujumbura")
+        self.client.force_login(self.recruiter)
+
+        url = reverse("jobs:available_jobs")
+
+        # Normalisées comme l'absence de filtre ou location=gitega
+        response = self.client.get(url, {"location": "tous les lieux"})
+        self.assertEqual(len(response.context["jobs"]), 2)
+        response = self.client.get(url, {"location": " Gitega", "max_salary": " "})
+        self.assertEqual(list(response.context["jobs"]), [gitega])
+
+        response = self.client.get(url)
+        self.assertEqual(list(response.context["jobs"]), [bujumbura, gitega])
+        self.assertEqual(
+            [item["count"] for item in response.context["facets"]["location"]], [1, 1]
+        )
+        response = self.client.get(url, {"location": "gitega"})
+        self.assertEqual(list(response.context["jobs"]), [gitega])
+
+    def test_new_version_is_a_miss(self):
+        key = "jobs:page:test"
+        self.assertEqual(cached_listing(key, lambda: "v1"), "v1")
+        bump_offers_version()
+
+        self.assertEqual(cached_listing(key, lambda: "v2"), "v2")
+
+    def test_stale_entry_is_served_while_revalidating(self):
+        key = "jobs:page:test"
+        self.assertEqual(cached_listing(key, lambda: "v1"), "v1")
+        # Même version, délai JOB_LISTING_CACHE_TIMEOUT écoulé
+        entry = cache.get(key)
+        cache.set(key, {**entry, "fresh_until": time.time() - 1})
+
+        self.assertEqual(cached_listing(key, lambda: "v2"), "v1")
+
+        # Le recalcul se fait dans un thread
+        deadline = time.monotonic() + 5
+        while cache.get(key)["data"] != "v2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cached_listing(key, lambda: "v3"), "v2")
+
+    def test_cold_miss_does_not_release_a_background_lock(self):
+        key = "jobs:page:test"
+        # Verrou tenu par le recalcul en arrière-plan d'un autre worker
+        cache.add(f"{key}:lock", True)
+
+        self.assertEqual(cached_listing(key, lambda: "v1"), "v1")
+
+        self.assertTrue(cache.get(f"{key}:lock"))
+
+
+class ProdSettingsTests(SimpleTestCase):
+    def test_prod_requires_a_shared_cache(self):
+        # Sans cache partagé, une invalidation n'atteint pas les autres workers
+        environ = {k: v for k, v in os.environ.items() if k != "REDIS_URL"}
+        with mock.patch.dict(os.environ, environ, clear=True), mock.patch.dict(
+            sys.modules
+        ):
+            sys.modules.pop("job_portal.settings.prod", None)
+            with self.assertRaises(ImproperlyConfigured):
+                importlib.import_module("job_portal.settings.prod")
+
+        with mock.patch.dict(
+            os.environ, {"REDIS_URL": "redis://cache:6379/0"}
+        ), mock.patch.dict(sys.modules):
+            sys.modules.pop("job_portal.settings.prod", None)
+            prod = importlib.import_module("job_portal.settings.prod")
+        self.assertEqual(
+            prod.CACHES["default"]["BACKEND"],
+            "django.core.cache.backends.redis.RedisCache",
+        )
+
+
+class AsyncViewTests(JobOfferTestCase):
+    async def test_async_views_render_under_async_client(self):
+        job = await sync_to_async(self.create_job)(title="Développeur Python")
+        candidate = await CustomUser.objects.acreate(username="candidat")
+        await self.async_client.aforce_login(candidate)
+
+        response = await self.async_client.get(
+            reverse("jobs:available_jobs"), {"q": "python"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["jobs"]), [job])
+        self.assertEqual(response.context["locations"], ["Bujumbura"])
+
+        response = await self.async_client.get(
+            reverse("jobs:job_detail", args=[job.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["has_applied"])
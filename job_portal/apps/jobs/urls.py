@@ -20,6 +20,11 @@ urlpatterns = [
         views.manage_applications,
         name="manage_applications_by_job",
     ),
+    path(
+        "applications/bulk-status/",
+        views.bulk_update_application_status,
+        name="bulk_update_application_status",
+    ),
     path(
         "application/<int:application_id>/update/",
         views.update_application_status,
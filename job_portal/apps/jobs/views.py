@@ -1,98 +1,86 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 from django.utils import timezone
-from django.db.models import Q
 
-from .models import JobOffer, JobApplication, JobStatus, ApplicationStatus
-from .forms import JobOfferForm, JobApplicationForm, ApplicationStatusForm
 from apps.accounts.models import CustomUser
-from django.core.paginator import Paginator
+from job_portal.throttling import search_scope, throttle
+
+from .applying import (
+    ALREADY_APPLIED,
+    ApplicationRefused,
+    check_eligibility,
+    offers_for_applicant,
+    submit_application,
+)
+from .caching import acached_listing, cached_listing, listing_cache_key
+from .facets import acached_facet_counts, filter_offers, normalize_filters
+from .forms import ApplicationStatusForm, JobApplicationForm, JobOfferForm
+from .models import JobApplication, JobOffer, JobStatus, LocationFacet
+from .pagination import KeysetPaginator
+from .registry import application_statuses, job_statuses
 
 
 @login_required
-def available_jobs(request):
-    jobs = JobOffer.objects.filter(status__name="active")
+@throttle(search_scope)
+async def available_jobs(request):
+    # Vue asynchrone : sous ASGI, l'attente de la base ne bloque pas un
+    # worker. Le template lit request.user, résolu ici sans accès synchrone
+    request.user = await request.auser()
+
+    # Filtres normalisés : la même forme sert à la requête et aux clés de
+    # cache des facettes et des pages
+    filters = normalize_filters(request.GET)
+
+    # Index (status, expires_at) ; expires_at couvre les offres échues
+    # depuis le dernier passage de expire_job_offers
+    jobs = filter_offers(
+        JobOffer.objects.filter(
+            status_id=await job_statuses.aid(JobStatus.ACTIVE),
+            expires_at__gt=timezone.now(),
+        ).select_related("publisher"),
+        filters,
+    )
 
-    # Recherche par mot-clé
-    query = request.GET.get("q", "")
-    if query:
-        jobs = jobs.filter(
-            Q(title__icontains=query)
-            | Q(company__icontains=query)
-            | Q(description__icontains=query)
-        )
+    if "q" in filters:
+        # Les offres les plus pertinentes d'abord
+        ordering = ("-search_rank", "-created_at", "-id")
+    else:
+        ordering = ("-created_at", "-id")
+
+    # Comptes par lieu, entreprise, date et salaire pour le filtre courant
+    facets = await acached_facet_counts(jobs, "available_jobs", filters)
+
+    # Pagination par curseur, page mise en cache par filtre normalisé
+    cursor = request.GET.get("cursor")
+    paginator = KeysetPaginator(jobs, ordering, per_page=10)
+    jobs = await acached_listing(
+        listing_cache_key("available_jobs", filters, cursor=cursor),
+        lambda: paginator.aget_page(cursor),
+        lambda: paginator.get_page(cursor),
+    )
 
-    # Filtrage par localisation
-    location = request.GET.get("location", "")
-    if location and location != "Tous les lieux":
-        jobs = jobs.filter(
-            location__iexact=location
-        )  # Utilisation de iexact pour une correspondance exacte insensible à la casse
+    # Lieux ayant des offres actives (table de facettes précalculée)
+    locations = [location async for location in LocationFacet.locations()]
 
-    # Filtrage par salaire
-    try:
-        min_salary = request.GET.get("min_salary")
-        if min_salary and min_salary.isdigit():
-            min_salary = int(min_salary)
-            jobs = jobs.filter(salary_range__gte=min_salary)
-
-        max_salary = request.GET.get("max_salary")
-        if max_salary and max_salary.isdigit():
-            max_salary = int(max_salary)
-            jobs = jobs.filter(salary_range__lte=max_salary)
-    except ValueError:
-        min_salary = ""
-        max_salary = ""
-
-    # Filtrage par date
+    # Préparation du contexte avec les filtres saisis
+    query = request.GET.get("q", "")
+    location = request.GET.get("location", "")
+    min_salary = request.GET.get("min_salary")
+    max_salary = request.GET.get("max_salary")
     date_filter = request.GET.get("date_filter")
-    if date_filter:
-        today = timezone.now()
-        if date_filter == "today":
-            jobs = jobs.filter(created_at__date=today.date())
-        elif date_filter == "week":
-            week_ago = today - timezone.timedelta(days=7)
-            jobs = jobs.filter(created_at__gte=week_ago)
-        elif date_filter == "month":
-            month_ago = today - timezone.timedelta(days=30)
-            jobs = jobs.filter(created_at__gte=month_ago)
-
-    # Filtrage par date d'expiration
-    jobs = jobs.filter(
-        Q(expires_at__gt=timezone.now()) | Q(expires_at__isnull=True)
-    ).order_by("-created_at")
-
-    # Debug des filtres
-    print(f"Query: {jobs.query}")  # Affiche la requête SQL générée
-    print(f"Nombre de résultats: {jobs.count()}")  # Affiche le nombre de résultats
-
-    # Pagination
-    paginator = Paginator(jobs, 10)
-    page = request.GET.get("page")
-    jobs = paginator.get_page(page)
-
-    # Récupération des locations uniques pour le filtre
-    locations = JobOffer.objects.values_list("location", flat=True).distinct()
-
-    # Préparation du contexte avec les filtres actifs
     context = {
         "jobs": jobs,
+        "facets": facets,
         "locations": locations,
         "query": query,
         "location": location,
         "min_salary": min_salary,
         "max_salary": max_salary,
         "date_filter": date_filter,
-        "active_filters": any(
-            [
-                query,
-                location,
-                request.GET.get("min_salary"),
-                request.GET.get("max_salary"),
-                date_filter,
-            ]
-        ),
+        "active_filters": any([query, location, min_salary, max_salary, date_filter]),
     }
 
     return render(request, "jobs/available_jobs.html", context)
@@ -117,7 +105,7 @@ def job_create(request):
         if form.is_valid():
             job = form.save(commit=False)
             job.publisher = request.user
-            job.status, _ = JobStatus.objects.get_or_create(name="active")
+            job.status = job_statuses.get(JobStatus.ACTIVE)
             job.save()
             messages.success(request, "L'offre d'emploi a été créée avec succès.")
             return redirect("jobs:my_jobs")
@@ -160,37 +148,23 @@ def job_edit(request, job_id):
 
 
 @login_required
+@throttle("apply", methods=("POST",))
 def apply_to_job(request, job_id):
-    if request.user.is_recruiter:
-        messages.error(
-            request, "Les recruteurs ne peuvent pas postuler aux offres d'emploi."
-        )
-        return redirect("jobs:available_jobs")
-
-    job = get_object_or_404(JobOffer, id=job_id)
-
-    if job.publisher == request.user:
-        messages.error(request, "Vous ne pouvez pas postuler à votre propre offre.")
-        return redirect("jobs:available_jobs")
-
-    if job.is_expired or job.status.name != "active":
-        messages.error(request, "Cette offre n'est plus disponible.")
-        return redirect("jobs:available_jobs")
-
-    if JobApplication.objects.filter(job=job, applicant=request.user).exists():
-        messages.warning(request, "Vous avez déjà postulé à cette offre.")
-        return redirect("jobs:job_detail", job_id=job.id)
+    # Une requête pour l'offre et l'éligibilité, une insertion pour la
+    # candidature (voir apps/jobs/applying.py)
+    job = get_object_or_404(offers_for_applicant(request.user), id=job_id)
+    try:
+        check_eligibility(job, request.user)
+    except ApplicationRefused as refusal:
+        return application_refused(request, job, refusal)
 
     if request.method == "POST":
         form = JobApplicationForm(request.POST, request.FILES)
         if form.is_valid():
-            application = form.save(commit=False)
-            application.job = job
-            application.applicant = request.user
-            application.status, _ = ApplicationStatus.objects.get_or_create(
-                name="Pending"
-            )
-            application.save()
+            try:
+                submit_application(job, request.user, form.cleaned_data["cover_letter"])
+            except ApplicationRefused as refusal:
+                return application_refused(request, job, refusal)
             messages.success(request, "Votre candidature a été envoyée avec succès!")
             return redirect("jobs:my_applications")
 
@@ -199,12 +173,24 @@ def apply_to_job(request, job_id):
     )
 
 
+def application_refused(request, job, refusal):
+    if refusal.reason == ALREADY_APPLIED:
+        messages.warning(request, refusal.message)
+        return redirect("jobs:job_detail", job_id=job.id)
+    messages.error(request, refusal.message)
+    return redirect("jobs:available_jobs")
+
+
 @login_required
 def my_applications(request):
     query = request.GET.get("q", "")
-    applications = JobApplication.objects.filter(
-        Q(job__title__icontains=query), applicant=request.user
-    ).order_by("-applied_at")
+    applications = (
+        JobApplication.objects.filter(
+            Q(job__title__icontains=query), applicant=request.user
+        )
+        .select_related("job", "status")
+        .order_by("-applied_at")
+    )
     return render(
         request,
         "jobs/my_applications.html",
@@ -215,7 +201,9 @@ def my_applications(request):
 @login_required
 def job_applications(request, job_id):
     job = get_object_or_404(JobOffer, id=job_id, publisher=request.user)
-    applications = job.applications.all().order_by("-applied_at")
+    applications = job.applications.select_related("applicant", "status").order_by(
+        "-applied_at"
+    )
     return render(
         request,
         "jobs/job_applications.html",
@@ -276,21 +264,24 @@ def job_delete(request, job_id):
 
 
 @login_required
-def job_detail(request, job_id):
-    job = get_object_or_404(JobOffer, id=job_id)
+async def job_detail(request, job_id):
+    request.user = await request.auser()
+    job = await aget_object_or_404(
+        JobOffer.objects.select_related("publisher"), id=job_id
+    )
     has_applied = False
 
     if request.user.is_authenticated and not request.user.is_recruiter:
-        has_applied = JobApplication.objects.filter(
-            job=job, applicant=request.user
-        ).exists()
+        has_applied = await JobApplication.objects.filter(
+            job=job, applicant_id=request.user.pk
+        ).aexists()
 
     context = {
         "job": job,
         "has_applied": has_applied,
-        "total_applications": job.applications.count(),
-        "is_owner": job.publisher == request.user,
-        "can_edit": request.user.is_staff or job.publisher == request.user,
+        "total_applications": job.applications_count,
+        "is_owner": job.publisher_id == request.user.pk,
+        "can_edit": request.user.is_staff or job.publisher_id == request.user.pk,
     }
 
     return render(request, "jobs/job_detail.html", context)
@@ -312,24 +303,28 @@ def manage_applications(request, job_id=None):
     else:
         applications = JobApplication.objects.filter(job__publisher=request.user)
         context = {}
+    applications = applications.select_related("job", "applicant", "status")
 
     # Ajout du filtre par statut
     status_filter = request.GET.get("status")
     if status_filter:
-        applications = applications.filter(
-            status__name=status_filter
-        )  # Filtrer par le nom du statut
-
-    # Pagination
-    paginator = Paginator(applications, 10)
-    page = request.GET.get("page")
-    applications = paginator.get_page(page)
+        # Filtrer par le nom du statut, résolu sans jointure
+        status = application_statuses.get(status_filter, create=False)
+        if status is None:
+            applications = applications.none()
+        else:
+            applications = applications.filter(status_id=status.pk)
+
+    # Pagination par curseur
+    applications = KeysetPaginator(
+        applications, ("-applied_at", "-id"), per_page=10
+    ).get_page(request.GET.get("cursor"))
 
     context.update(
         {
             "applications": applications,
             "jobs": jobs,
-            "STATUS_CHOICES": ApplicationStatus.objects.all(),  # Récupérer tous les choix de statut
+            "STATUS_CHOICES": application_statuses.all(),
             "selected_status": status_filter,  # Pour garder le filtre sélectionné
         }
     )
@@ -344,7 +339,9 @@ def update_application_status(request, application_id):
         return redirect("jobs:available_jobs")
 
     application = get_object_or_404(
-        JobApplication, id=application_id, job__publisher=request.user
+        JobApplication.objects.select_related("job", "applicant"),
+        id=application_id,
+        job__publisher=request.user,
     )
 
     if request.method == "POST":
@@ -359,6 +356,34 @@ def update_application_status(request, application_id):
     return redirect("jobs:manage_applications")
 
 
+@login_required
+def bulk_update_application_status(request):
+    if not request.user.is_recruiter:
+        messages.error(request, "Accès non autorisé.")
+        return redirect("jobs:available_jobs")
+
+    if request.method == "POST":
+        status = application_statuses.get(request.POST.get("status", ""), create=False)
+        ids = [
+            int(pk) for pk in request.POST.getlist("application_ids") if pk.isdigit()
+        ]
+        if status is None or not ids:
+            messages.error(
+                request, "Sélectionnez au moins une candidature et un statut."
+            )
+        else:
+            notes = request.POST.get("notes") or None
+            results = JobApplication.objects.filter(
+                job__publisher=request.user
+            ).bulk_set_status(ids, status, notes, changed_by=request.user)
+            updated = sum(result == "updated" for result in results.values())
+            messages.success(
+                request, f"{updated} candidature(s) passée(s) au statut {status.name}."
+            )
+
+    return redirect("jobs:manage_applications")
+
+
 @login_required
 def view_application(request, application_id):
     if not request.user.is_recruiter:
@@ -378,40 +403,19 @@ def view_application(request, application_id):
 
 
 def job_list(request):
-    jobs = JobOffer.objects.filter(status="active", expires_at__gt=timezone.now())
-
-    # Recherche par mot-clé
-    query = request.GET.get("q")
-    if query:
-        jobs = jobs.filter(
-            Q(title__icontains=query)
-            | Q(description__icontains=query)
-            | Q(company__icontains=query)
-        )
-
-    # Filtrage par localisation
-    location = request.GET.get("location")
-    if location:
-        jobs = jobs.filter(location__icontains=location)
-
-    # Filtrage par fourchette de salaire
-    min_salary = request.GET.get("min_salary")
-    max_salary = request.GET.get("max_salary")
-    if min_salary:
-        jobs = jobs.filter(salary_range__gte=min_salary)
-    if max_salary:
-        jobs = jobs.filter(salary_range__lte=max_salary)
+    # Requête et clé de cache construites à partir des mêmes filtres
+    filters = normalize_filters(request.GET)
+    jobs = filter_offers(
+        JobOffer.objects.filter(
+            status_id=job_statuses.id(JobStatus.ACTIVE),
+            expires_at__gt=timezone.now(),
+        ),
+        filters,
+        location_lookup="icontains",
+    )
+    if "q" in filters:
+        jobs = jobs.order_by("-search_rank", "-created_at")
 
-    # Filtrage par date
-    date_filter = request.GET.get("date_filter")
-    if date_filter:
-        today = timezone.now()
-        if date_filter == "today":
-            jobs = jobs.filter(created_at__date=today.date())
-        elif date_filter == "week":
-            jobs = jobs.filter(created_at__gte=today - timezone.timedelta(days=7))
-        elif date_filter == "month":
-            jobs = jobs.filter(created_at__gte=today - timezone.timedelta(days=30))
     # Tri
     sort_by = request.GET.get("sort")
     if sort_by == "date_desc":
@@ -419,25 +423,38 @@ def job_list(request):
     elif sort_by == "date_asc":
         jobs = jobs.order_by("created_at")
     elif sort_by == "salary_desc":
-        jobs = jobs.order_by("-salary_range")
+        jobs = jobs.order_by(F("salary_min").desc(nulls_last=True), "-created_at")
     elif sort_by == "salary_asc":
-        jobs = jobs.order_by("salary_range")
-
-    # Pagination
-    paginator = Paginator(jobs, 10)
-    page = request.GET.get("page")
-    jobs = paginator.get_page(page)
+        jobs = jobs.order_by(F("salary_min").asc(nulls_last=True), "-created_at")
+
+    # Pagination, page mise en cache par filtre normalisé
+    def get_page():
+        page = Paginator(jobs, 10).get_page(request.GET.get("page"))
+        return list(page.object_list), page.number, page.paginator.count
+
+    object_list, number, count = cached_listing(
+        listing_cache_key(
+            "job_list",
+            filters,
+            sort=sort_by,
+            page=request.GET.get("page"),
+        ),
+        get_page,
+    )
+    # Page reconstruite sans requête COUNT
+    jobs = Paginator(range(count), 10).get_page(number)
+    jobs.object_list = object_list
 
-    # Récupérer les locations uniques pour le filtre
-    locations = JobOffer.objects.values_list("location", flat=True).distinct()
+    # Lieux ayant des offres actives (table de facettes précalculée)
+    locations = LocationFacet.locations()
 
     context = {
         "jobs": jobs,
-        "query": query,
-        "location": location,
-        "min_salary": min_salary,
-        "max_salary": max_salary,
-        "date_filter": date_filter,
+        "query": request.GET.get("q"),
+        "location": request.GET.get("location"),
+        "min_salary": request.GET.get("min_salary"),
+        "max_salary": request.GET.get("max_salary"),
+        "date_filter": request.GET.get("date_filter"),
         "sort_by": sort_by,
         "locations": locations,
     }
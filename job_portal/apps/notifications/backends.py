@@ -0,0 +1,25 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import OutboxEmail
+from .outbox import serialize_message
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """
+    Enregistre les messages dans ``OutboxEmail`` au lieu de les envoyer
+    (voir apps/notifications/outbox.py) : aucune connexion SMTP pendant la
+    requête.
+    """
+
+    def send_messages(self, email_messages):
+        emails = [
+            OutboxEmail(
+                subject=message.subject[:255],
+                recipients=", ".join(message.recipients()),
+                message=serialize_message(message),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxEmail.objects.bulk_create(emails)
+        return len(emails)
@@ -0,0 +1,58 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.notifications.outbox import deliver_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Envoie les courriels en attente de la table d'envoi, par lots sur une "
+        "seule connexion (une fois, ou en continu avec --loop)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help="Nombre de courriels réservés par lot",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Relève la table toutes les OUTBOX_POLL_INTERVAL secondes",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            try:
+                total = deliver_outbox(options["batch_size"], on_batch=self.report)
+            except Exception:
+                # Serveur injoignable : les messages restent en attente
+                if not options["loop"]:
+                    raise
+                logger.exception("Échec de l'envoi des courriels")
+            else:
+                if total or not options["loop"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"{total} courriels envoyés "
+                            f"({time.perf_counter() - start:.2f}s)"
+                        )
+                    )
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(settings.OUTBOX_POLL_INTERVAL)
+
+    def report(self, sent, retried, failed):
+        self.stdout.write(
+            f"Lot : {sent} envoyés, {retried} reprogrammés, {failed} abandonnés"
+        )
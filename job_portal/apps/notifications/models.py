@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEmail(models.Model):
+    """
+    Courriel écrit par ``OutboxEmailBackend`` dans la transaction de la
+    requête, puis envoyé par "manage.py send_outbox".
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "En attente"),
+        (SENT, "Envoyé"),
+        (FAILED, "Échec"),
+    ]
+
+    subject = models.CharField(max_length=255, verbose_name="Sujet")
+    recipients = models.TextField(verbose_name="Destinataires")
+    # Champs de l'EmailMessage (voir apps/notifications/outbox.py)
+    message = models.JSONField(verbose_name="Message")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="Statut"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    # Prochain envoi possible : après un échec, ou à l'échéance du lot d'un
+    # worker interrompu
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Prochaine tentative"
+    )
+    claimed_by = models.CharField(max_length=32, blank=True, verbose_name="Lot")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Date de création"
+    )
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Date d'envoi")
+
+    class Meta:
+        indexes = [
+            # Lots de courriels à envoyer
+            models.Index(
+                fields=["status", "next_attempt_at"], name="notif_outbox_due_idx"
+            ),
+            models.Index(fields=["claimed_by"], name="notif_outbox_claim_idx"),
+        ]
+        verbose_name = "Courriel en attente"
+        verbose_name_plural = "Courriels en attente"
+
+    def __str__(self):
+        return f"{self.subject} ({self.recipients})"
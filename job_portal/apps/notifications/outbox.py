@@ -0,0 +1,178 @@
+"""
+Envoi différé des courriels.
+
+``OutboxEmailBackend`` (EMAIL_BACKEND) enregistre chaque message dans
+``OutboxEmail`` : la requête ne fait qu'un INSERT, annulé avec sa transaction.
+``deliver_outbox`` (commande "send_outbox") envoie ensuite les messages dus
+par lots, sur une seule connexion du backend ``OUTBOX_EMAIL_BACKEND``, et
+reprogramme ceux qui échouent avec un délai doublé à chaque tentative.
+
+Un lot est réservé par un UPDATE conditionnel (``claimed_by``), ce qui
+permet plusieurs workers. Un worker interrompu en plein lot laisse ses
+messages revenir après ``OUTBOX_CLAIM_TIMEOUT`` : l'envoi est "au moins une
+fois".
+"""
+
+import base64
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_message(message):
+    """Champs JSON d'un EmailMessage ; pièces jointes en base64."""
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise TypeError("Pièce jointe MIME non prise en charge par l'outbox")
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append(
+            [filename, base64.b64encode(content).decode("ascii"), mimetype]
+        )
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "from_email": message.from_email,
+        "to": list(message.to),
+        "cc": list(message.cc),
+        "bcc": list(message.bcc),
+        "reply_to": list(message.reply_to),
+        "headers": dict(message.extra_headers),
+        "content_subtype": message.content_subtype,
+        "alternatives": [
+            [content, mimetype]
+            for content, mimetype in getattr(message, "alternatives", [])
+        ],
+        "attachments": attachments,
+    }
+
+
+def deserialize_message(data, connection=None):
+    message = EmailMultiAlternatives(
+        subject=data["subject"],
+        body=data["body"],
+        from_email=data["from_email"],
+        to=data["to"],
+        cc=data["cc"],
+        bcc=data["bcc"],
+        reply_to=data["reply_to"],
+        headers=data["headers"],
+        alternatives=[tuple(alternative) for alternative in data["alternatives"]],
+        connection=connection,
+    )
+    message.content_subtype = data["content_subtype"]
+    for filename, content, mimetype in data["attachments"]:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+def claim_batch(size, now=None):
+    """Réserve jusqu'à ``size`` messages dus et les renvoie."""
+    now = now or timezone.now()
+    token = uuid.uuid4().hex
+    due = {"status": OutboxEmail.PENDING, "next_attempt_at__lte": now}
+    ids = list(
+        OutboxEmail.objects.filter(**due)
+        .order_by("next_attempt_at", "id")
+        .values_list("id", flat=True)[:size]
+    )
+    if not ids:
+        return []
+    # Conditions répétées : un autre worker a pu réserver une partie du lot
+    OutboxEmail.objects.filter(id__in=ids, **due).update(
+        claimed_by=token,
+        next_attempt_at=now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT),
+    )
+    return list(OutboxEmail.objects.filter(claimed_by=token).order_by("id"))
+
+
+def _reset(connection):
+    """Ferme une connexion peut-être rompue ; la suivante est rouverte."""
+    try:
+        connection.close()
+    except Exception:
+        connection.connection = None
+
+
+def send_batch(connection, emails):
+    """
+    Envoie ``emails`` sur ``connection`` un par un, pour connaître le sort de
+    chacun, puis enregistre les résultats en un UPDATE groupé. Renvoie
+    ``(envoyés, reprogrammés, abandonnés)``.
+
+    Si la connexion ne peut pas être ouverte, les messages restants sont
+    rendus sans compter de tentative et l'exception est propagée.
+    """
+    counts = {OutboxEmail.SENT: 0, OutboxEmail.PENDING: 0, OutboxEmail.FAILED: 0}
+    done = []
+    try:
+        for email in emails:
+            # Sans effet si la connexion est déjà ouverte
+            connection.open()
+            email.attempts += 1
+            try:
+                connection.send_messages([deserialize_message(email.message)])
+            except Exception as exc:
+                _reset(connection)
+                email.last_error = f"{type(exc).__name__}: {exc}"
+                if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    email.status = OutboxEmail.FAILED
+                    logger.error(
+                        "Courriel %s abandonné : %s", email.pk, email.last_error
+                    )
+                else:
+                    delay = settings.OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+                    email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+            else:
+                email.status = OutboxEmail.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+            counts[email.status] += 1
+            done.append(email)
+    finally:
+        OutboxEmail.objects.bulk_update(
+            done, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"]
+        )
+        if len(done) < len(emails):
+            OutboxEmail.objects.filter(
+                id__in=[email.pk for email in emails[len(done) :]]
+            ).update(
+                next_attempt_at=timezone.now()
+                + timedelta(seconds=settings.OUTBOX_RETRY_DELAY)
+            )
+    return (
+        counts[OutboxEmail.SENT],
+        counts[OutboxEmail.PENDING],
+        counts[OutboxEmail.FAILED],
+    )
+
+
+def deliver_outbox(batch_size=None, on_batch=None):
+    """
+    Envoie tous les messages dus, lot après lot, sur une même connexion
+    (rouverte seulement après un échec). ``on_batch(envoyés, reprogrammés,
+    abandonnés)`` est appelé après chaque lot. Renvoie le nombre de messages
+    envoyés.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    total = 0
+    try:
+        while emails := claim_batch(batch_size):
+            counts = send_batch(connection, emails)
+            total += counts[0]
+            if on_batch is not None:
+                on_batch(*counts)
+    finally:
+        _reset(connection)
+    return total
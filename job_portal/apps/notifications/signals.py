@@ -0,0 +1,43 @@
+from django.core.mail import EmailMessage, get_connection
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+
+from apps.jobs.models import JobApplication, application_status_changed
+from apps.jobs.registry import application_statuses
+
+
+@receiver(application_status_changed)
+def notify_applicants(sender, application_ids, changed_by=None, **kwargs):
+    """
+    Prévient chaque candidat du nouveau statut de sa candidature, sauf s'il
+    l'a changé lui-même (annulation).
+    """
+    applications = (
+        JobApplication.objects.filter(id__in=application_ids)
+        .exclude(applicant__email="")
+        .select_related("job", "applicant")
+    )
+    if changed_by is not None:
+        applications = applications.exclude(applicant_id=changed_by.pk)
+    messages = []
+    for application in applications:
+        context = {
+            "application": application,
+            "job": application.job,
+            "applicant": application.applicant,
+            "status": application_statuses.by_id(application.status_id),
+        }
+        messages.append(
+            EmailMessage(
+                subject=render_to_string(
+                    "notifications/application_status_subject.txt", context
+                ).strip(),
+                body=render_to_string(
+                    "notifications/application_status_email.txt", context
+                ),
+                to=[application.applicant.email],
+            )
+        )
+    if messages:
+        # Avec OutboxEmailBackend : un seul INSERT pour tout le lot
+        get_connection().send_messages(messages)
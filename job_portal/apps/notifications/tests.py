@@ -0,0 +1,215 @@
+import socketserver
+import threading
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import CustomUser
+from apps.jobs.models import ApplicationStatus, JobApplication, JobOffer, JobStatus
+from apps.jobs.registry import application_statuses
+from apps.notifications.models import OutboxEmail
+from apps.notifications.outbox import deliver_outbox
+
+OUTBOX_BACKEND = "apps.notifications.backends.OutboxEmailBackend"
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Serveur SMTP minimal : accepte tout et garde les messages reçus."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost")
+        data = None
+        while line := self.rfile.readline():
+            if data is not None:
+                if line == b".\r\n":
+                    self.server.messages.append(b"".join(data))
+                    data = None
+                    self.reply("250 OK")
+                else:
+                    data.append(line)
+                continue
+            verb = line[:4].upper()
+            if verb in (b"EHLO", b"HELO"):
+                self.reply("250 localhost")
+            elif verb == b"DATA":
+                data = []
+                self.reply("354 Fin des données par <CRLF>.<CRLF>")
+            elif verb == b"QUIT":
+                self.reply("221 Au revoir")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.smtp = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler)
+        self.smtp.daemon_threads = True
+        self.smtp.connections = 0
+        self.smtp.messages = []
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+        self.addCleanup(self.smtp.server_close)
+        self.addCleanup(self.smtp.shutdown)
+        self.enterContext(
+            override_settings(
+                EMAIL_BACKEND=OUTBOX_BACKEND,
+                OUTBOX_EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+                EMAIL_HOST="127.0.0.1",
+                EMAIL_PORT=self.smtp.server_address[1],
+                EMAIL_USE_TLS=False,
+                EMAIL_HOST_USER="",
+                EMAIL_HOST_PASSWORD="",
+            )
+        )
+
+    def queue(self, count):
+        messages = []
+        for i in range(count):
+            message = EmailMultiAlternatives(
+                f"Message {i}", "Bonjour", "portail@example.com", [f"c{i}@example.com"]
+            )
+            message.attach_alternative("<p>Bonjour</p>", "text/html")
+            messages.append(message)
+        return get_connection().send_messages(messages)
+
+    def test_messages_are_stored_then_sent_over_one_connection(self):
+        self.assertEqual(self.queue(5), 5)
+        self.assertEqual(OutboxEmail.objects.filter(status="pending").count(), 5)
+        self.assertEqual(self.smtp.messages, [])
+
+        self.assertEqual(deliver_outbox(batch_size=2), 5)
+
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(len(self.smtp.messages), 5)
+        self.assertIn(b"<p>Bonjour</p>", self.smtp.messages[0])
+        self.assertEqual(OutboxEmail.objects.filter(status="sent").count(), 5)
+        self.assertEqual(deliver_outbox(), 0)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2, OUTBOX_RETRY_DELAY=60)
+    def test_failures_are_retried_with_backoff_then_abandoned(self):
+        self.queue(1)
+        # Serveur arrêté : la connexion est refusée
+        self.smtp.shutdown()
+        self.smtp.server_close()
+
+        with self.assertRaises(ConnectionRefusedError):
+            deliver_outbox()
+        email = OutboxEmail.objects.get()
+        # Serveur injoignable : aucune tentative décomptée
+        self.assertEqual((email.status, email.attempts), ("pending", 0))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        # Refus du message lui-même : tentatives décomptées
+        with override_settings(
+            OUTBOX_EMAIL_BACKEND="apps.notifications.tests.RefusingBackend"
+        ):
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            deliver_outbox()
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ("pending", 1))
+            self.assertIn("Destinataire refusé", email.last_error)
+            self.assertGreater(
+                email.next_attempt_at, timezone.now() + timedelta(seconds=50)
+            )
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            with self.assertLogs("apps.notifications.outbox", "ERROR"):
+                deliver_outbox()
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ("failed", 2))
+
+
+class RefusingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ValueError("Destinataire refusé")
+
+
+class StatusNotificationTests(TestCase):
+    def setUp(self):
+        recruiter = CustomUser.objects.create_user(
+            username="recruteur", password="testpass123", is_recruiter=True
+        )
+        job = JobOffer.objects.create(
+            title="Comptable",
+            description="Comptabilité",
+            company="Banque Centrale",
+            location="Bujumbura",
+            publisher=recruiter,
+            status=JobStatus.objects.get_or_create(name="active")[0],
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+        self.applications = [
+            JobApplication.objects.create(
+                job=job,
+                applicant=CustomUser.objects.create_user(
+                    username=f"candidat{i}",
+                    email=f"candidat{i}@example.com" if i else "",
+                    password="testpass123",
+                ),
+                status=application_statuses.get(ApplicationStatus.PENDING),
+                cover_letter="Motivation",
+            )
+            for i in range(3)
+        ]
+
+    def test_status_changes_notify_applicants_with_an_email(self):
+        application = JobApplication.objects.get(pk=self.applications[1].pk)
+        application.notes = "Profil intéressant"
+        application.save()
+        self.assertEqual(mail.outbox, [])
+
+        application.status = application_statuses.get(ApplicationStatus.ACCEPTED)
+        application.save()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["candidat1@example.com"])
+        self.assertIn("Accepted", mail.outbox[0].subject)
+
+        # Le candidat sans adresse est ignoré ; un statut inchangé aussi
+        JobApplication.objects.bulk_set_status(
+            [application.pk for application in self.applications],
+            application_statuses.get(ApplicationStatus.ACCEPTED),
+        )
+        self.assertEqual(
+            [message.to for message in mail.outbox[1:]], [["candidat2@example.com"]]
+        )
+
+    def test_applicant_is_not_notified_of_their_own_cancellation(self):
+        client = APIClient()
+        client.force_authenticate(user=self.applications[1].applicant)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                reverse("api-application-cancel", args=[self.applications[1].pk])
+            )
+        self.assertEqual(response.status_code, 200)
+        # Décrément F() du compteur, sans recompter les candidatures de l'offre
+        self.assertFalse([q for q in queries if "COUNT(" in q["sql"]])
+        self.assertEqual(JobOffer.objects.get().applications_count, 2)
+        self.assertEqual(
+            JobApplication.objects.get(pk=self.applications[1].pk).status.name,
+            ApplicationStatus.CANCELLED,
+        )
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(EMAIL_BACKEND=OUTBOX_BACKEND)
+    def test_notifications_go_through_the_outbox(self):
+        JobApplication.objects.bulk_set_status(
+            [application.pk for application in self.applications],
+            application_statuses.get(ApplicationStatus.REJECTED),
+        )
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list("recipients", flat=True)),
+            ["candidat1@example.com", "candidat2@example.com"],
+        )
@@ -0,0 +1,174 @@
+"""
+Profilage par requête : nombre et durée des requêtes SQL, requêtes les plus
+lentes, temps de rendu des templates et temps total.
+
+Activé par ``PROFILING_ENABLED`` ; ``PROFILING_SAMPLE_RATE`` (0 à 1) fixe la
+part des requêtes profilées. Le temps de rendu est mesuré par le moteur de
+templates ``ProfilingDjangoTemplates`` (voir ``TEMPLATES``), seulement pour
+les requêtes profilées. Chaque profil est écrit en JSON sur le logger
+``job_portal.profiling`` et les plus lents récents sont consultables par le
+personnel sur ``/debug/slow-requests/`` (mémoire du processus seulement).
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger("job_portal.profiling")
+
+_current = ContextVar("profile", default=None)
+_recent = deque(maxlen=500)
+_recent_lock = threading.Lock()
+
+
+class ProfiledTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = _current.get()
+        if profile is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.render_time += time.perf_counter() - start
+
+
+class ProfilingDjangoTemplates(DjangoTemplates):
+    """
+    ``DjangoTemplates`` dont les templates ajoutent leur temps de rendu au
+    profil de la requête en cours, s'il y en a un.
+    """
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return ProfiledTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+class RequestProfile:
+    def __init__(self, request):
+        self.method = request.method
+        self.path = request.path
+        self.view = None
+        self.queries = []
+        self.render_time = 0.0
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # Enveloppe d'exécution SQL (connection.execute_wrapper)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - start, sql))
+
+    def as_dict(self):
+        slowest = sorted(self.queries, reverse=True)[: settings.PROFILING_SLOW_QUERIES]
+        return {
+            "method": self.method,
+            "path": self.path,
+            "view": self.view,
+            "duration_ms": round(self.duration * 1000, 2),
+            "query_count": len(self.queries),
+            "sql_ms": round(sum(duration for duration, sql in self.queries) * 1000, 2),
+            "render_ms": round(self.render_time * 1000, 2),
+            "slowest_queries": [
+                {"ms": round(duration * 1000, 2), "sql": sql}
+                for duration, sql in slowest
+            ],
+        }
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = RequestProfile(request)
+        token = _current.set(profile)
+        try:
+            with self.wrap_connections(profile):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, profile)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        profile = RequestProfile(request)
+        token = _current.set(profile)
+        try:
+            # Les connexions sont propres à chaque thread : envelopper celles
+            # du thread où sync_to_async exécute l'ORM de la requête
+            stack = await sync_to_async(self.wrap_connections)(profile)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        self.record(request, profile)
+        return response
+
+    def wrap_connections(self, profile):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(profile))
+        return stack
+
+    def record(self, request, profile):
+        profile.duration = time.perf_counter() - profile.start
+        if request.resolver_match is not None:
+            profile.view = request.resolver_match.view_name
+        data = profile.as_dict()
+        logger.info(json.dumps(data, ensure_ascii=False), extra={"profile": data})
+        with _recent_lock:
+            _recent.append(data)
+
+
+def slowest_recent_requests(limit=50):
+    with _recent_lock:
+        recent = list(_recent)
+    return sorted(recent, key=lambda data: data["duration_ms"], reverse=True)[:limit]
+
+
+@staff_member_required
+def slow_requests(request):
+    """Requêtes profilées les plus lentes parmi les plus récentes."""
+    limit = request.GET.get("limit", "")
+    limit = int(limit) if limit.isdigit() else 50
+    return JsonResponse({"requests": slowest_recent_requests(limit)})
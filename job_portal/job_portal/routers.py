@@ -0,0 +1,107 @@
+"""
+Lectures sur les réplicas, écritures sur le primaire.
+
+Les écritures vont toujours sur ``default``. Les lectures ne vont sur un
+alias de ``DATABASE_REPLICAS`` que pendant une requête HTTP sûre (GET, HEAD,
+OPTIONS) traitée par ``ReplicaMiddleware`` : partout ailleurs (requêtes
+d'écriture, commandes, threads, transactions ouvertes) tout reste sur le
+primaire.
+
+Après une requête d'écriture, le client reçoit un cookie qui le garde sur le
+primaire pendant ``DATABASE_PRIMARY_STICKINESS`` secondes : il relit ses
+propres écritures (candidature, offre, profil, session) malgré le retard de
+réplication.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_COOKIE = "primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Autorise (ou interdit) les lectures sur les réplicas dans le bloc."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or not _replica_reads.get()
+            # Une transaction ouverte relit ce qu'elle vient d'écrire
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Les réplicas contiennent les mêmes données que le primaire
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas reçoivent le schéma par réplication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def use_replicas(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        try:
+            return float(request.COOKIES.get(STICKY_COOKIE, 0)) < time.time()
+        except ValueError:
+            return True
+
+    def stick_to_primary(self, request, response):
+        if request.method not in SAFE_METHODS:
+            stickiness = settings.DATABASE_PRIMARY_STICKINESS
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(time.time() + stickiness),
+                max_age=stickiness,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_reads(self.use_replicas(request)):
+            response = self.get_response(request)
+        return self.stick_to_primary(request, response)
+
+    async def __acall__(self, request):
+        with replica_reads(self.use_replicas(request)):
+            response = await self.get_response(request)
+        return self.stick_to_primary(request, response)
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     "corsheaders",
     "apps.accounts",
     "apps.jobs",
+    "apps.notifications",
     "widget_tweaks",
     "drf_yasg",
     "django_filters",
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "job_portal.routers.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -37,13 +39,15 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "job_portal.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "job_portal.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, avec le temps de rendu des requêtes profilées
+        "BACKEND": "job_portal.profiling.ProfilingDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -88,15 +92,16 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.CustomUser"
 
 REST_FRAMEWORK = {
+    # Jeton Bearer d'abord : la session n'est chargée que sans en-tête JWT
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "apis.accounts.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_THROTTLE_CLASSES": ["job_portal.throttling.CostThrottle"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
 }
@@ -109,6 +114,10 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": "bujumburamwaro",
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Claims (rôles, ban_version) utilisés par ClaimsJWTAuthentication
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "apis.accounts.serializers.ClaimsTokenObtainPairSerializer"
+    ),
 }
 
 AUTHENTICATION_BACKENDS = [
@@ -119,3 +128,104 @@ AUTHENTICATION_BACKENDS = [
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "home"
 LOGIN_URL = "accounts:login"
+
+# Recherche plein texte sur les offres d'emploi (voir apps/jobs/search.py).
+# CONFIG est la configuration PostgreSQL des vecteurs stockés : après un
+# changement, lancer "manage.py rebuild_search_index" pour les recalculer
+JOB_SEARCH_BACKEND = "apps.jobs.search.DatabaseSearchBackend"
+JOB_SEARCH_CONFIG = "french"
+
+# Expiration des offres par lots (voir apps/jobs/expiry.py) : planifier
+# "manage.py expire_job_offers" avec cron, ou lancer un seul processus
+# "manage.py expire_job_offers --loop" qui balaie toutes les INTERVAL secondes
+JOB_EXPIRY_SWEEP_INTERVAL = 60
+JOB_EXPIRY_BATCH_SIZE = 1000
+
+# Durée de cache (secondes) des comptes par facette (voir apps/jobs/facets.py)
+JOB_FACETS_CACHE_TIMEOUT = 60
+
+# Cache des pages de listes d'offres (voir apps/jobs/caching.py) : fraîches
+# pendant TIMEOUT, puis servies périmées pendant STALE_TIMEOUT le temps d'un
+# recalcul en arrière-plan (synchrone si BACKGROUND est faux)
+JOB_LISTING_CACHE_TIMEOUT = 60
+JOB_LISTING_CACHE_STALE_TIMEOUT = 600
+JOB_LISTING_CACHE_BACKGROUND = True
+
+# Nombre maximum d'offres par envoi groupé (API jobs/bulk/)
+JOB_BULK_MAX_ROWS = 1000
+
+# Export des candidatures (voir apps/jobs/exports.py) : lignes lues par lots
+# de cette taille avec un curseur côté serveur
+JOB_EXPORT_CHUNK_SIZE = 2000
+
+# Cache par défaut : numéros de version des offres et des utilisateurs,
+# pages et facettes en cache, seaux de limitation de débit. LocMem est propre
+# à chaque processus et ne convient qu'à un seul worker : prod.py exige un
+# cache Redis partagé (REDIS_URL)
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+# Cache par processus des utilisateurs de session (voir
+# apps/accounts/caching.py) ; 0 désactive le cache. Ignoré si le cache par
+# défaut n'est pas partagé (LocMem hors prod) : un bannissement ou une
+# modification faite dans un worker ne serait pas vue des autres avant
+# TIMEOUT secondes
+USER_CACHE_SIZE = 1024
+USER_CACHE_TIMEOUT = 300
+# Durée de la copie en cache partagé du ban_version, vérifié à chaque
+# requête JWT ; sans cache partagé (hors prod) la colonne est relue à chaque
+# fois
+USER_BAN_CACHE_TIMEOUT = 60
+
+# Limitation de débit (voir job_portal/throttling.py) : seau de BURST jetons
+# par client, rechargé de RATE jetons par seconde ; coût de chaque portée
+THROTTLE_ENABLED = True
+THROTTLE_RATE = 1.0
+THROTTLE_BURST = 60
+# Nombre de mandataires de confiance devant l'application : le client est
+# identifié par REMOTE_ADDR, ou par l'entrée de X-Forwarded-For ajoutée par
+# le premier mandataire. Le reste de l'en-tête est fourni par le client
+THROTTLE_NUM_PROXIES = 0
+THROTTLE_COSTS = {
+    "default": 1,
+    "search": 3,
+    "apply": 5,
+    "login": 10,
+    "signup": 10,
+}
+
+# Réplicas en lecture (voir job_portal/routers.py) : alias de DATABASES lus
+# par les requêtes GET ; un client qui vient d'écrire reste sur le primaire
+# pendant STICKINESS secondes. Sans réplica, tout va sur "default"
+DATABASE_ROUTERS = ["job_portal.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = []
+DATABASE_PRIMARY_STICKINESS = 10
+
+# Courriels différés (voir apps/notifications/outbox.py) : EMAIL_BACKEND les
+# écrit dans la table d'envoi, "manage.py send_outbox --loop" les envoie avec
+# OUTBOX_EMAIL_BACKEND par lots sur une seule connexion. Un échec est retenté
+# après RETRY_DELAY secondes, doublées à chaque tentative, MAX_ATTEMPTS fois
+# au plus ; un lot réservé revient après CLAIM_TIMEOUT si le worker s'arrête
+EMAIL_BACKEND = "apps.notifications.backends.OutboxEmailBackend"
+OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_CLAIM_TIMEOUT = 300
+OUTBOX_POLL_INTERVAL = 5
+
+# Profilage des requêtes (voir job_portal/profiling.py), désactivé par défaut
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 1.0
+PROFILING_SLOW_QUERIES = 5
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "job_portal.profiling": {"handlers": ["console"], "level": "INFO"},
+        "apps.jobs": {"handlers": ["console"], "level": "INFO"},
+    },
+}
@@ -11,8 +11,11 @@ DATABASES = {
     }
 }
 
+JOB_SEARCH_BACKEND = "apps.jobs.search.SQLiteFTS5SearchBackend"
+
 ROOT_URLCONF = "job_portal.urls"
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Envoi réel par "manage.py send_outbox" (voir base.py)
+OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -0,0 +1,19 @@
+from .local import *
+
+# Deux fichiers SQLite jouent le primaire et le réplica. Le réplica n'est
+# pas répliqué en continu : "manage.py sync_sqlite_replica" le recopie depuis
+# le primaire, ce qui permet d'observer le retard de réplication.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.replica.sqlite3",
+        # En test, le réplica est la base de test du primaire
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+DATABASE_REPLICAS = ["replica"]
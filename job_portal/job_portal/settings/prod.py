@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 DEBUG = True
@@ -15,8 +17,28 @@ DATABASES = {
     }
 }
 
+JOB_SEARCH_BACKEND = "apps.jobs.search.PostgresSearchBackend"
+
+# Un répartiteur de charge devant gunicorn (voir THROTTLE_NUM_PROXIES)
+THROTTLE_NUM_PROXIES = 1
+
+# Cache partagé entre les workers, obligatoire : les numéros de version qui
+# invalident les pages en cache et les validateurs HTTP, le cache des
+# utilisateurs et les seaux de limitation de débit ne valent pour tous les
+# workers que si chacun lit et écrit le même cache
+if not os.environ.get("REDIS_URL"):
+    raise ImproperlyConfigured(
+        "REDIS_URL doit désigner le cache Redis partagé par les workers."
+    )
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+}
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Envoi réel par "manage.py send_outbox" (voir base.py)
+OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -0,0 +1,216 @@
+"""
+Limitation de débit par seaux à jetons, stockés dans le cache Django.
+
+Chaque client (utilisateur connecté, sinon adresse IP) dispose d'un seau de
+``THROTTLE_BURST`` jetons rechargé de ``THROTTLE_RATE`` jetons par seconde.
+Une requête consomme le coût de sa portée (``THROTTLE_COSTS``) : une
+connexion, qui calcule un hachage PBKDF2, coûte bien plus qu'une lecture.
+
+Les échecs de connexion sont aussi comptés par adresse et nom d'utilisateur
+(voir ``record_failed_login``) : un nom visé depuis une adresse est refusé
+une fois son seau vide, sans qu'un tiers puisse bloquer le compte depuis la
+sienne.
+
+La lecture puis l'écriture du seau ne sont pas atomiques : sous forte
+concurrence quelques requêtes de plus peuvent passer, ce qui suffit à
+empêcher une rafale d'épuiser les workers.
+"""
+
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.throttling import BaseThrottle
+
+
+def refill(bucket, cost, now):
+    """
+    Applique la recharge au seau ``(jetons, horodatage)`` puis retire
+    ``cost`` jetons. Renvoie ``(attente, seau à enregistrer ou None)``.
+    """
+    rate, burst = settings.THROTTLE_RATE, settings.THROTTLE_BURST
+    tokens, updated_at = bucket or (burst, now)
+    tokens = min(burst, tokens + (now - updated_at) * rate)
+    if tokens < cost:
+        return (cost - tokens) / rate, None
+    return 0, (tokens - cost, now)
+
+
+def bucket_timeout():
+    # Un seau absent est plein : inutile de le garder au-delà de sa recharge
+    return math.ceil(settings.THROTTLE_BURST / settings.THROTTLE_RATE)
+
+
+def consume(key, cost):
+    """
+    Retire ``cost`` jetons du seau ``key``. Renvoie 0 si la requête est
+    acceptée, sinon le nombre de secondes avant que le coût soit disponible.
+    """
+    wait, bucket = refill(cache.get(key), cost, time.time())
+    if bucket is not None:
+        cache.set(key, bucket, bucket_timeout())
+    return wait
+
+
+async def aconsume(key, cost):
+    wait, bucket = refill(await cache.aget(key), cost, time.time())
+    if bucket is not None:
+        await cache.aset(key, bucket, bucket_timeout())
+    return wait
+
+
+def search_scope(request):
+    params = getattr(request, "query_params", request.GET)
+    return "search" if params.get("q") else "default"
+
+
+def client_ip(request):
+    """
+    Adresse du client : ``REMOTE_ADDR``, ou derrière ``THROTTLE_NUM_PROXIES``
+    mandataires l'adresse ajoutée à X-Forwarded-For par le premier d'entre
+    eux. Les entrées plus à gauche viennent du client et sont ignorées.
+    """
+    num_proxies = settings.THROTTLE_NUM_PROXIES
+    if num_proxies:
+        addresses = [
+            address.strip()
+            for address in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+            if address.strip()
+        ]
+        if len(addresses) >= num_proxies:
+            return addresses[-num_proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def bucket_keys(request, user):
+    if user is not None and user.is_authenticated:
+        return [f"throttle:user:{user.pk}"]
+    return [f"throttle:ip:{client_ip(request)}"]
+
+
+def login_key(request, username):
+    return f"throttle:login:{client_ip(request)}:{username.strip().lower()}"
+
+
+def scope_cost(scope):
+    return settings.THROTTLE_COSTS.get(scope, settings.THROTTLE_COSTS["default"])
+
+
+def record_failed_login(request, username):
+    """Débite le seau des échecs de connexion de ``username`` pour ce client."""
+    if settings.THROTTLE_ENABLED and isinstance(username, str) and username:
+        consume(login_key(request, username), scope_cost("login"))
+
+
+def login_wait(bucket, scope):
+    # Seau des échecs lu sans être débité : une connexion réussie ne coûte rien
+    return refill(bucket, scope_cost(scope), time.time())[0]
+
+
+def check(request, scope, username=None):
+    """Débite les seaux du client pour ``scope`` ; renvoie l'attente ou 0."""
+    if not settings.THROTTLE_ENABLED:
+        return 0
+    keys = bucket_keys(request, getattr(request, "user", None))
+    wait = max(consume(key, scope_cost(scope)) for key in keys)
+    if username:
+        wait = max(wait, login_wait(cache.get(login_key(request, username)), scope))
+    return wait
+
+
+async def acheck(request, scope, username=None):
+    """Version asynchrone de ``check`` (utilisateur lu par ``request.auser``)."""
+    if not settings.THROTTLE_ENABLED:
+        return 0
+    keys = bucket_keys(request, await request.auser())
+    wait = max([await aconsume(key, scope_cost(scope)) for key in keys])
+    if username:
+        bucket = await cache.aget(login_key(request, username))
+        wait = max(wait, login_wait(bucket, scope))
+    return wait
+
+
+class CostThrottle(BaseThrottle):
+    """
+    Throttle DRF pondéré. La portée vient de ``scope``, sinon de
+    ``throttle_scopes[view.action]``, sinon de la présence d'une recherche.
+    """
+
+    scope = None
+
+    def get_scope(self, request, view):
+        if self.scope:
+            return self.scope
+        scopes = getattr(view, "throttle_scopes", {})
+        return scopes.get(getattr(view, "action", None)) or search_scope(request)
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        username = None
+        if scope == "login" and isinstance(request.data, dict):
+            username = request.data.get("username")
+        self.wait_seconds = check(
+            request, scope, username if isinstance(username, str) else None
+        )
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginThrottle(CostThrottle):
+    scope = "login"
+
+
+def throttled_response(wait):
+    response = HttpResponse(
+        f"Trop de requêtes, veuillez réessayer dans {math.ceil(wait)} secondes.",
+        status=429,
+        content_type="text/plain; charset=utf-8",
+    )
+    response["Retry-After"] = str(math.ceil(wait))
+    return response
+
+
+def throttle(scope, methods=None):
+    """
+    Équivalent de ``CostThrottle`` pour les vues HTML, synchrones ou
+    asynchrones : ``scope`` est un nom de portée ou une fonction
+    ``scope(request)`` ; seules les méthodes ``methods`` sont débitées si
+    elles sont données.
+    """
+
+    def arguments(request):
+        if methods is not None and request.method not in methods:
+            return None
+        name = scope(request) if callable(scope) else scope
+        return name, request.POST.get("username") if name == "login" else None
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                charge = arguments(request)
+                wait = charge and await acheck(request, *charge)
+                if wait:
+                    return throttled_response(wait)
+                return await view(request, *args, **kwargs)
+
+        else:
+
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                charge = arguments(request)
+                wait = charge and check(request, *charge)
+                if wait:
+                    return throttled_response(wait)
+                return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
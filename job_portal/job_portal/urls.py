@@ -10,6 +10,9 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
 
+from .profiling import slow_requests
+from .throttling import LoginThrottle
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Job Portal API",
@@ -22,6 +25,7 @@ schema_view = get_schema_view(
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("debug/slow-requests/", slow_requests, name="slow_requests"),
     path("", RedirectView.as_view(pattern_name="jobs:available_jobs"), name="home"),
     path("accounts/", include("apps.accounts.urls")),
     path("jobs/", include("apps.jobs.urls", namespace="jobs")),
@@ -32,7 +36,11 @@ urlpatterns = [
                 path("auth/", include("rest_framework.urls")),
                 path("jobs/", include("apis.jobs.urls")),
                 path("accounts/", include("apis.accounts.urls")),
-                path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+                path(
+                    "token/",
+                    TokenObtainPairView.as_view(throttle_classes=[LoginThrottle]),
+                    name="token_obtain_pair",
+                ),
                 path(
                     "token/refresh/", TokenRefreshView.as_view(), name="token_refresh"
                 ),